@@ -12,6 +12,7 @@ from fastapi import Depends, HTTPException, status
 from app.db.qdrant_client import QdrantManager, get_qdrant_manager
 from app.db.redis_client import RedisManager, get_redis_manager
 from app.db.factory import CollectionFactory
+from app.db.collection_registry import CollectionRegistry, get_collection_registry
 from app.services.embedding_service import EmbeddingService, get_embedding_service
 from app.services.sparse_encoder_service import SparseEncoderService, get_sparse_encoder_service
 from app.services.reranker_service import RerankerService, get_reranker_service
@@ -43,6 +44,11 @@ def get_collection_factory(
     return CollectionFactory(qdrant.client)
 
 
+def get_registry() -> CollectionRegistry:
+    """Get collection registry instance"""
+    return get_collection_registry()
+
+
 # === Service Dependencies ===
 
 def get_embedder() -> EmbeddingService:
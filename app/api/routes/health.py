@@ -1,9 +1,9 @@
 """
 Health Check Routes
-Liveness and readiness endpoints
+Liveness, readiness and metrics endpoints
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Response
 import logging
 
 from app.api.schemas.common import HealthResponse, ReadyResponse
@@ -11,6 +11,7 @@ from app.api.deps import get_qdrant, get_redis
 from app.db.qdrant_client import QdrantManager
 from app.db.redis_client import RedisManager
 from app.core.config import settings
+from app.utils.metrics import get_metrics
 
 router = APIRouter(tags=["Health"])
 logger = logging.getLogger(__name__)
@@ -25,8 +26,8 @@ async def health_check(
     Health check endpoint.
     Returns status of all services.
     """
-    qdrant_status = "ok" if qdrant.health_check() else "error"
-    redis_status = "ok" if redis.health_check() else "error"
+    qdrant_status = "ok" if await qdrant.health_check_async() else "error"
+    redis_status = "ok" if await redis.health_check_async() else "error"
     
     overall = "healthy" if qdrant_status == "ok" and redis_status == "ok" else "unhealthy"
     
@@ -48,8 +49,8 @@ async def readiness_check(
     Returns detailed service and model status.
     """
     services = {
-        "qdrant": qdrant.health_check(),
-        "redis": redis.health_check(),
+        "qdrant": await qdrant.health_check_async(),
+        "redis": await redis.health_check_async(),
     }
     
     # Check if models can be loaded
@@ -95,3 +96,61 @@ async def readiness_check(
         services=services,
         models_loaded=models_loaded,
     )
+
+
+@router.get("/stats")
+async def runtime_stats():
+    """
+    Runtime performance statistics.
+    Reports micro-batching batch sizes, queue wait times and cache hit rates.
+    """
+    from app.services.embedding_service import get_embedding_batcher
+    from app.services.reranker_service import get_rerank_scheduler
+    from app.services.cache_service import (
+        get_query_vector_cache,
+        get_retrieval_cache,
+        get_answer_cache,
+        get_semantic_cache,
+    )
+    
+    return {
+        "embedding_batcher": {
+            "enabled": settings.EMBEDDING_MICRO_BATCHING,
+            **get_embedding_batcher().get_stats(),
+        },
+        "rerank_scheduler": {
+            "enabled": settings.RERANKER_CROSS_REQUEST_BATCHING,
+            **get_rerank_scheduler().get_stats(),
+        },
+        "query_vector_cache": {
+            "enabled": settings.QUERY_VECTOR_CACHE_ENABLED,
+            **get_query_vector_cache().get_stats(),
+        },
+        "retrieval_cache": {
+            "enabled": settings.RETRIEVAL_CACHE_ENABLED,
+            **get_retrieval_cache().get_stats(),
+        },
+        "answer_cache": {
+            "enabled": settings.ANSWER_CACHE_ENABLED,
+            **get_answer_cache().get_stats(),
+        },
+        "semantic_cache": {
+            "enabled": settings.SEMANTIC_CACHE_ENABLED,
+            **get_semantic_cache().get_stats(),
+        },
+    }
+
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics() -> Response:
+    """
+    Prometheus metrics.
+    Aggregates every worker when PROMETHEUS_MULTIPROC_DIR is set.
+    Sync so the multiprocess file reads run in the threadpool.
+    """
+    metrics = get_metrics()
+    if metrics is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
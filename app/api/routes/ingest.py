@@ -3,7 +3,7 @@ Ingest Routes
 Law document ingestion endpoint
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Response, status, UploadFile, File, Form
 import logging
 
 from app.api.schemas.ingest import IngestResponse
@@ -14,6 +14,7 @@ from app.api.deps import (
 )
 from app.pipelines.ingestion import IngestionPipeline
 from app.db.factory import CollectionFactory
+from app.utils.timing import server_timing_header
 from app.core.config import SupportedCountry
 
 router = APIRouter(prefix="/api/v1", tags=["Ingest"])
@@ -22,6 +23,7 @@ logger = logging.getLogger(__name__)
 
 @router.post("/ingest", response_model=IngestResponse)
 async def ingest_law(
+    response: Response,
     file: UploadFile = File(..., description="PDF file to ingest"),
     country: str = Form(..., description="Country code"),
     law_type: str = Form(..., description="Type of law"),
@@ -48,6 +50,8 @@ async def ingest_law(
     - **country**: Country code (egypt, jordan, uae, saudi, kuwait)
     - **law_type**: Type of law (criminal, civil, commercial, economic, etc.)
     - **law_name**: Arabic name of the law (e.g., قانون العقوبات)
+    
+    Per-step timings are returned in the body and the `Server-Timing` header.
     """
     # Validate file type
     if not file.filename.lower().endswith('.pdf'):
@@ -113,6 +117,10 @@ async def ingest_law(
             detail=f"Ingestion failed: {', '.join(result.errors)}"
         )
     
+    response.headers["Server-Timing"] = server_timing_header(
+        result.timings_ms, result.wait_ms, result.duration_ms
+    )
+    
     return IngestResponse(
         success=True,
         message=f"Law '{law_name}' ingested successfully",
@@ -122,4 +130,6 @@ async def ingest_law(
         processing_time_ms=result.duration_ms,
         pages_processed=result.pages_processed,
         errors=result.errors,
+        timings_ms=result.timings_ms,
+        wait_ms=result.wait_ms,
     )
@@ -8,17 +8,34 @@ from fastapi import APIRouter, Depends, HTTPException, status
 import logging
 
 from app.api.schemas.ingest import LawsListResponse, CollectionInfo
-from app.api.deps import get_collection_factory, validate_country
+from app.api.deps import get_collection_factory, get_qdrant, get_registry, validate_country
 from app.db.factory import CollectionFactory
+from app.db.collection_registry import CollectionRegistry
+from app.db.qdrant_client import QdrantManager
+from app.utils.arabic import ArabicNumerals
+from app.utils.compression import payload_content, payload_preview
+from app.services.cache_service import invalidate_collection_async
 from app.core.config import SupportedCountry
 
 router = APIRouter(prefix="/api/v1", tags=["Laws"])
 logger = logging.getLogger(__name__)
 
+# Fields shown by the chunk browser (skips law_name_en, source_file, ...).
+# Listings send previews: compressed collections return the stored
+# preview and never content_z, which is read only when a chunk is opened.
+BROWSE_PAYLOAD_FIELDS = [
+    "law_name", "law_type", "article_number", "article_text",
+    "page_number", "content", "preview", "country",
+]
+CHUNK_PAYLOAD_FIELDS = [
+    "law_name", "law_type", "article_number", "article_text",
+    "page_number", "content", "content_z", "country",
+]
+
 
 @router.get("/laws", response_model=LawsListResponse)
 async def list_all_laws(
-    factory: CollectionFactory = Depends(get_collection_factory),
+    registry: CollectionRegistry = Depends(get_registry),
 ) -> LawsListResponse:
     """
     List all country collections and their status.
@@ -28,7 +45,7 @@ async def list_all_laws(
     - Number of indexed documents
     - Status (active/not_initialized)
     """
-    countries = factory.list_country_collections()
+    countries = await registry.list_collections()
     
     return LawsListResponse(
         success=True,
@@ -39,7 +56,7 @@ async def list_all_laws(
 @router.get("/laws/{country}")
 async def get_country_laws(
     country: str,
-    factory: CollectionFactory = Depends(get_collection_factory),
+    registry: CollectionRegistry = Depends(get_registry),
 ):
     """
     Get detailed information about a specific country's laws.
@@ -52,7 +69,7 @@ async def get_country_laws(
     except HTTPException:
         raise
     
-    stats = factory.get_collection_stats(country_enum)
+    stats = await registry.get_stats(country_enum)
     
     if stats is None:
         return {
@@ -89,28 +106,21 @@ async def delete_country_laws(
     except HTTPException:
         raise
     
-    # Check if collection exists
-    stats = factory.get_collection_stats(country_enum)
-    if stats is None:
+    # Delete collection (False if it does not exist)
+    deleted = factory.delete_country_collection(country_enum)
+    
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No collection found for country: {country}"
         )
     
-    # Delete collection
-    deleted = factory.delete_country_collection(country_enum)
-    
-    if deleted:
-        return {
-            "success": True,
-            "message": f"Deleted all laws for {country}",
-            "collection": f"laws_{country}",
-        }
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to delete collection"
-        )
+    await invalidate_collection_async(factory.get_collection_name(country_enum))
+    return {
+        "success": True,
+        "message": f"Deleted all laws for {country}",
+        "collection": f"laws_{country}",
+    }
 
 
 @router.post("/laws/{country}/reset")
@@ -133,6 +143,7 @@ async def reset_country_laws(
     
     # Reset collection
     collection_name = factory.reset_country_collection(country_enum)
+    await invalidate_collection_async(collection_name)
     
     return {
         "success": True,
@@ -147,11 +158,14 @@ async def browse_country_chunks(
     offset: int = 0,
     limit: int = 20,
     factory: CollectionFactory = Depends(get_collection_factory),
+    registry: CollectionRegistry = Depends(get_registry),
 ):
     """
     Browse chunks (documents) in a country's collection.
     
-    Useful for inspecting the quality of ingested data.
+    Useful for inspecting the quality of ingested data. Chunks carry a
+    content preview; GET /laws/{country}/chunks/{chunk_id} returns the
+    full content.
     
     - **country**: Country code
     - **offset**: Starting offset for pagination
@@ -168,8 +182,9 @@ async def browse_country_chunks(
     
     collection_name = factory.get_collection_name(country_enum)
     
-    # Check if collection exists
-    if not factory.client.collection_exists(collection_name):
+    # Existence and total count come from the registry
+    stats = await registry.get_stats(country_enum)
+    if stats is None:
         return {
             "success": True,
             "country": country,
@@ -179,9 +194,7 @@ async def browse_country_chunks(
             "limit": limit,
         }
     
-    # Get collection info for total count
-    info = factory.client.get_collection(collection_name)
-    total = info.points_count
+    total = stats["points_count"]
     
     # Scroll through points
     try:
@@ -189,7 +202,7 @@ async def browse_country_chunks(
             collection_name=collection_name,
             offset=offset if offset > 0 else None,
             limit=limit,
-            with_payload=True,
+            with_payload=BROWSE_PAYLOAD_FIELDS,
             with_vectors=False,  # Don't return the actual vectors
         )
         
@@ -203,8 +216,7 @@ async def browse_country_chunks(
                 "article_number": payload.get("article_number"),
                 "article_text": payload.get("article_text", ""),
                 "page_number": payload.get("page_number"),
-                "content": payload.get("content", "")[:500],  # First 500 chars
-                "full_content": payload.get("content", ""),
+                "preview": payload_preview(payload),
                 "country": payload.get("country", country),
             })
         
@@ -225,3 +237,136 @@ async def browse_country_chunks(
             status_code=500,
             detail=f"Failed to browse chunks: {str(e)}"
         )
+
+
+@router.get("/laws/{country}/chunks/{chunk_id}")
+async def get_chunk(
+    country: str,
+    chunk_id: str,
+    factory: CollectionFactory = Depends(get_collection_factory),
+    qdrant: QdrantManager = Depends(get_qdrant),
+):
+    """
+    Get one chunk with its full (decompressed) content.
+    
+    - **country**: Country code
+    - **chunk_id**: Point ID from the chunk browser
+    """
+    # Validate country
+    try:
+        country_enum = validate_country(country)
+    except HTTPException:
+        raise
+    
+    collection_name = factory.get_collection_name(country_enum)
+    
+    try:
+        payloads = await qdrant.retrieve_payloads_async(collection_name, [chunk_id], CHUNK_PAYLOAD_FIELDS)
+    except Exception as e:
+        logger.error(f"Error fetching chunk {chunk_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch chunk: {str(e)}"
+        )
+    
+    payload = payloads.get(chunk_id)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Chunk {chunk_id} not found for country: {country}"
+        )
+    
+    return {
+        "success": True,
+        "chunk": {
+            "id": chunk_id,
+            "law_name": payload.get("law_name", "Unknown"),
+            "law_type": payload.get("law_type", "Unknown"),
+            "article_number": payload.get("article_number"),
+            "article_text": payload.get("article_text", ""),
+            "page_number": payload.get("page_number"),
+            "content": payload_content(payload),
+            "country": payload.get("country", country),
+        },
+    }
+
+
+@router.get("/laws/{country}/articles/{number}")
+async def get_article(
+    country: str,
+    number: str,
+    law_type: Optional[str] = None,
+    law_name: Optional[str] = None,
+    factory: CollectionFactory = Depends(get_collection_factory),
+    qdrant: QdrantManager = Depends(get_qdrant),
+):
+    """
+    Get the full text of an article by number.
+    
+    Exact lookup on the article_number payload index - no models are
+    loaded and no vector search is performed. All parts of the article
+    are returned in order, grouped by law.
+    
+    - **country**: Country code
+    - **number**: Article number (Arabic ٣١٨ or English 318 numerals)
+    - **law_type**: Optional law type filter (criminal, civil, etc.)
+    - **law_name**: Optional exact law name filter
+    """
+    # Validate country
+    try:
+        country_enum = validate_country(country)
+    except HTTPException:
+        raise
+    
+    article_number = ArabicNumerals.extract_number(number)
+    if article_number is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid article number: {number}"
+        )
+    
+    collection_name = factory.get_collection_name(country_enum)
+    
+    try:
+        results = await qdrant.get_article_chunks_async(
+            collection_name,
+            article_number,
+            law_types=[law_type] if law_type else None,
+            law_name=law_name,
+        )
+    except Exception as e:
+        logger.error(f"Error looking up article {article_number}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to look up article: {str(e)}"
+        )
+    
+    if not results:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Article {article_number} not found for country: {country}"
+        )
+    
+    laws = {}
+    for result in results:
+        payload = result["payload"]
+        law = laws.setdefault(payload.get("law_name", "Unknown"), {
+            "law_name": payload.get("law_name", "Unknown"),
+            "law_type": payload.get("law_type", "Unknown"),
+            "parts": [],
+        })
+        law["parts"].append({
+            "id": str(result["id"]),
+            "chunk_part": payload.get("chunk_part", 1),
+            "total_parts": payload.get("total_parts", 1),
+            "article_text": payload.get("article_text", ""),
+            "page_number": payload.get("page_number"),
+            "content": payload_content(payload),
+        })
+    
+    return {
+        "success": True,
+        "country": country,
+        "article_number": article_number,
+        "laws": list(laws.values()),
+    }
@@ -3,96 +3,106 @@ Query Routes
 Legal question answering endpoint
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Dict, List, Union
+import json
+import time
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 import logging
 
-from app.api.schemas.query import QueryRequest, QueryResponse, SourceSchema, QueryMetadata
+from app.api.schemas.query import (
+    QueryRequest,
+    QueryResponse,
+    SourceSchema,
+    QueryMetadata,
+    BatchQueryRequest,
+    BatchQueryResponse,
+    BatchQueryItem,
+)
 from app.api.deps import (
     get_query_pipeline,
     get_sessions,
-    get_collection_factory,
+    get_registry,
     validate_country,
 )
-from app.pipelines.query import QueryPipeline, QueryInput
+from app.pipelines.query import QueryPipeline, QueryInput, QueryOutput
 from app.services.session_service import SessionService
-from app.db.factory import CollectionFactory
-from app.core.config import SupportedCountry
+from app.db.collection_registry import CollectionRegistry
+from app.utils.timing import server_timing_header
+from app.core.config import SupportedCountry, settings
 
 router = APIRouter(prefix="/api/v1", tags=["Query"])
 logger = logging.getLogger(__name__)
 
 
-@router.post("/query", response_model=QueryResponse)
-async def query_laws(
-    request: QueryRequest,
-    pipeline: QueryPipeline = Depends(get_query_pipeline),
-    session_service: SessionService = Depends(get_sessions),
-    factory: CollectionFactory = Depends(get_collection_factory),
-) -> QueryResponse:
-    """
-    Ask a legal question and get an answer with citations.
-    
-    - **question**: Your legal question in Arabic
-    - **country**: Country code (egypt, jordan, uae, saudi, kuwait)
-    - **law_types**: Optional filter by law types (criminal, civil, etc.)
-    - **session_id**: Optional session ID for conversation history
-    - **top_k**: Number of sources to retrieve (default 5)
-    """
+async def _ensure_collection(
+    request: Union[QueryRequest, BatchQueryRequest],
+    registry: CollectionRegistry,
+) -> str:
+    """Validate the country and check its collection has data (404 if not)"""
     # Validate country
     try:
         country = validate_country(request.country)
     except HTTPException:
         raise
     
-    # Check collection exists
-    collection_name = factory.get_collection_name(country)
-    stats = factory.get_collection_stats(country)
+    # Check collection has data (cached - no Qdrant call on the hot path)
+    collection_name = registry.factory.get_collection_name(country)
     
-    if stats is None or stats["points_count"] == 0:
+    if not await registry.has_points(country):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No laws found for country: {request.country}. Please ingest laws first."
         )
     
-    logger.info(f"Query: '{request.question[:50]}...' -> {collection_name}")
-    
-    # Build query input
-    query_input = QueryInput(
+    return collection_name
+
+
+def _build_query_input(request: QueryRequest) -> QueryInput:
+    """Build pipeline input from the request body"""
+    return QueryInput(
         question=request.question,
         country=request.country,
         law_types=request.law_types,
         session_id=request.session_id,
         top_k=request.top_k,
+        retrieval_mode=request.retrieval_mode,
+        prefetch=request.prefetch,
+        search_profile=request.search_profile,
+        hnsw_ef=request.hnsw_ef,
+        exact=request.exact,
+        rescore=request.rescore,
     )
+
+
+async def _save_to_session(
+    session_service: SessionService,
+    request: QueryRequest,
+    answer: str,
+    sources: List[Dict[str, Any]],
+) -> None:
+    """Append the question and answer to the request's session, if any"""
+    if not request.session_id:
+        return
     
-    # Run query pipeline
     try:
-        result = await pipeline.run(query_input)
-    except Exception as e:
-        logger.error(f"Query pipeline error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Query processing failed: {str(e)}"
+        await session_service.add_user_message_async(
+            request.session_id,
+            request.question,
+            metadata={"country": request.country, "law_types": request.law_types}
         )
-    
-    # Save to session if provided
-    if request.session_id:
-        try:
-            session_service.add_user_message(
-                request.session_id,
-                request.question,
-                metadata={"country": request.country, "law_types": request.law_types}
-            )
-            session_service.add_assistant_message(
-                request.session_id,
-                result.answer,
-                sources=[s.to_dict() for s in result.sources],
-            )
-        except Exception as e:
-            logger.warning(f"Failed to save to session: {e}")
-    
-    # Convert to response schema
-    sources = [
+        await session_service.add_assistant_message_async(
+            request.session_id,
+            answer,
+            sources=sources,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to save to session: {e}")
+
+
+def _to_sources(result: QueryOutput) -> List[SourceSchema]:
+    """Convert pipeline sources to response schema"""
+    return [
         SourceSchema(
             law_name=s.law_name,
             article_number=s.article_number,
@@ -103,20 +113,229 @@ async def query_laws(
         )
         for s in result.sources
     ]
-    
-    metadata = QueryMetadata(
+
+
+def _to_metadata(result: QueryOutput) -> QueryMetadata:
+    """Convert pipeline output metadata to response schema"""
+    return QueryMetadata(
         query_time_ms=result.query_time_ms,
         chunks_retrieved=result.chunks_retrieved,
         chunks_after_rerank=result.chunks_after_rerank,
         embedding_model=result.embedding_model,
         reranker_model=result.reranker_model,
         llm_model=result.llm_model,
+        answer_cached=result.answer_cached,
+        cache_similarity=result.cache_similarity,
+        timings_ms=result.timings_ms,
+        wait_ms=result.wait_ms,
+    )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/query", response_model=QueryResponse)
+async def query_laws(
+    request: QueryRequest,
+    response: Response,
+    pipeline: QueryPipeline = Depends(get_query_pipeline),
+    session_service: SessionService = Depends(get_sessions),
+    registry: CollectionRegistry = Depends(get_registry),
+) -> QueryResponse:
+    """
+    Ask a legal question and get an answer with citations.
+    
+    - **question**: Your legal question in Arabic
+    - **country**: Country code (egypt, jordan, uae, saudi, kuwait)
+    - **law_types**: Optional filter by law types (criminal, civil, etc.)
+    - **session_id**: Optional session ID for conversation history
+    - **top_k**: Number of sources to retrieve (default 5)
+    - **retrieval_mode**: dense, sparse, hybrid_rrf or hybrid_dbsf (optional)
+    - **prefetch**: Candidates retrieved before reranking (optional)
+    - **search_profile** / **hnsw_ef** / **exact** / **rescore**: Dense search effort (optional)
+    
+    The per-stage breakdown is in `metadata.timings_ms` / `metadata.wait_ms`
+    and in the `Server-Timing` response header.
+    """
+    collection_name = await _ensure_collection(request, registry)
+    
+    logger.info(f"Query: '{request.question[:50]}...' -> {collection_name}")
+    
+    query_input = _build_query_input(request)
+    
+    # Run query pipeline
+    try:
+        result = await pipeline.run(query_input)
+    except Exception as e:
+        logger.error(f"Query pipeline error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Query processing failed: {str(e)}"
+        )
+    
+    # Save to session if provided
+    await _save_to_session(
+        session_service,
+        request,
+        result.answer,
+        [s.to_dict() for s in result.sources],
+    )
+    
+    response.headers["Server-Timing"] = server_timing_header(
+        result.timings_ms, result.wait_ms, result.query_time_ms
     )
     
     return QueryResponse(
         success=result.success,
         answer=result.answer,
-        sources=sources,
-        metadata=metadata,
+        sources=_to_sources(result),
+        metadata=_to_metadata(result),
         errors=result.errors,
     )
+
+
+@router.post("/query/stream")
+async def query_laws_stream(
+    request: QueryRequest,
+    pipeline: QueryPipeline = Depends(get_query_pipeline),
+    session_service: SessionService = Depends(get_sessions),
+    registry: CollectionRegistry = Depends(get_registry),
+) -> StreamingResponse:
+    """
+    Ask a legal question and stream the answer as Server-Sent Events.
+    
+    Same request body as `/query`. Events, in order:
+    - **sources**: `{"sources": [...]}` as soon as reranking finishes
+    - **token**: `{"text": "..."}` answer fragments as Gemini generates them
+    - **metadata**: query metadata plus per-stage `timings_ms` / `wait_ms`
+      (no Server-Timing header: it is sent before the timings exist)
+    - **error**: `{"detail": "..."}` if processing fails mid-stream
+    
+    The exchange is saved to the session once the stream completes.
+    """
+    collection_name = await _ensure_collection(request, registry)
+    
+    logger.info(f"Streaming query: '{request.question[:50]}...' -> {collection_name}")
+    
+    query_input = _build_query_input(request)
+    
+    async def event_stream():
+        sources: List[Dict[str, Any]] = []
+        answer_parts: List[str] = []
+        
+        try:
+            async for event, data in pipeline.run_stream(query_input):
+                if event == "sources":
+                    sources = data["sources"]
+                elif event == "token":
+                    answer_parts.append(data["text"])
+                yield _sse(event, data)
+        except Exception as e:
+            logger.error(f"Streaming query error: {e}")
+            yield _sse("error", {"detail": f"Query processing failed: {str(e)}"})
+            return
+        
+        await _save_to_session(session_service, request, "".join(answer_parts), sources)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Don't let nginx buffer the stream
+        },
+    )
+
+
+@router.post("/query/batch", response_model=BatchQueryResponse)
+async def query_laws_batch(
+    request: BatchQueryRequest,
+    response: Response,
+    pipeline: QueryPipeline = Depends(get_query_pipeline),
+    registry: CollectionRegistry = Depends(get_registry),
+) -> BatchQueryResponse:
+    """
+    Answer many legal questions in one request.
+    
+    Questions share embedding, search and reranking work; answers are
+    generated concurrently. Results come back in input order, each with
+    its own success flag, errors and per-stage timings. The Server-Timing
+    header carries the shared stages and the batch total.
+    
+    - **questions**: Legal questions in Arabic (max BATCH_MAX_QUESTIONS)
+    - **country**: Country code (egypt, jordan, uae, saudi, kuwait)
+    - **law_types**: Optional filter by law types, applied to every question
+    - **top_k**: Number of sources to retrieve (default 5)
+    - **retrieval_mode**: dense, sparse, hybrid_rrf or hybrid_dbsf (optional)
+    - **prefetch**: Candidates retrieved before reranking (optional)
+    - **search_profile** / **hnsw_ef** / **exact** / **rescore**: Dense search effort (optional)
+    """
+    if len(request.questions) > settings.BATCH_MAX_QUESTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many questions: {len(request.questions)} (max {settings.BATCH_MAX_QUESTIONS})"
+        )
+    
+    collection_name = await _ensure_collection(request, registry)
+    
+    logger.info(f"Batch query: {len(request.questions)} questions -> {collection_name}")
+    
+    query_inputs = [
+        QueryInput(
+            question=question,
+            country=request.country,
+            law_types=request.law_types,
+            top_k=request.top_k,
+            retrieval_mode=request.retrieval_mode,
+            prefetch=request.prefetch,
+            search_profile=request.search_profile,
+            hnsw_ef=request.hnsw_ef,
+            exact=request.exact,
+            rescore=request.rescore,
+        )
+        for question in request.questions
+    ]
+    
+    start_time = time.time()
+    try:
+        results = await pipeline.run_batch(query_inputs)
+    except Exception as e:
+        logger.error(f"Batch query pipeline error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Batch query processing failed: {str(e)}"
+        )
+    
+    items = [
+        BatchQueryItem(
+            index=i,
+            question=question,
+            success=result.success,
+            answer=result.answer,
+            sources=_to_sources(result),
+            metadata=_to_metadata(result) if result.success else None,
+            errors=result.errors,
+        )
+        for i, (question, result) in enumerate(zip(request.questions, results))
+    ]
+    succeeded = sum(1 for item in items if item.success)
+    query_time_ms = (time.time() - start_time) * 1000
+    
+    # Stages before generation are shared, so identical on every item
+    shared = next((r for r in results if r.success), None)
+    response.headers["Server-Timing"] = server_timing_header(
+        {k: v for k, v in shared.timings_ms.items() if k != "generate"} if shared else {},
+        shared.wait_ms if shared else None,
+        query_time_ms,
+    )
+    
+    return BatchQueryResponse(
+        success=succeeded == len(items),
+        total=len(items),
+        succeeded=succeeded,
+        failed=len(items) - succeeded,
+        query_time_ms=query_time_ms,
+        results=items,
+    )
@@ -0,0 +1,114 @@
+"""
+Search Routes
+Retrieval-only search (ranked articles, no LLM generation)
+"""
+
+import time
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+import logging
+
+from app.api.schemas.search import SearchRequest, SearchResponse, SearchResult, SearchMetadata
+from app.api.deps import (
+    get_query_pipeline,
+    get_registry,
+    validate_country,
+)
+from app.pipelines.query import QueryPipeline, QueryInput
+from app.db.collection_registry import CollectionRegistry
+from app.utils.timing import server_timing_header
+
+router = APIRouter(prefix="/api/v1", tags=["Search"])
+logger = logging.getLogger(__name__)
+
+
+@router.post("/search", response_model=SearchResponse)
+async def search_laws(
+    request: SearchRequest,
+    response: Response,
+    pipeline: QueryPipeline = Depends(get_query_pipeline),
+    registry: CollectionRegistry = Depends(get_registry),
+) -> SearchResponse:
+    """
+    Search law articles without generating an answer.
+    
+    Runs preprocessing, dual encoding and hybrid search, then optionally
+    the cross-encoder reranker. No Gemini call is made.
+    
+    - **query**: Search query in Arabic
+    - **country**: Country code (egypt, jordan, uae, saudi, kuwait)
+    - **law_types**: Optional filter by law types (criminal, civil, etc.)
+    - **top_k**: Number of results (default 10)
+    - **rerank**: Set false for hybrid ranking only (fastest)
+    - **retrieval_mode**: dense, sparse, hybrid_rrf or hybrid_dbsf
+    - **prefetch**: Candidates retrieved before reranking
+    - **search_profile** / **hnsw_ef** / **exact** / **rescore**: Dense search effort
+    
+    Per-stage timings are returned in metadata and the `Server-Timing` header.
+    """
+    country = validate_country(request.country)
+    
+    # Check collection has data (cached - no Qdrant call on the hot path)
+    if not await registry.has_points(country):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No laws found for country: {request.country}. Please ingest laws first."
+        )
+    
+    query_input = QueryInput(
+        question=request.query,
+        country=request.country,
+        law_types=request.law_types,
+        top_k=request.top_k,
+        retrieval_mode=request.retrieval_mode,
+        prefetch=request.prefetch,
+        search_profile=request.search_profile,
+        hnsw_ef=request.hnsw_ef,
+        exact=request.exact,
+        rescore=request.rescore,
+    )
+    
+    start_time = time.time()
+    try:
+        chunks, context = await pipeline.search(query_input, rerank=request.rerank)
+    except Exception as e:
+        logger.error(f"Search error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Search failed: {str(e)}"
+        )
+    
+    search_time_ms = (time.time() - start_time) * 1000
+    response.headers["Server-Timing"] = server_timing_header(
+        context["timings_ms"], context["wait_ms"], search_time_ms
+    )
+    
+    return SearchResponse(
+        success=True,
+        query=request.query,
+        results=[
+            SearchResult(
+                chunk_id=chunk.chunk_id,
+                content=chunk.content,
+                law_name=chunk.law_name,
+                law_type=chunk.law_type,
+                article_number=chunk.article_number,
+                article_text=chunk.article_text,
+                page_number=chunk.page_number,
+                chapter=chunk.chapter,
+                chunk_part=chunk.chunk_part,
+                total_parts=chunk.total_parts,
+                hybrid_score=chunk.hybrid_score,
+                rerank_score=chunk.rerank_score,
+            )
+            for chunk in chunks
+        ],
+        metadata=SearchMetadata(
+            search_time_ms=search_time_ms,
+            chunks_retrieved=context.get("chunks_retrieved", 0),
+            reranked=request.rerank,
+            retrieval_mode=context["retrieval_mode"],
+            exact_search=context.get("exact_search", False),
+            timings_ms=context.get("timings_ms", {}),
+            wait_ms=context.get("wait_ms", {}),
+        ),
+    )
@@ -10,6 +10,11 @@ from app.api.schemas.query import (
     QueryResponse,
     SourceSchema,
 )
+from app.api.schemas.search import (
+    SearchRequest,
+    SearchResponse,
+    SearchResult,
+)
 from app.api.schemas.ingest import (
     IngestResponse,
 )
@@ -27,6 +32,9 @@ __all__ = [
     "QueryRequest",
     "QueryResponse",
     "SourceSchema",
+    "SearchRequest",
+    "SearchResponse",
+    "SearchResult",
     "IngestResponse",
     "SessionCreate",
     "SessionResponse",
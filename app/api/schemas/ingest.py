@@ -3,7 +3,7 @@ Ingest API Schemas
 Request and response models for ingestion endpoint
 """
 
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field
 
 
@@ -17,6 +17,10 @@ class IngestResponse(BaseModel):
     processing_time_ms: float = Field(..., description="Processing time in milliseconds")
     pages_processed: int = Field(default=0, description="Number of pages processed")
     errors: List[str] = Field(default_factory=list, description="Any errors")
+    timings_ms: Dict[str, float] = Field(default_factory=dict, description="Wall time per pipeline step")
+    wait_ms: Dict[str, float] = Field(
+        default_factory=dict, description="Time per step queued for a worker thread (part of timings_ms)"
+    )
     
     class Config:
         json_schema_extra = {
@@ -28,7 +32,17 @@ class IngestResponse(BaseModel):
                 "chunks_created": 412,
                 "processing_time_ms": 25000.5,
                 "pages_processed": 150,
-                "errors": []
+                "errors": [],
+                "timings_ms": {
+                    "PDF Loader": 120.4,
+                    "Text Extractor": 2100.8,
+                    "Article Splitter": 85.2,
+                    "Metadata Enricher": 40.1,
+                    "Dense Embedder": 18650.3,
+                    "Sparse Encoder": 2310.6,
+                    "Qdrant Storer": 3900.2
+                },
+                "wait_ms": {}
             }
         }
 
@@ -3,9 +3,38 @@ Query API Schemas
 Request and response models for query endpoint
 """
 
-from typing import List, Optional, Dict, Any
+from typing import Annotated, List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 
+from app.core.config import RetrievalMode, SearchProfile, settings
+
+
+# === Retrieval options (shared by query, batch and search requests) ===
+
+RetrievalModeOption = Annotated[Optional[RetrievalMode], Field(
+    description="dense, sparse (BM25 only, no embedding model), hybrid_rrf or hybrid_dbsf "
+                "(default: server setting)"
+)]
+PrefetchOption = Annotated[Optional[int], Field(
+    ge=1,
+    le=settings.MAX_PREFETCH,
+    description="Candidates retrieved before reranking (default: server setting)"
+)]
+SearchProfileOption = Annotated[Optional[SearchProfile], Field(
+    description="Dense search effort: fast, balanced, accurate or exact (default: server setting)"
+)]
+HnswEfOption = Annotated[Optional[int], Field(
+    ge=4,
+    le=settings.HNSW_EF_MAX,
+    description="HNSW search ef (higher = better recall, slower); overrides search_profile"
+)]
+ExactOption = Annotated[Optional[bool], Field(
+    description="Force (true) or forbid (false) exact search; unset lets the planner decide"
+)]
+RescoreOption = Annotated[Optional[bool], Field(
+    description="Rescore quantized candidates with original vectors (quantized collections only)"
+)]
+
 
 class QueryRequest(BaseModel):
     """Query request body"""
@@ -36,6 +65,12 @@ class QueryRequest(BaseModel):
         le=20,
         description="Number of sources to retrieve"
     )
+    retrieval_mode: RetrievalModeOption = None
+    prefetch: PrefetchOption = None
+    search_profile: SearchProfileOption = None
+    hnsw_ef: HnswEfOption = None
+    exact: ExactOption = None
+    rescore: RescoreOption = None
 
 
 class SourceSchema(BaseModel):
@@ -68,6 +103,14 @@ class QueryMetadata(BaseModel):
     embedding_model: str
     reranker_model: str
     llm_model: str
+    answer_cached: bool = Field(False, description="Answer served from the answer cache")
+    cache_similarity: Optional[float] = Field(
+        None, description="Cosine similarity to the cached question (semantic cache hits only)"
+    )
+    timings_ms: Dict[str, float] = Field(default_factory=dict, description="Per-stage wall time")
+    wait_ms: Dict[str, float] = Field(
+        default_factory=dict, description="Per-stage time queued for executors/micro-batches (part of timings_ms)"
+    )
 
 
 class QueryResponse(BaseModel):
@@ -99,8 +142,69 @@ class QueryResponse(BaseModel):
                     "chunks_after_rerank": 5,
                     "embedding_model": "Qwen/Qwen3-Embedding-0.6B",
                     "reranker_model": "Qwen/Qwen3-Reranker-0.6B",
-                    "llm_model": "gemini-2.5-flash"
+                    "llm_model": "gemini-2.5-flash",
+                    "answer_cached": False,
+                    "timings_ms": {
+                        "preprocess": 1.2,
+                        "encode": 38.4,
+                        "search": 12.7,
+                        "rerank": 140.3,
+                        "fetch_payload": 3.1,
+                        "generate": 650.2
+                    },
+                    "wait_ms": {"encode": 9.8}
                 },
                 "errors": []
             }
         }
+
+
+class BatchQueryRequest(BaseModel):
+    """Batch query request body (shared filters for all questions)"""
+    questions: List[Annotated[str, Field(min_length=3, max_length=1000)]] = Field(
+        ...,
+        min_length=1,
+        description="Legal questions in Arabic",
+        json_schema_extra={"example": ["ما هي عقوبة السرقة؟", "متى يكون العقد باطلا؟"]}
+    )
+    country: str = Field(
+        default="egypt",
+        description="Country code (egypt, jordan, uae, saudi, kuwait)",
+    )
+    law_types: Optional[List[str]] = Field(
+        default=None,
+        description="Filter by law types",
+    )
+    top_k: int = Field(
+        default=5,
+        ge=1,
+        le=20,
+        description="Number of sources to retrieve"
+    )
+    retrieval_mode: RetrievalModeOption = None
+    prefetch: PrefetchOption = None
+    search_profile: SearchProfileOption = None
+    hnsw_ef: HnswEfOption = None
+    exact: ExactOption = None
+    rescore: RescoreOption = None
+
+
+class BatchQueryItem(BaseModel):
+    """Result for one question of a batch"""
+    index: int = Field(..., description="Position of the question in the request")
+    question: str
+    success: bool
+    answer: str = ""
+    sources: List[SourceSchema] = Field(default_factory=list)
+    metadata: Optional[QueryMetadata] = None
+    errors: List[str] = Field(default_factory=list)
+
+
+class BatchQueryResponse(BaseModel):
+    """Batch query response body (results in input order)"""
+    success: bool = Field(..., description="True if every question succeeded")
+    total: int
+    succeeded: int
+    failed: int
+    query_time_ms: float
+    results: List[BatchQueryItem]
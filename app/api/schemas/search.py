@@ -0,0 +1,90 @@
+"""
+Search API Schemas
+Request and response models for retrieval-only search
+"""
+
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+from app.api.schemas.query import (
+    RetrievalModeOption,
+    PrefetchOption,
+    SearchProfileOption,
+    HnswEfOption,
+    ExactOption,
+    RescoreOption,
+)
+
+
+class SearchRequest(BaseModel):
+    """Search request body"""
+    query: str = Field(
+        ...,
+        min_length=2,
+        max_length=1000,
+        description="Search query in Arabic",
+        json_schema_extra={"example": "عقوبة السرقة"}
+    )
+    country: str = Field(
+        default="egypt",
+        description="Country code (egypt, jordan, uae, saudi, kuwait)",
+        json_schema_extra={"example": "egypt"}
+    )
+    law_types: Optional[List[str]] = Field(
+        default=None,
+        description="Filter by law types",
+        json_schema_extra={"example": ["criminal"]}
+    )
+    top_k: int = Field(
+        default=10,
+        ge=1,
+        le=25,
+        description="Number of results to return"
+    )
+    rerank: bool = Field(
+        default=True,
+        description="Rerank with the cross-encoder (false = hybrid ranking only, fastest)"
+    )
+    retrieval_mode: RetrievalModeOption = None
+    prefetch: PrefetchOption = None
+    search_profile: SearchProfileOption = None
+    hnsw_ef: HnswEfOption = None
+    exact: ExactOption = None
+    rescore: RescoreOption = None
+
+
+class SearchResult(BaseModel):
+    """A ranked chunk"""
+    chunk_id: str
+    content: str
+    law_name: str
+    law_type: str
+    article_number: Optional[int] = None
+    article_text: Optional[str] = None
+    page_number: int
+    chapter: Optional[str] = None
+    chunk_part: int = 1
+    total_parts: int = 1
+    hybrid_score: float = Field(..., description="Retrieval score (fusion or similarity, per retrieval_mode)")
+    rerank_score: Optional[float] = Field(None, description="Cross-encoder score (if reranked)")
+
+
+class SearchMetadata(BaseModel):
+    """Search execution metadata"""
+    search_time_ms: float
+    chunks_retrieved: int
+    reranked: bool
+    retrieval_mode: str
+    exact_search: bool = Field(False, description="Dense search ran exact (brute force)")
+    timings_ms: Dict[str, float] = Field(default_factory=dict, description="Per-stage timings")
+    wait_ms: Dict[str, float] = Field(
+        default_factory=dict, description="Per-stage time queued for executors/micro-batches (part of timings_ms)"
+    )
+
+
+class SearchResponse(BaseModel):
+    """Search response body"""
+    success: bool
+    query: str
+    results: List[SearchResult]
+    metadata: SearchMetadata
@@ -21,6 +21,40 @@ class SupportedCountry(str, Enum):
     KUWAIT = "kuwait"
 
 
+class RetrievalMode(str, Enum):
+    """
+    Candidate retrieval strategies.
+    DENSE / SPARSE query a single vector; HYBRID_* fuse both.
+    """
+    DENSE = "dense"
+    SPARSE = "sparse"  # BM25 only - no embedding model needed
+    HYBRID_RRF = "hybrid_rrf"  # Reciprocal Rank Fusion
+    HYBRID_DBSF = "hybrid_dbsf"  # Distribution-Based Score Fusion
+
+
+class StorageProfile(str, Enum):
+    """
+    Dense vector storage profiles, applied at collection creation.
+    Quantized profiles keep the compact vectors in RAM and the float32
+    originals on disk for rescoring.
+    """
+    FLOAT32 = "float32"  # Full precision (4 bytes/dim)
+    FLOAT16 = "float16"  # Half precision (2 bytes/dim)
+    INT8 = "int8"  # Scalar quantization (1 byte/dim in RAM)
+    BINARY = "binary"  # Binary quantization (1 bit/dim in RAM)
+
+
+class SearchProfile(str, Enum):
+    """
+    Dense search effort presets (HNSW ef / exact / rescore).
+    Individual knobs can still be overridden per request.
+    """
+    FAST = "fast"  # Small ef, no rescoring
+    BALANCED = "balanced"  # Qdrant defaults
+    ACCURATE = "accurate"  # Large ef
+    EXACT = "exact"  # Brute force (full recall)
+
+
 class LawType(str, Enum):
     """Supported law types for filtering"""
     CRIMINAL = "criminal"
@@ -54,6 +88,11 @@ class Settings(BaseSettings):
     QDRANT_PORT: int = 6333
     QDRANT_GRPC_PORT: int = 6334
     QDRANT_API_KEY: Optional[str] = None
+    QDRANT_PREFER_GRPC: bool = False  # gRPC/protobuf instead of REST/JSON for all calls
+    QDRANT_HTTPS: bool = False
+    QDRANT_TIMEOUT: int = 60  # Seconds, per request
+    QDRANT_UPSERT_BATCH_SIZE: int = 100  # Points per upsert call during ingestion
+    COLLECTION_REGISTRY_REFRESH: float = 30.0  # Seconds between background collection metadata refreshes
     
     # === Redis Session Storage ===
     REDIS_HOST: str = "localhost"
@@ -66,6 +105,9 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str = "Qwen/Qwen3-Embedding-0.6B"
     EMBEDDING_DIMENSION: int = 1024
     EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_MICRO_BATCHING: bool = False  # Coalesce concurrent query embeddings
+    EMBEDDING_MICRO_BATCH_MAX_SIZE: int = 16
+    EMBEDDING_MICRO_BATCH_WINDOW_MS: float = 5.0
     
     # === Sparse Encoder (BM25) ===
     SPARSE_MODEL: str = "Qdrant/bm25"
@@ -73,11 +115,78 @@ class Settings(BaseSettings):
     # === Reranker Model ===
     RERANKER_MODEL: str = "Qwen/Qwen3-Reranker-0.6B"
     RERANKER_MAX_LENGTH: int = 512
+    RERANKER_SUBBATCH_TOKEN_BUDGET: int = 8192  # Padded tokens per length-bucketed sub-batch
+    RERANKER_PREFIX_CACHE: bool = False  # Encode shared query prefix once per query
+    RERANKER_CROSS_REQUEST_BATCHING: bool = False  # Merge pairs from concurrent queries
+    RERANKER_BATCH_MAX_TOKENS: int = 16384  # Token cap per shared forward pass
+    RERANKER_BATCH_WINDOW_MS: float = 10.0
     
     # === Search Configuration ===
     HYBRID_PREFETCH: int = 25  # Top-K for each search type before reranking
+    MAX_PREFETCH: int = 100  # Upper bound for per-request prefetch depth
+    DEFAULT_RETRIEVAL_MODE: RetrievalMode = RetrievalMode.HYBRID_RRF
     RERANK_TOP_K: int = 5  # Final top-K after reranking
     DEFAULT_TOP_K: int = 5  # Default number of results to return
+    ARTICLE_FAST_PATH_ENABLED: bool = True  # Resolve "المادة ٣١٨ ..." by payload lookup
+    
+    # === Vector Storage ===
+    VECTOR_STORAGE_PROFILE: StorageProfile = StorageProfile.FLOAT32  # New collections only
+    HNSW_M: int = 16  # Graph degree (higher = better recall, more RAM)
+    HNSW_EF_CONSTRUCT: int = 100  # Build-time candidate list size
+    QUANTIZATION_RESCORE: bool = True  # Rescore quantized candidates with original vectors
+    QUANTIZATION_OVERSAMPLING: Optional[float] = None  # None = profile default (int8 1.5, binary 3.0)
+    MATRYOSHKA_DIMENSION: int = 0  # Truncated first-stage vector, e.g. 256 (0 = off; new collections only)
+    MATRYOSHKA_OVERSAMPLING: float = 4.0  # First-stage candidates = prefetch x this, rescored on full vector
+    
+    # === Payload Compression ===
+    CONTENT_COMPRESSION: str = "none"  # none | zstd (applies to new ingestions; reads handle both)
+    CONTENT_ZSTD_LEVEL: int = 19  # Ingestion-time only, decompression speed is level-independent
+    CONTENT_ZSTD_DICT_PATH: Optional[str] = None  # Trained by scripts/train_content_dictionary.py
+    CONTENT_PREVIEW_CHARS: int = 300  # Uncompressed preview kept next to compressed content
+    
+    # === Search Effort ===
+    SEARCH_PROFILE: SearchProfile = SearchProfile.BALANCED
+    HNSW_EF_MAX: int = 1024  # Upper bound for per-request hnsw_ef
+    EXACT_SEARCH_THRESHOLD: int = 2000  # Filtered point count below which search is exact (0 = off)
+    EXACT_SEARCH_COUNT_TTL: int = 300  # Seconds to reuse a filter's point count
+    
+    # === Caching ===
+    QUERY_VECTOR_CACHE_ENABLED: bool = True  # Reuse dense/sparse vectors for repeated queries
+    QUERY_VECTOR_CACHE_REDIS: bool = True  # Share vectors across workers via Redis
+    QUERY_VECTOR_CACHE_SIZE: int = 2048  # In-process LRU entries (per vector type)
+    QUERY_VECTOR_CACHE_TTL: int = 604800  # 7 days
+    RETRIEVAL_CACHE_ENABLED: bool = True  # Reuse reranked chunks until the collection changes
+    RETRIEVAL_CACHE_SIZE: int = 1024
+    RETRIEVAL_CACHE_TTL: int = 86400  # 24 hours
+    ANSWER_CACHE_ENABLED: bool = True  # Reuse LLM answers for the same question + evidence
+    ANSWER_CACHE_SIZE: int = 1024
+    ANSWER_CACHE_TTL: int = 86400  # 24 hours
+    SEMANTIC_CACHE_ENABLED: bool = False  # Serve near-duplicate questions from cache
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95  # Min cosine similarity for a hit
+    SEMANTIC_CACHE_SIZE: int = 1000
+    SEMANTIC_CACHE_TTL: int = 3600  # 1 hour
+    SEMANTIC_CACHE_REDIS: bool = False  # Share the index across workers via Redis
+    SEMANTIC_CACHE_REDIS_MAX_PER_SCOPE: int = 256
+    
+    # === Concurrency ===
+    MODEL_EXECUTOR_WORKERS: int = 2  # Threads for CPU/GPU-bound model inference
+    
+    # === Batch Queries ===
+    BATCH_MAX_QUESTIONS: int = 500  # Max questions per /query/batch request
+    BATCH_LLM_CONCURRENCY: int = 8  # Concurrent Gemini calls per batch
+    QDRANT_BATCH_QUERY_SIZE: int = 64  # Searches per Qdrant batch query
+    
+    # === Metrics ===
+    METRICS_ENABLED: bool = True  # Serve Prometheus metrics at /metrics (needs prometheus-client)
+    PROMETHEUS_MULTIPROC_DIR: Optional[str] = None  # Shared dir for multi-worker metrics (wipe before start)
+    
+    # === Tracing ===
+    TRACING_ENABLED: bool = False  # OpenTelemetry spans (needs opentelemetry-sdk)
+    TRACING_EXPORTER: str = "file"  # file | otlp | console
+    TRACING_FILE_PATH: str = "traces.jsonl"  # One JSON span per line (file exporter)
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"  # OTLP/HTTP collector
+    TRACING_SERVICE_NAME: str = "law-rag-api"
+    TRACING_SAMPLE_RATIO: float = 1.0  # Fraction of new traces recorded (callers' decisions are kept)
     
     # === Chunking Configuration ===
     MAX_CHUNK_TOKENS: int = 1000
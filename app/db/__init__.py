@@ -3,6 +3,7 @@
 from app.db.qdrant_client import QdrantManager, get_qdrant_manager
 from app.db.redis_client import RedisManager, get_redis_manager
 from app.db.factory import CollectionFactory
+from app.db.collection_registry import CollectionRegistry, get_collection_registry
 
 __all__ = [
     "QdrantManager",
@@ -10,4 +11,6 @@ __all__ = [
     "RedisManager", 
     "get_redis_manager",
     "CollectionFactory",
+    "CollectionRegistry",
+    "get_collection_registry",
 ]
@@ -0,0 +1,204 @@
+"""
+Collection Registry
+In-process cache of country collection metadata
+"""
+
+from typing import Dict, Optional
+import asyncio
+import logging
+
+from app.core.config import SupportedCountry, settings
+from app.db.qdrant_client import QdrantManager, get_qdrant_manager
+from app.db.factory import CollectionFactory
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionRegistry:
+    """
+    Cached existence, point counts and schema info per country.
+
+    Checking a collection before each query used to cost two Qdrant
+    round trips (collection_exists + get_collection). The registry
+    serves that from memory instead:
+
+    - entries load lazily on first use, then a background task
+      refreshes all countries every COLLECTION_REGISTRY_REFRESH seconds
+    - ingest, delete and reset invalidate the collection (via
+      invalidate_collection in the cache service), so this worker
+      reloads it on next use
+    - a country that looks empty is re-checked before it is reported
+      empty, so an ingest finished by another worker is seen at once
+
+    Entries hold CollectionFactory.collection_stats() dicts, or None
+    for a collection that does not exist. Each collection also has a
+    generation, bumped when it is invalidated or a reload finds its
+    point count changed, so caches derived from its contents (such as
+    filtered point counts) can key on it.
+    """
+
+    def __init__(self, qdrant: Optional[QdrantManager] = None):
+        self.qdrant = qdrant or get_qdrant_manager()
+        self.factory = CollectionFactory(self.qdrant.client)
+        self._entries: Dict[str, Optional[Dict]] = {}
+        self._generations: Dict[str, int] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def _load(self, country: SupportedCountry) -> Optional[Dict]:
+        """Fetch a country's collection metadata from Qdrant and cache it"""
+        collection_name = self.factory.get_collection_name(country)
+        client = self.qdrant.async_client
+
+        stats = None
+        if await client.collection_exists(collection_name):
+            info = await client.get_collection(collection_name)
+            stats = CollectionFactory.collection_stats(collection_name, country, info)
+
+        self._store(collection_name, stats)
+        return stats
+
+    def _load_sync(self, country: SupportedCountry) -> Optional[Dict]:
+        """Blocking _load through the sync client (scripts and the sync pipeline)"""
+        collection_name = self.factory.get_collection_name(country)
+        client = self.qdrant.client
+
+        stats = None
+        if client.collection_exists(collection_name):
+            info = client.get_collection(collection_name)
+            stats = CollectionFactory.collection_stats(collection_name, country, info)
+
+        self._store(collection_name, stats)
+        return stats
+
+    def _store(self, collection_name: str, stats: Optional[Dict]) -> None:
+        """Cache stats, bumping the generation if the collection's contents changed"""
+        previous = self._entries.get(collection_name)
+        if previous is not None and (stats is None or stats["points_count"] != previous["points_count"]):
+            self._bump(collection_name)
+        self._entries[collection_name] = stats
+
+    def _bump(self, collection_name: str) -> None:
+        self._generations[collection_name] = self._generations.get(collection_name, 0) + 1
+
+    async def get_stats(self, country: SupportedCountry) -> Optional[Dict]:
+        """
+        Collection statistics for a country (cached).
+
+        Returns:
+            Stats dict, or None if the collection does not exist
+        """
+        collection_name = self.factory.get_collection_name(country)
+        if collection_name in self._entries:
+            return self._entries[collection_name]
+        return await self._load(country)
+
+    def get_stats_sync(self, country: SupportedCountry) -> Optional[Dict]:
+        """Blocking get_stats, sharing the same cache"""
+        collection_name = self.factory.get_collection_name(country)
+        if collection_name in self._entries:
+            return self._entries[collection_name]
+        return self._load_sync(country)
+
+    def generation(self, collection_name: str) -> int:
+        """Counter that changes whenever the collection's cached contents go stale"""
+        return self._generations.get(collection_name, 0)
+
+    async def has_points(self, country: SupportedCountry) -> bool:
+        """
+        Whether a country's collection has data.
+
+        A cached "empty" answer is confirmed with Qdrant first; a cached
+        non-empty answer makes no Qdrant call at all.
+        """
+        stats = await self.get_stats(country)
+        if stats and stats["points_count"] > 0:
+            return True
+
+        stats = await self._load(country)
+        return bool(stats and stats["points_count"] > 0)
+
+    async def schema(self, country: SupportedCountry) -> Optional[Dict]:
+        """
+        The collection's cached schema ("config" of its stats): storage
+        profile, Matryoshka vector size and so on.
+    
+        Collections keep the schema they were created with, so searches
+        read it per collection instead of from the current settings
+        (VECTOR_STORAGE_PROFILE and MATRYOSHKA_DIMENSION only apply to
+        new collections).
+    
+        Returns:
+            Schema dict, or None if the collection does not exist
+        """
+        stats = await self.get_stats(country)
+        return stats["config"] if stats else None
+
+    def schema_sync(self, country: SupportedCountry) -> Optional[Dict]:
+        """Blocking schema, sharing the same cache"""
+        stats = self.get_stats_sync(country)
+        return stats["config"] if stats else None
+
+    async def list_collections(self) -> Dict[str, Dict]:
+        """
+        Status of every country collection (same shape as
+        CollectionFactory.list_country_collections).
+        """
+        countries = list(SupportedCountry)
+        all_stats = await asyncio.gather(*(self.get_stats(c) for c in countries))
+
+        result = {}
+        for country, stats in zip(countries, all_stats):
+            result[country.value] = {
+                "collection": self.factory.get_collection_name(country),
+                "points_count": stats["points_count"] if stats else 0,
+                "status": "active" if stats else "not_initialized",
+                "indexed_vectors_count": stats["indexed_vectors_count"] if stats else 0,
+            }
+
+        return result
+
+    def invalidate(self, collection_name: str) -> None:
+        """Drop a collection's cached metadata (reloaded on next use)"""
+        self._entries.pop(collection_name, None)
+        self._bump(collection_name)
+
+    async def refresh_all(self) -> None:
+        """Reload metadata for every country"""
+        await asyncio.gather(*(self._load(c) for c in SupportedCountry))
+
+    async def _refresh_loop(self, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh_all()
+            except Exception as e:
+                # Keep serving the last known metadata
+                logger.warning(f"Collection registry refresh failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        """Start background refreshes (called on application startup)"""
+        interval = settings.COLLECTION_REGISTRY_REFRESH
+        if interval > 0 and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop(interval))
+            logger.info(f"🗂️ Collection registry refreshing every {interval:.0f}s")
+
+    async def stop(self) -> None:
+        """Stop background refreshes (called on application shutdown)"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+
+_collection_registry: Optional[CollectionRegistry] = None
+
+
+def get_collection_registry() -> CollectionRegistry:
+    """Get collection registry singleton"""
+    global _collection_registry
+    if _collection_registry is None:
+        _collection_registry = CollectionRegistry()
+    return _collection_registry
@@ -11,7 +11,7 @@ from qdrant_client.models import (
 )
 import logging
 
-from app.core.config import SupportedCountry, settings
+from app.core.config import SearchProfile, StorageProfile, SupportedCountry, settings
 
 logger = logging.getLogger(__name__)
 
@@ -30,16 +30,146 @@ class CollectionFactory:
     # === GOLDEN SCHEMA DEFINITION ===
     # This schema is automatically applied to ALL country collections
     
+    # Default query-time oversampling per quantized profile
+    PROFILE_OVERSAMPLING = {
+        StorageProfile.INT8: 1.5,
+        StorageProfile.BINARY: 3.0,
+    }
+    
+    # Matryoshka-truncated dense vector (first stage when MATRYOSHKA_DIMENSION > 0)
+    MATRYOSHKA_VECTOR = "dense_mrl"
+    
+    # Dense search effort presets (None = Qdrant default)
+    SEARCH_EFFORT = {
+        SearchProfile.FAST: {"hnsw_ef": 32, "exact": False, "rescore": False},
+        SearchProfile.BALANCED: {"hnsw_ef": None, "exact": False, "rescore": None},
+        SearchProfile.ACCURATE: {"hnsw_ef": 256, "exact": False, "rescore": True},
+        SearchProfile.EXACT: {"hnsw_ef": None, "exact": True, "rescore": True},
+    }
+    
     @staticmethod
-    def get_golden_dense_config() -> Dict[str, VectorParams]:
-        """Get the standard dense vector configuration"""
+    def get_golden_dense_config(profile: Optional[StorageProfile] = None) -> Dict[str, VectorParams]:
+        """
+        Get the standard dense vector configuration.
+        
+        With MATRYOSHKA_DIMENSION set, a truncated "dense_mrl" vector
+        carries the HNSW index (and quantization) for the first stage, and
+        the full "dense" vector is kept on disk without a graph - it is
+        only read to rescore first-stage candidates.
+        
+        Args:
+            profile: Storage profile (default VECTOR_STORAGE_PROFILE)
+        """
+        profile = StorageProfile(profile or settings.VECTOR_STORAGE_PROFILE)
+        quantized = profile in (StorageProfile.INT8, StorageProfile.BINARY)
+        datatype = (
+            models.Datatype.FLOAT16 if profile == StorageProfile.FLOAT16
+            else models.Datatype.FLOAT32
+        )
+        hnsw_config = models.HnswConfigDiff(
+            m=settings.HNSW_M,
+            ef_construct=settings.HNSW_EF_CONSTRUCT,
+        )
+        
+        if settings.MATRYOSHKA_DIMENSION:
+            return {
+                CollectionFactory.MATRYOSHKA_VECTOR: VectorParams(
+                    size=settings.MATRYOSHKA_DIMENSION,
+                    distance=Distance.COSINE,
+                    datatype=datatype,
+                    hnsw_config=hnsw_config,
+                    quantization_config=CollectionFactory.get_quantization_config(profile),
+                ),
+                "dense": VectorParams(
+                    size=settings.EMBEDDING_DIMENSION,
+                    distance=Distance.COSINE,
+                    datatype=datatype,
+                    hnsw_config=models.HnswConfigDiff(m=0),  # Rescoring only - no graph
+                    on_disk=True,
+                ),
+            }
+        
         return {
             "dense": VectorParams(
                 size=settings.EMBEDDING_DIMENSION,  # 1024 for Qwen3-Embedding
                 distance=Distance.COSINE,
+                datatype=datatype,
+                hnsw_config=hnsw_config,
+                quantization_config=CollectionFactory.get_quantization_config(profile),
+                on_disk=quantized,  # Originals only needed for rescoring
             )
         }
     
+    @staticmethod
+    def get_quantization_config(profile: Optional[StorageProfile] = None) -> Optional[models.QuantizationConfig]:
+        """Get the dense vector quantization config for a profile (None if unquantized)"""
+        profile = StorageProfile(profile or settings.VECTOR_STORAGE_PROFILE)
+        
+        if profile == StorageProfile.INT8:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True,
+                )
+            )
+        if profile == StorageProfile.BINARY:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+        return None
+    
+    @staticmethod
+    def get_search_params(
+        profile: Optional[StorageProfile] = None,
+        search_profile: Optional[SearchProfile] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: Optional[bool] = None,
+        rescore: Optional[bool] = None,
+    ) -> Optional[models.SearchParams]:
+        """
+        Get dense search params matching a storage profile and search effort.
+        
+        Quantized profiles search the compact vectors with oversampling,
+        then rescore the candidates with the original vectors.
+        
+        Args:
+            profile: Storage profile (default VECTOR_STORAGE_PROFILE)
+            search_profile: Effort preset (default SEARCH_PROFILE)
+            hnsw_ef: Override the preset's HNSW ef
+            exact: Override the preset's exact (brute force) flag
+            rescore: Override quantization rescoring
+            
+        Returns:
+            SearchParams, or None when everything is at Qdrant defaults
+        """
+        profile = StorageProfile(profile or settings.VECTOR_STORAGE_PROFILE)
+        effort = CollectionFactory.SEARCH_EFFORT[SearchProfile(search_profile or settings.SEARCH_PROFILE)]
+        
+        hnsw_ef = hnsw_ef if hnsw_ef is not None else effort["hnsw_ef"]
+        exact = exact if exact is not None else effort["exact"]
+        
+        quantization = None
+        if profile in CollectionFactory.PROFILE_OVERSAMPLING:
+            if rescore is None:
+                rescore = effort["rescore"] if effort["rescore"] is not None else settings.QUANTIZATION_RESCORE
+            quantization = models.QuantizationSearchParams(
+                rescore=rescore,
+                oversampling=(
+                    settings.QUANTIZATION_OVERSAMPLING
+                    or CollectionFactory.PROFILE_OVERSAMPLING[profile]
+                ),
+            )
+        
+        if hnsw_ef is None and not exact and quantization is None:
+            return None
+        
+        return models.SearchParams(
+            hnsw_ef=min(hnsw_ef, settings.HNSW_EF_MAX) if hnsw_ef else None,
+            exact=exact,
+            quantization=quantization,
+        )
+    
     @staticmethod
     def get_golden_sparse_config() -> Dict[str, SparseVectorParams]:
         """Get the standard sparse vector configuration"""
@@ -101,9 +231,27 @@ class CollectionFactory:
         # 2. Create with Golden Schema
         logger.info(f"🚀 Initializing new legal system for: {country.name}")
         
+        self.create_golden_collection(collection_name)
+        
+        return collection_name
+    
+    def create_golden_collection(
+        self,
+        collection_name: str,
+        profile: Optional[StorageProfile] = None,
+    ) -> None:
+        """
+        Create a collection with the Golden Schema and payload indexes.
+        
+        Args:
+            collection_name: Collection to create
+            profile: Storage profile (default VECTOR_STORAGE_PROFILE)
+        """
+        profile = StorageProfile(profile or settings.VECTOR_STORAGE_PROFILE)
+        
         self.client.create_collection(
             collection_name=collection_name,
-            vectors_config=self.get_golden_dense_config(),
+            vectors_config=self.get_golden_dense_config(profile),
             sparse_vectors_config=self.get_golden_sparse_config(),
         )
         
@@ -111,10 +259,13 @@ class CollectionFactory:
         self._create_payload_indexes(collection_name)
         
         logger.info(f"✅ Collection '{collection_name}' created with Golden Schema")
-        logger.info(f"   - Dense vectors: {settings.EMBEDDING_DIMENSION}D (Cosine)")
+        logger.info(
+            f"   - Dense vectors: {settings.EMBEDDING_DIMENSION}D (Cosine, {profile.value}, "
+            f"HNSW m={settings.HNSW_M} ef_construct={settings.HNSW_EF_CONSTRUCT})"
+        )
+        if settings.MATRYOSHKA_DIMENSION:
+            logger.info(f"   - First stage: {settings.MATRYOSHKA_DIMENSION}D Matryoshka vector")
         logger.info(f"   - Sparse vectors: BM25 with IDF modifier")
-        
-        return collection_name
     
     def _create_payload_indexes(self, collection_name: str) -> None:
         """
@@ -161,14 +312,14 @@ class CollectionFactory:
                     "collection": collection_name,
                     "points_count": info.points_count,
                     "status": "active",
-                    "vectors_count": info.vectors_count,
+                    "indexed_vectors_count": info.indexed_vectors_count or 0,
                 }
             else:
                 result[country.value] = {
                     "collection": collection_name,
                     "points_count": 0,
                     "status": "not_initialized",
-                    "vectors_count": 0,
+                    "indexed_vectors_count": 0,
                 }
         
         return result
@@ -221,15 +372,61 @@ class CollectionFactory:
             return None
         
         info = self.client.get_collection(collection_name)
+        return self.collection_stats(collection_name, country, info)
+    
+    @classmethod
+    def matryoshka_size(cls, info: models.CollectionInfo) -> Optional[int]:
+        """Size of the collection's Matryoshka vector (None if it was created without one)"""
+        vectors = info.config.params.vectors
+        mrl = vectors.get(cls.MATRYOSHKA_VECTOR) if isinstance(vectors, dict) else None
+        return mrl.size if mrl is not None else None
+    
+    @staticmethod
+    def storage_profile(
+        datatype: Optional[models.Datatype],
+        quantization: Optional[models.QuantizationConfig],
+    ) -> StorageProfile:
+        """Storage profile a collection was created with, from its dense vector config"""
+        if isinstance(quantization, models.ScalarQuantization):
+            return StorageProfile.INT8
+        if isinstance(quantization, models.BinaryQuantization):
+            return StorageProfile.BINARY
+        if datatype == models.Datatype.FLOAT16:
+            return StorageProfile.FLOAT16
+        return StorageProfile.FLOAT32
+    
+    @classmethod
+    def collection_stats(
+        cls,
+        collection_name: str,
+        country: SupportedCountry,
+        info: models.CollectionInfo,
+    ) -> Dict:
+        """
+        Build collection statistics from a get_collection() result.
+        
+        Shared by get_collection_stats and the CollectionRegistry, which
+        fetches the info with the async client.
+        """
+        dense = info.config.params.vectors["dense"]
+        quantization = dense.quantization_config or info.config.quantization_config
+        mrl = info.config.params.vectors.get(cls.MATRYOSHKA_VECTOR)
+        if mrl is not None:
+            quantization = mrl.quantization_config or info.config.quantization_config
         
         return {
             "collection_name": collection_name,
             "country": country.value,
-            "points_count": info.points_count,
+            "points_count": info.points_count or 0,
+            "indexed_vectors_count": info.indexed_vectors_count or 0,
             "status": info.status.value,
             "config": {
                 "dense_size": settings.EMBEDDING_DIMENSION,
                 "dense_distance": "cosine",
+                "dense_datatype": dense.datatype.value if dense.datatype else "float32",
+                "dense_quantization": type(quantization).__name__ if quantization else None,
+                "storage_profile": cls.storage_profile(dense.datatype, quantization).value,
+                "matryoshka_size": mrl.size if mrl is not None else None,
                 "sparse_enabled": True,
                 "sparse_modifier": "idf",
             }
@@ -3,8 +3,8 @@ Qdrant Vector Database Client
 Connection management and operations for hybrid vector search
 """
 
-from typing import List, Dict, Any, Optional
-from qdrant_client import QdrantClient, models
+from typing import List, Dict, Any, Callable, Optional, Union
+from qdrant_client import QdrantClient, AsyncQdrantClient, models
 from qdrant_client.models import (
     Distance, VectorParams, SparseVectorParams,
     PointStruct, Filter, FieldCondition, MatchValue, MatchAny,
@@ -13,18 +13,62 @@ from qdrant_client.models import (
 import logging
 
 from app.core.config import settings
+from app.db.factory import CollectionFactory
+from app.utils.metrics import observe_qdrant
+from app.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+# Call arguments recorded on Qdrant spans (when passed)
+_SPAN_ARGUMENTS = {
+    "db.collection.name": "collection_name",
+    "qdrant.mode": "mode",
+    "qdrant.limit": "limit",
+    "qdrant.searches": "searches",
+    "qdrant.ids": "ids",
+    "qdrant.points": "points",
+}
+
+
+def _instrumented(operation: str) -> Callable:
+    """Latency metrics and a trace span for a QdrantManager call"""
+    trace = traced(
+        f"qdrant.{operation}",
+        arg_attributes=_SPAN_ARGUMENTS,
+        **{"db.system": "qdrant", "db.operation.name": operation},
+    )
+
+    def decorator(func: Callable) -> Callable:
+        return observe_qdrant(operation)(trace(func))
+
+    return decorator
+
 
 class QdrantManager:
     """
     Qdrant database manager singleton.
     Handles connection, collection operations, and hybrid search.
+    
+    The sync client serves ingestion and scripts; the async client
+    serves the request path so searches never block the event loop.
+    Both use the same transport: REST/JSON by default, gRPC when
+    QDRANT_PREFER_GRPC is set (avoids JSON-encoding every vector).
     """
     
     _instance: Optional['QdrantManager'] = None
     _client: Optional[QdrantClient] = None
+    _async_client: Optional[AsyncQdrantClient] = None
+    
+    # === Payload Selection ===
+    # Candidate searches return only what reranking needs; display fields
+    # are fetched once for the final top-k (retrieve_payloads_async).
+    # Content is "content", or "content_z" when stored compressed.
+    RERANK_PAYLOAD_FIELDS = ["chunk_id", "content", "content_z", "article_number"]
+    DISPLAY_PAYLOAD_FIELDS = [
+        "chunk_id", "article_number", "article_text", "law_name", "law_type",
+        "page_number", "chapter", "chunk_part", "total_parts",
+    ]
+    ARTICLE_PAYLOAD_FIELDS = DISPLAY_PAYLOAD_FIELDS + ["content", "content_z"]
     
     def __new__(cls):
         if cls._instance is None:
@@ -35,16 +79,35 @@ class QdrantManager:
         if self._client is None:
             self._connect()
     
+    @staticmethod
+    def connection_kwargs(prefer_grpc: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Client constructor arguments from settings.
+        
+        Args:
+            prefer_grpc: Override QDRANT_PREFER_GRPC (used by benchmarks)
+            
+        Returns:
+            Keyword arguments for QdrantClient / AsyncQdrantClient
+        """
+        return {
+            "host": settings.QDRANT_HOST,
+            "port": settings.QDRANT_PORT,
+            "grpc_port": settings.QDRANT_GRPC_PORT,
+            "prefer_grpc": settings.QDRANT_PREFER_GRPC if prefer_grpc is None else prefer_grpc,
+            "https": settings.QDRANT_HTTPS,
+            "api_key": settings.QDRANT_API_KEY,
+            "timeout": settings.QDRANT_TIMEOUT,
+        }
+    
     def _connect(self):
         """Establish connection to Qdrant"""
-        logger.info(f"Connecting to Qdrant at {settings.QDRANT_HOST}:{settings.QDRANT_PORT}")
+        if settings.QDRANT_PREFER_GRPC:
+            logger.info(f"Connecting to Qdrant at {settings.QDRANT_HOST}:{settings.QDRANT_GRPC_PORT} (gRPC)")
+        else:
+            logger.info(f"Connecting to Qdrant at {settings.QDRANT_HOST}:{settings.QDRANT_PORT}")
         
-        self._client = QdrantClient(
-            host=settings.QDRANT_HOST,
-            port=settings.QDRANT_PORT,
-            api_key=settings.QDRANT_API_KEY,
-            timeout=60,
-        )
+        self._client = QdrantClient(**self.connection_kwargs())
         
         # Test connection
         try:
@@ -61,6 +124,19 @@ class QdrantManager:
             self._connect()
         return self._client
     
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        """Get the async Qdrant client instance (created lazily)"""
+        if self._async_client is None:
+            self._async_client = AsyncQdrantClient(**self.connection_kwargs())
+        return self._async_client
+    
+    async def close_async(self) -> None:
+        """Close the async client (called on application shutdown)"""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+    
     def collection_exists(self, collection_name: str) -> bool:
         """Check if a collection exists"""
         return self.client.collection_exists(collection_name)
@@ -74,7 +150,7 @@ class QdrantManager:
         return {
             "name": collection_name,
             "points_count": info.points_count,
-            "vectors_count": info.vectors_count,
+            "indexed_vectors_count": info.indexed_vectors_count or 0,
             "status": info.status.value,
         }
     
@@ -108,11 +184,12 @@ class QdrantManager:
         logger.info(f"✅ Created collection: {collection_name}")
         return True
     
+    @_instrumented("upsert")
     def upsert_points(
         self,
         collection_name: str,
         points: List[Dict[str, Any]],
-        batch_size: int = 100,
+        batch_size: Optional[int] = None,
     ) -> int:
         """
         Upsert points to collection with batching.
@@ -120,13 +197,15 @@ class QdrantManager:
         Args:
             collection_name: Target collection
             points: List of point dicts with id, vector, sparse_vector, payload
-            batch_size: Batch size for upserts
+            batch_size: Batch size for upserts (default QDRANT_UPSERT_BATCH_SIZE)
             
         Returns:
             Number of points upserted
         """
         from tqdm import tqdm
         
+        batch_size = batch_size or settings.QDRANT_UPSERT_BATCH_SIZE
+        matryoshka_size = self.matryoshka_size(collection_name)
         total = 0
         num_batches = (len(points) + batch_size - 1) // batch_size
         
@@ -141,7 +220,7 @@ class QdrantManager:
                     # Build vector dict
                     vectors = {}
                     if "dense_vector" in p:
-                        vectors["dense"] = p["dense_vector"]
+                        vectors.update(self.dense_vectors(p["dense_vector"], matryoshka_size))
                     if "sparse_vector" in p:
                         vectors["sparse"] = models.SparseVector(
                             indices=p["sparse_vector"]["indices"],
@@ -165,69 +244,406 @@ class QdrantManager:
         logger.info(f"✅ Upserted {total} points to {collection_name}")
         return total
     
+    def matryoshka_size(self, collection_name: str) -> Optional[int]:
+        """
+        Size of a collection's Matryoshka vector, read from its schema.
+        
+        MATRYOSHKA_DIMENSION only shapes new collections, so whether points
+        and queries use the truncated vector is decided per collection.
+        The request path reads it from the CollectionRegistry instead.
+        
+        Returns:
+            Dimension, or None if the collection has no Matryoshka vector
+        """
+        info = self.client.get_collection(collection_name)
+        return CollectionFactory.matryoshka_size(info)
+    
+    @staticmethod
+    def dense_vectors(
+        dense_vector: List[float],
+        matryoshka_size: Optional[int] = None,
+    ) -> Dict[str, List[float]]:
+        """
+        Named dense vectors for a point: "dense", plus its Matryoshka
+        prefix when the collection has one (Qdrant normalizes both for
+        cosine distance).
+        """
+        vectors = {"dense": dense_vector}
+        if matryoshka_size:
+            vectors[CollectionFactory.MATRYOSHKA_VECTOR] = list(dense_vector[:matryoshka_size])
+        return vectors
+    
+    @staticmethod
+    def _dense_prefetch(
+        dense_vector: List[float],
+        limit: int,
+        search_params: Optional[models.SearchParams],
+        matryoshka_size: Optional[int] = None,
+    ) -> models.Prefetch:
+        """
+        Dense candidate search.
+        
+        For a collection with a Matryoshka vector this is a nested prefetch:
+        HNSW search on the truncated vector for limit x MATRYOSHKA_OVERSAMPLING
+        candidates, rescored on the full vector down to `limit`.
+        """
+        if not matryoshka_size:
+            return models.Prefetch(
+                query=dense_vector,
+                using="dense",
+                params=search_params,
+                limit=limit,
+            )
+        
+        return models.Prefetch(
+            prefetch=models.Prefetch(
+                query=list(dense_vector[:matryoshka_size]),
+                using=CollectionFactory.MATRYOSHKA_VECTOR,
+                params=search_params,
+                limit=int(limit * settings.MATRYOSHKA_OVERSAMPLING),
+            ),
+            query=dense_vector,
+            using="dense",
+            limit=limit,
+        )
+    
+    @staticmethod
+    def _build_query(
+        mode: str,
+        dense_vector: Optional[List[float]],
+        sparse_vector: Optional[Dict[str, List]],
+        limit: int,
+        search_params: Optional[models.SearchParams] = None,
+        matryoshka_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build query arguments (QueryRequest fields) for a retrieval mode.
+        
+        - dense / sparse: query one named vector directly
+        - hybrid_rrf / hybrid_dbsf: prefetch both, fuse with RRF or DBSF
+        
+        With matryoshka_size (the collection's Matryoshka vector size),
+        dense search runs on the truncated vector first and is rescored on
+        the full one (see _dense_prefetch).
+        
+        search_params (default: the storage profile's, e.g. quantization
+        oversampling and rescoring) apply to the dense search only.
+        """
+        if search_params is None:
+            search_params = CollectionFactory.get_search_params()
+        
+        sparse_vec = None
+        if sparse_vector is not None:
+            sparse_vec = models.SparseVector(
+                indices=sparse_vector["indices"],
+                values=sparse_vector["values"],
+            )
+        
+        if mode == "dense":
+            if matryoshka_size:
+                first_stage = QdrantManager._dense_prefetch(
+                    dense_vector, limit, search_params, matryoshka_size
+                ).prefetch
+                return {"prefetch": first_stage, "query": dense_vector, "using": "dense"}
+            return {"query": dense_vector, "using": "dense", "params": search_params}
+        if mode == "sparse":
+            return {"query": sparse_vec, "using": "sparse"}
+        
+        fusion = models.Fusion.DBSF if mode == "hybrid_dbsf" else models.Fusion.RRF
+        return {
+            "prefetch": [
+                QdrantManager._dense_prefetch(dense_vector, limit, search_params, matryoshka_size),
+                models.Prefetch(
+                    query=sparse_vec,
+                    using="sparse",
+                    limit=limit,
+                ),
+            ],
+            "query": models.FusionQuery(fusion=fusion),
+        }
+    
+    @classmethod
+    def _query_points_kwargs(
+        cls,
+        mode: str,
+        dense_vector: Optional[List[float]],
+        sparse_vector: Optional[Dict[str, List]],
+        limit: int,
+        search_params: Optional[models.SearchParams] = None,
+        matryoshka_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """_build_query output renamed to query_points() keyword arguments"""
+        query = cls._build_query(mode, dense_vector, sparse_vector, limit, search_params, matryoshka_size)
+        return {
+            "prefetch": query.get("prefetch"),
+            "query": query["query"],
+            "using": query.get("using"),
+            "search_params": query.get("params"),
+        }
+    
+    @staticmethod
+    def _format_points(points: List[Any]) -> List[Dict]:
+        """Convert scored points to plain result dicts"""
+        return [
+            {
+                "id": point.id,
+                "score": point.score,
+                "payload": point.payload,
+            }
+            for point in points
+        ]
+    
+    @_instrumented("query")
     def hybrid_search(
         self,
         collection_name: str,
-        dense_vector: List[float],
-        sparse_vector: Dict[str, List],
+        dense_vector: Optional[List[float]],
+        sparse_vector: Optional[Dict[str, List]],
         filter_conditions: Optional[Filter] = None,
         limit: int = 25,
+        mode: str = "hybrid_rrf",
+        search_params: Optional[models.SearchParams] = None,
+        with_payload: Union[bool, List[str]] = True,
+        matryoshka_size: Optional[int] = None,
     ) -> List[Dict]:
         """
-        Perform hybrid search with RRF fusion.
+        Perform hybrid search (or a single-vector search, depending on mode).
         
         Args:
             collection_name: Collection to search
-            dense_vector: Dense query vector
-            sparse_vector: Sparse query vector (indices, values)
+            dense_vector: Dense query vector (unused for mode="sparse")
+            sparse_vector: Sparse query vector (indices, values; unused for mode="dense")
             filter_conditions: Optional filter
-            limit: Number of results
+            limit: Number of results (also the per-vector prefetch depth)
+            mode: dense, sparse, hybrid_rrf or hybrid_dbsf
+            search_params: Dense search params (default: storage profile's)
+            with_payload: True, or only these payload fields (e.g. RERANK_PAYLOAD_FIELDS)
+            matryoshka_size: The collection's Matryoshka vector size (None = no first stage)
             
         Returns:
             List of search results with payloads and scores
         """
-        # Build sparse vector
-        sparse_vec = models.SparseVector(
-            indices=sparse_vector["indices"],
-            values=sparse_vector["values"],
+        results = self.client.query_points(
+            collection_name=collection_name,
+            **self._query_points_kwargs(
+                mode, dense_vector, sparse_vector, limit, search_params, matryoshka_size
+            ),
+            query_filter=filter_conditions,
+            limit=limit,
+            with_payload=with_payload,
         )
         
-        # Perform hybrid search with prefetch and RRF fusion
-        results = self.client.query_points(
+        return self._format_points(results.points)
+    
+    @_instrumented("query")
+    async def hybrid_search_async(
+        self,
+        collection_name: str,
+        dense_vector: Optional[List[float]],
+        sparse_vector: Optional[Dict[str, List]],
+        filter_conditions: Optional[Filter] = None,
+        limit: int = 25,
+        mode: str = "hybrid_rrf",
+        search_params: Optional[models.SearchParams] = None,
+        with_payload: Union[bool, List[str]] = True,
+        matryoshka_size: Optional[int] = None,
+    ) -> List[Dict]:
+        """Async version of hybrid_search (used on the request path)"""
+        results = await self.async_client.query_points(
             collection_name=collection_name,
-            prefetch=[
-                models.Prefetch(
-                    query=dense_vector,
-                    using="dense",
-                    limit=limit,
-                ),
-                models.Prefetch(
-                    query=sparse_vec,
-                    using="sparse",
-                    limit=limit,
-                ),
-            ],
-            query=models.FusionQuery(fusion=models.Fusion.RRF),
+            **self._query_points_kwargs(
+                mode, dense_vector, sparse_vector, limit, search_params, matryoshka_size
+            ),
             query_filter=filter_conditions,
             limit=limit,
-            with_payload=True,
+            with_payload=with_payload,
         )
         
-        return [
+        return self._format_points(results.points)
+    
+    @_instrumented("query_batch")
+    async def hybrid_search_batch_async(
+        self,
+        collection_name: str,
+        searches: List[Dict[str, Any]],
+        matryoshka_size: Optional[int] = None,
+    ) -> List[List[Dict]]:
+        """
+        Run many hybrid searches in one round trip (Qdrant batch query API).
+        
+        Args:
+            collection_name: Collection to search
+            searches: One dict per search with the hybrid_search arguments
+                (dense_vector, sparse_vector, filter_conditions, limit, mode,
+                search_params, with_payload)
+            matryoshka_size: The collection's Matryoshka vector size
+            
+        Returns:
+            One result list per search, in order
+        """
+        requests = [
+            models.QueryRequest(
+                **self._build_query(
+                    search.get("mode", "hybrid_rrf"),
+                    search.get("dense_vector"),
+                    search.get("sparse_vector"),
+                    search.get("limit", 25),
+                    search.get("search_params"),
+                    matryoshka_size,
+                ),
+                filter=search.get("filter_conditions"),
+                limit=search.get("limit", 25),
+                with_payload=search.get("with_payload", True),
+            )
+            for search in searches
+        ]
+        
+        responses = await self.async_client.query_batch_points(
+            collection_name=collection_name,
+            requests=requests,
+        )
+        
+        return [self._format_points(response.points) for response in responses]
+    
+    # === Article Lookup ===
+    
+    @staticmethod
+    def _article_filter(
+        article_number: int,
+        law_types: Optional[List[str]] = None,
+        law_name: Optional[str] = None,
+    ) -> Filter:
+        """Filter on the article_number / law_type / law_name payload indexes"""
+        conditions = [
+            FieldCondition(key="article_number", match=MatchValue(value=article_number)),
+        ]
+        if law_types:
+            conditions.append(FieldCondition(key="law_type", match=MatchAny(any=law_types)))
+        if law_name:
+            conditions.append(FieldCondition(key="law_name", match=MatchValue(value=law_name)))
+        return Filter(must=conditions)
+    
+    @staticmethod
+    def _format_article_records(records: List[Any]) -> List[Dict]:
+        """Convert scrolled records to result dicts, ordered by law then part"""
+        results = [
             {
-                "id": point.id,
-                "score": point.score,
-                "payload": point.payload,
+                "id": record.id,
+                "score": 1.0,  # Exact match
+                "payload": record.payload or {},
             }
-            for point in results.points
+            for record in records
         ]
+        results.sort(key=lambda r: (
+            r["payload"].get("law_name", ""),
+            r["payload"].get("chunk_part", 1),
+        ))
+        return results
     
+    @_instrumented("scroll")
+    def get_article_chunks(
+        self,
+        collection_name: str,
+        article_number: int,
+        law_types: Optional[List[str]] = None,
+        law_name: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict]:
+        """
+        Get every chunk of an article by exact payload match (no vectors).
+        
+        Args:
+            collection_name: Collection to search
+            article_number: Article number
+            law_types: Optional law type filter
+            law_name: Optional law name filter
+            limit: Max chunks to return
+            
+        Returns:
+            Result dicts ordered by law name, then chunk part
+        """
+        records, _ = self.client.scroll(
+            collection_name=collection_name,
+            scroll_filter=self._article_filter(article_number, law_types, law_name),
+            limit=limit,
+            with_payload=self.ARTICLE_PAYLOAD_FIELDS,
+            with_vectors=False,
+        )
+        return self._format_article_records(records)
+    
+    @_instrumented("scroll")
+    async def get_article_chunks_async(
+        self,
+        collection_name: str,
+        article_number: int,
+        law_types: Optional[List[str]] = None,
+        law_name: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict]:
+        """Async version of get_article_chunks"""
+        records, _ = await self.async_client.scroll(
+            collection_name=collection_name,
+            scroll_filter=self._article_filter(article_number, law_types, law_name),
+            limit=limit,
+            with_payload=self.ARTICLE_PAYLOAD_FIELDS,
+            with_vectors=False,
+        )
+        return self._format_article_records(records)
+    
+    @_instrumented("retrieve")
+    def retrieve_payloads(
+        self,
+        collection_name: str,
+        ids: List[Union[str, int]],
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Dict]:
+        """
+        Fetch payloads for known point IDs in one call (no vectors).
+        
+        Args:
+            collection_name: Collection to read
+            ids: Point IDs
+            fields: Payload fields to return (default DISPLAY_PAYLOAD_FIELDS)
+            
+        Returns:
+            Payload per point ID (as str); missing points are omitted
+        """
+        if not ids:
+            return {}
+        records = self.client.retrieve(
+            collection_name=collection_name,
+            ids=ids,
+            with_payload=fields or self.DISPLAY_PAYLOAD_FIELDS,
+            with_vectors=False,
+        )
+        return {str(record.id): record.payload or {} for record in records}
+    
+    @_instrumented("retrieve")
+    async def retrieve_payloads_async(
+        self,
+        collection_name: str,
+        ids: List[Union[str, int]],
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Dict]:
+        """Async version of retrieve_payloads"""
+        if not ids:
+            return {}
+        records = await self.async_client.retrieve(
+            collection_name=collection_name,
+            ids=ids,
+            with_payload=fields or self.DISPLAY_PAYLOAD_FIELDS,
+            with_vectors=False,
+        )
+        return {str(record.id): record.payload or {} for record in records}
+    
+    @_instrumented("search")
     def dense_search(
         self,
         collection_name: str,
         dense_vector: List[float],
         filter_conditions: Optional[Filter] = None,
         limit: int = 10,
+        with_payload: Union[bool, List[str]] = True,
     ) -> List[Dict]:
         """
         Perform dense-only vector search.
@@ -237,6 +653,7 @@ class QdrantManager:
             dense_vector: Query vector
             filter_conditions: Optional filter
             limit: Number of results
+            with_payload: True, or only these payload fields
             
         Returns:
             List of search results
@@ -246,17 +663,10 @@ class QdrantManager:
             query_vector=("dense", dense_vector),
             query_filter=filter_conditions,
             limit=limit,
-            with_payload=True,
+            with_payload=with_payload,
         )
         
-        return [
-            {
-                "id": point.id,
-                "score": point.score,
-                "payload": point.payload,
-            }
-            for point in results
-        ]
+        return self._format_points(results)
     
     def delete_collection(self, collection_name: str) -> bool:
         """Delete a collection"""
@@ -274,6 +684,53 @@ class QdrantManager:
         info = self.client.get_collection(collection_name)
         return info.points_count
     
+    async def get_points_count_async(self, collection_name: str) -> int:
+        """Async version of get_points_count"""
+        if not await self.async_client.collection_exists(collection_name):
+            return 0
+        info = await self.async_client.get_collection(collection_name)
+        return info.points_count
+    
+    @_instrumented("count")
+    def count_points(
+        self,
+        collection_name: str,
+        filter_conditions: Optional[Filter] = None,
+        exact: bool = False,
+    ) -> int:
+        """
+        Count points matching a filter.
+        
+        Args:
+            collection_name: Collection to count
+            filter_conditions: Optional filter
+            exact: Exact count (slower) instead of the payload-index estimate
+            
+        Returns:
+            Number of matching points
+        """
+        result = self.client.count(
+            collection_name=collection_name,
+            count_filter=filter_conditions,
+            exact=exact,
+        )
+        return result.count
+    
+    @_instrumented("count")
+    async def count_points_async(
+        self,
+        collection_name: str,
+        filter_conditions: Optional[Filter] = None,
+        exact: bool = False,
+    ) -> int:
+        """Async version of count_points"""
+        result = await self.async_client.count(
+            collection_name=collection_name,
+            count_filter=filter_conditions,
+            exact=exact,
+        )
+        return result.count
+    
     def health_check(self) -> bool:
         """Check if Qdrant is healthy"""
         try:
@@ -281,6 +738,14 @@ class QdrantManager:
             return True
         except Exception:
             return False
+    
+    async def health_check_async(self) -> bool:
+        """Async version of health_check"""
+        try:
+            await self.async_client.get_collections()
+            return True
+        except Exception:
+            return False
 
 
 def get_qdrant_manager() -> QdrantManager:
@@ -8,21 +8,32 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 from uuid import uuid4
 import redis
+import redis.asyncio as aioredis
 import logging
 
 from app.core.config import settings
+from app.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
 
+def _traced(operation: str):
+    """Trace span for a RedisManager call"""
+    return traced(f"redis.{operation}", **{"db.system": "redis", "db.operation.name": operation})
+
+
 class RedisManager:
     """
     Redis connection manager singleton.
     Handles session storage and caching.
+    
+    Every request-path operation has an `*_async` twin backed by
+    redis.asyncio so Redis I/O never blocks the event loop.
     """
     
     _instance: Optional['RedisManager'] = None
     _client: Optional[redis.Redis] = None
+    _async_client: Optional[aioredis.Redis] = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -61,8 +72,55 @@ class RedisManager:
             self._connect()
         return self._client
     
+    @property
+    def async_client(self) -> aioredis.Redis:
+        """Get async Redis client instance (created lazily)"""
+        if self._async_client is None:
+            self._async_client = aioredis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                password=settings.REDIS_PASSWORD,
+                db=settings.REDIS_DB,
+                decode_responses=True,
+                socket_timeout=5,
+            )
+        return self._async_client
+    
+    async def close_async(self) -> None:
+        """Close the async client (called on application shutdown)"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+    
     # === Session Management ===
     
+    @staticmethod
+    def _new_session_data(metadata: Optional[Dict] = None) -> Dict:
+        """Build the initial session document"""
+        return {
+            "created_at": datetime.now().isoformat(),
+            "updated_at": datetime.now().isoformat(),
+            "messages": [],
+            "metadata": metadata or {},
+        }
+    
+    @staticmethod
+    def _append_message(
+        session: Dict,
+        role: str,
+        content: str,
+        metadata: Optional[Dict] = None,
+    ) -> None:
+        """Append a message to a session document in place"""
+        session["messages"].append({
+            "role": role,
+            "content": content,
+            "timestamp": datetime.now().isoformat(),
+            "metadata": metadata or {},
+        })
+        session["updated_at"] = datetime.now().isoformat()
+    
+    @_traced("create_session")
     def create_session(self, metadata: Optional[Dict] = None) -> str:
         """
         Create a new session.
@@ -74,12 +132,7 @@ class RedisManager:
             Session ID
         """
         session_id = str(uuid4())
-        session_data = {
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "messages": [],
-            "metadata": metadata or {},
-        }
+        session_data = self._new_session_data(metadata)
         
         self.client.setex(
             f"session:{session_id}",
@@ -90,6 +143,7 @@ class RedisManager:
         logger.info(f"Created session: {session_id}")
         return session_id
     
+    @_traced("get_session")
     def get_session(self, session_id: str) -> Optional[Dict]:
         """
         Get session data.
@@ -105,10 +159,25 @@ class RedisManager:
             return json.loads(data)
         return None
     
+    @_traced("get_session")
+    async def get_session_async(self, session_id: str) -> Optional[Dict]:
+        """Async version of get_session"""
+        data = await self.async_client.get(f"session:{session_id}")
+        if data:
+            return json.loads(data)
+        return None
+    
+    @_traced("session_exists")
     def session_exists(self, session_id: str) -> bool:
         """Check if session exists"""
         return self.client.exists(f"session:{session_id}") > 0
     
+    @_traced("session_exists")
+    async def session_exists_async(self, session_id: str) -> bool:
+        """Async version of session_exists"""
+        return await self.async_client.exists(f"session:{session_id}") > 0
+    
+    @_traced("add_message")
     def add_message(
         self,
         session_id: str,
@@ -132,13 +201,7 @@ class RedisManager:
         if not session:
             return False
         
-        session["messages"].append({
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat(),
-            "metadata": metadata or {},
-        })
-        session["updated_at"] = datetime.now().isoformat()
+        self._append_message(session, role, content, metadata)
         
         # Update with TTL refresh
         self.client.setex(
@@ -149,6 +212,30 @@ class RedisManager:
         
         return True
     
+    @_traced("add_message")
+    async def add_message_async(
+        self,
+        session_id: str,
+        role: str,
+        content: str,
+        metadata: Optional[Dict] = None,
+    ) -> bool:
+        """Async version of add_message"""
+        session = await self.get_session_async(session_id)
+        if not session:
+            return False
+        
+        self._append_message(session, role, content, metadata)
+        
+        await self.async_client.setex(
+            f"session:{session_id}",
+            settings.SESSION_TTL,
+            json.dumps(session, ensure_ascii=False),
+        )
+        
+        return True
+    
+    @_traced("get_messages")
     def get_messages(
         self,
         session_id: str,
@@ -173,6 +260,7 @@ class RedisManager:
             return messages[-limit:]
         return messages
     
+    @_traced("delete_session")
     def delete_session(self, session_id: str) -> bool:
         """Delete a session"""
         result = self.client.delete(f"session:{session_id}")
@@ -187,6 +275,7 @@ class RedisManager:
     
     # === Caching ===
     
+    @_traced("cache_set")
     def cache_set(
         self,
         key: str,
@@ -215,6 +304,26 @@ class RedisManager:
             logger.error(f"Cache set error: {e}")
             return False
     
+    @_traced("cache_set")
+    async def cache_set_async(
+        self,
+        key: str,
+        value: Any,
+        ttl: int = 3600,
+    ) -> bool:
+        """Async version of cache_set"""
+        try:
+            await self.async_client.setex(
+                f"cache:{key}",
+                ttl,
+                json.dumps(value, ensure_ascii=False),
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Cache set error: {e}")
+            return False
+    
+    @_traced("cache_get")
     def cache_get(self, key: str) -> Optional[Any]:
         """
         Get a cached value.
@@ -230,10 +339,53 @@ class RedisManager:
             return json.loads(data)
         return None
     
+    @_traced("cache_get")
+    async def cache_get_async(self, key: str) -> Optional[Any]:
+        """Async version of cache_get"""
+        data = await self.async_client.get(f"cache:{key}")
+        if data:
+            return json.loads(data)
+        return None
+    
+    @_traced("cache_delete")
     def cache_delete(self, key: str) -> bool:
         """Delete a cache entry"""
         return self.client.delete(f"cache:{key}") > 0
     
+    # === Collection Versions ===
+    
+    @_traced("get_collection_version")
+    def get_collection_version(self, collection_name: str) -> int:
+        """
+        Get the data version of a collection.
+        
+        The version is bumped whenever the collection's points change, so
+        caches can include it in their keys and never serve results from
+        before an ingest, delete or reset.
+        
+        Args:
+            collection_name: Qdrant collection name
+            
+        Returns:
+            Current version (0 if never bumped)
+        """
+        return int(self.client.get(f"collection_version:{collection_name}") or 0)
+    
+    @_traced("get_collection_version")
+    async def get_collection_version_async(self, collection_name: str) -> int:
+        """Async version of get_collection_version"""
+        return int(await self.async_client.get(f"collection_version:{collection_name}") or 0)
+    
+    @_traced("bump_collection_version")
+    def bump_collection_version(self, collection_name: str) -> int:
+        """Increment a collection's data version, returning the new value"""
+        return self.client.incr(f"collection_version:{collection_name}")
+    
+    @_traced("bump_collection_version")
+    async def bump_collection_version_async(self, collection_name: str) -> int:
+        """Async version of bump_collection_version"""
+        return await self.async_client.incr(f"collection_version:{collection_name}")
+    
     # === Health Check ===
     
     def health_check(self) -> bool:
@@ -242,6 +394,13 @@ class RedisManager:
             return self.client.ping()
         except Exception:
             return False
+    
+    async def health_check_async(self) -> bool:
+        """Async version of health_check"""
+        try:
+            return await self.async_client.ping()
+        except Exception:
+            return False
 
 
 def get_redis_manager() -> RedisManager:
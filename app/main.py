@@ -12,7 +12,9 @@ import logging
 
 from app.core.config import settings
 from app.utils.logger import setup_logging
-from app.api.routes import health, query, ingest, laws, sessions
+from app.utils.metrics import MetricsMiddleware, get_metrics
+from app.utils.tracing import TracingMiddleware, shutdown_tracing
+from app.api.routes import health, query, search, ingest, laws, sessions
 
 # Setup logging
 setup_logging()
@@ -39,6 +41,10 @@ async def lifespan(app: FastAPI):
         qdrant = get_qdrant_manager()
         if qdrant.health_check():
             logger.info("   ✅ Qdrant connected")
+            
+            # Cache collection metadata off the query path
+            from app.db.collection_registry import get_collection_registry
+            get_collection_registry().start()
         else:
             logger.warning("   ⚠️ Qdrant not available")
         
@@ -60,6 +66,26 @@ async def lifespan(app: FastAPI):
     
     # === SHUTDOWN ===
     logger.info("👋 Shutting down Law RAG API...")
+    
+    from app.db.qdrant_client import get_qdrant_manager
+    from app.db.redis_client import get_redis_manager
+    from app.db.collection_registry import get_collection_registry
+    from app.utils.concurrency import shutdown_model_executor
+    
+    try:
+        await get_collection_registry().stop()
+        await get_qdrant_manager().close_async()
+        await get_redis_manager().close_async()
+    except Exception as e:
+        logger.warning(f"Error closing async clients: {e}")
+    
+    shutdown_model_executor()
+    
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.mark_process_dead()
+    
+    shutdown_tracing()
 
 
 # Create FastAPI application
@@ -93,14 +119,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],  # Per-stage timings for cross-origin clients
+)
+
+# API routers (also the route templates the in-flight gauge is labelled by)
+routers = (
+    health.router,
+    query.router,
+    search.router,
+    ingest.router,
+    laws.router,
+    sessions.router,
 )
 
+# In-flight request gauges for /metrics
+app.add_middleware(MetricsMiddleware, routes=[route for router in routers for route in router.routes])
+
+# Request spans (no-op unless TRACING_ENABLED); added last so it is outermost
+app.add_middleware(TracingMiddleware)
+
 # Include routers
-app.include_router(health.router)
-app.include_router(query.router)
-app.include_router(ingest.router)
-app.include_router(laws.router)
-app.include_router(sessions.router)
+for router in routers:
+    app.include_router(router)
 
 # Mount static files for admin frontend
 static_dir = Path(__file__).parent.parent / "static"
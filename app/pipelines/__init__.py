@@ -1,10 +1,11 @@
 """Pipelines module"""
 
-from app.pipelines.base import Pipeline, PipelineStep, PipelineResult, StepStatus
+from app.pipelines.base import Pipeline, PipelineStep, PipelineResult, StepResult, StepStatus
 
 __all__ = [
     "Pipeline",
     "PipelineStep", 
     "PipelineResult",
+    "StepResult",
     "StepStatus",
 ]
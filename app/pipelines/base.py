@@ -8,10 +8,16 @@ from typing import Any, Dict, List, Optional, Generic, TypeVar
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
+import asyncio
 import time
 import logging
 import traceback
 
+from app.utils.concurrency import run_in_model_executor
+from app.utils.metrics import observe_step
+from app.utils.timing import record_wait, take_waits, track_waits
+from app.utils.tracing import mark_error, set_attributes, start_span
+
 logger = logging.getLogger(__name__)
 
 # Generic type for pipeline data
@@ -29,7 +35,12 @@ class StepStatus(str, Enum):
 
 @dataclass
 class StepResult:
-    """Result of a single pipeline step"""
+    """
+    Result of a single pipeline step.
+    
+    duration_ms is wall time; wait_ms is the part of it spent queued for
+    an executor thread or a micro-batch (compute_ms is the rest).
+    """
     step_name: str
     status: StepStatus
     duration_ms: float
@@ -37,6 +48,13 @@ class StepResult:
     output_size: Optional[int] = None
     error: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    exception: Optional[Exception] = field(default=None, repr=False)
+    wait_ms: float = 0.0
+    
+    @property
+    def compute_ms(self) -> float:
+        """Wall time minus queue/wait time"""
+        return max(0.0, self.duration_ms - self.wait_ms)
 
 
 @dataclass
@@ -60,6 +78,26 @@ class PipelineResult:
     def successful_steps(self) -> List[StepResult]:
         """Get list of successful steps"""
         return [s for s in self.steps if s.status == StepStatus.SUCCESS]
+    
+    def raise_for_errors(self) -> None:
+        """Re-raise the first failed step's exception (for request paths that expect exceptions)"""
+        for step in self.failed_steps:
+            if step.exception is not None:
+                raise step.exception
+        if self.errors:
+            raise RuntimeError(self.errors[0])
+    
+    def timings(self) -> Dict[str, float]:
+        """Wall time per step that ran (ms)"""
+        return {
+            s.step_name: round(s.duration_ms, 2)
+            for s in self.steps
+            if s.status != StepStatus.SKIPPED
+        }
+    
+    def waits(self) -> Dict[str, float]:
+        """Queue/wait time per step that waited (ms)"""
+        return {s.step_name: round(s.wait_ms, 2) for s in self.steps if s.wait_ms > 0}
 
 
 class PipelineStep(ABC):
@@ -92,6 +130,23 @@ class PipelineStep(ABC):
         """
         pass
     
+    async def aprocess(self, data: Any, context: Dict[str, Any]) -> Any:
+        """
+        Async entry point used on the request path.
+        
+        The default runs `process` on the bounded model executor so blocking
+        work never stalls the event loop. Steps backed by native async I/O
+        (Qdrant, Redis, Gemini) override this.
+        
+        Args:
+            data: Input data from previous step
+            context: Shared context dict for passing data between steps
+            
+        Returns:
+            Processed output data
+        """
+        return await run_in_model_executor(self.process, data, context)
+    
     def validate_input(self, data: Any) -> bool:
         """
         Validate input data before processing.
@@ -131,7 +186,23 @@ class PipelineStep(ABC):
 class Pipeline:
     """
     Generic pipeline orchestrator.
-    Executes a sequence of PipelineSteps with error handling and logging.
+    Executes PipelineSteps with error handling and logging.
+    
+    Steps form a DAG. By default each step depends on the one added
+    before it (a plain sequence); `depends_on` declares other edges, and
+    `arun` runs steps whose dependencies are done concurrently. A step's
+    input is:
+    
+    - the pipeline input, if it has no dependencies
+    - the output of `input_from`, if given
+    - the output of its only dependency
+    - {dependency name: output}, if it has several
+    
+    Steps are added after their dependencies, so insertion order is a
+    valid topological order (used by the sequential `run`).
+    
+    The result's data is the output of the last step (in insertion
+    order) that produced one, or the pipeline input if none did.
     """
     
     def __init__(self, name: str):
@@ -143,21 +214,170 @@ class Pipeline:
         """
         self.name = name
         self.steps: List[PipelineStep] = []
+        self.dependencies: Dict[str, List[str]] = {}
+        self.inputs: Dict[str, Optional[str]] = {}
         self.logger = logging.getLogger(f"pipeline.{name}")
     
-    def add_step(self, step: PipelineStep) -> 'Pipeline':
+    def add_step(
+        self,
+        step: PipelineStep,
+        depends_on: Optional[List[str]] = None,
+        input_from: Optional[str] = None,
+    ) -> 'Pipeline':
         """
         Add a step to the pipeline.
         
         Args:
-            step: PipelineStep to add
+            step: PipelineStep to add (its name must be unique)
+            depends_on: Names of steps that must finish first
+                (default: the previously added step; [] for a root step)
+            input_from: Dependency whose output is this step's input
             
         Returns:
             Self for chaining
         """
+        if step.name in self.dependencies:
+            raise ValueError(f"Duplicate step name: {step.name}")
+        
+        if depends_on is None:
+            depends_on = [self.steps[-1].name] if self.steps else []
+        for name in depends_on:
+            if name not in self.dependencies:
+                raise ValueError(f"Step '{step.name}' depends on unknown step '{name}'")
+        if input_from is not None and input_from not in depends_on:
+            raise ValueError(f"Step '{step.name}' takes input from '{input_from}', which is not a dependency")
+        
         self.steps.append(step)
+        self.dependencies[step.name] = list(depends_on)
+        self.inputs[step.name] = input_from
         return self
     
+    def _step_input(self, step: PipelineStep, input_data: Any, outputs: Dict[str, Any]) -> Any:
+        """Resolve a step's input from the pipeline input and finished outputs"""
+        depends_on = self.dependencies[step.name]
+        if not depends_on:
+            return input_data
+        if self.inputs[step.name] is not None:
+            return outputs[self.inputs[step.name]]
+        if len(depends_on) == 1:
+            return outputs[depends_on[0]]
+        return {name: outputs[name] for name in depends_on}
+    
+    def _success(
+        self,
+        step: PipelineStep,
+        started: float,
+        input_size: Optional[int],
+        output: Any,
+        wait_ms: float = 0.0,
+    ) -> StepResult:
+        """
+        StepResult for a step that finished. input_size is measured before
+        the step runs, since steps may consume their input (the text
+        extractor closes the PDF document).
+        """
+        duration_ms = (time.time() - started) * 1000
+        self.logger.info(f"       ✓ {step.name} ({duration_ms:.0f}ms)")
+        return StepResult(
+            step_name=step.name,
+            status=StepStatus.SUCCESS,
+            duration_ms=duration_ms,
+            input_size=input_size,
+            output_size=step.get_data_size(output),
+            wait_ms=min(wait_ms, duration_ms),
+        )
+    
+    def _failure(
+        self,
+        step: PipelineStep,
+        started: float,
+        error: Exception,
+        wait_ms: float = 0.0,
+    ) -> StepResult:
+        """StepResult for a step that raised"""
+        duration_ms = (time.time() - started) * 1000
+        self.logger.error(f"       ✗ {step.name} FAILED: {error}")
+        self.logger.debug(traceback.format_exc())
+        return StepResult(
+            step_name=step.name,
+            status=StepStatus.FAILED,
+            duration_ms=duration_ms,
+            error=str(error),
+            exception=error,
+            wait_ms=min(wait_ms, duration_ms),
+        )
+    
+    @staticmethod
+    async def _process_in_thread(step: PipelineStep, data: Any, context: Dict[str, Any]) -> Any:
+        """Run a step's sync process in a worker thread, recording time queued for the thread"""
+        submitted = time.perf_counter()
+        started: List[float] = []
+        
+        def call() -> Any:
+            started.append(time.perf_counter())
+            return step.process(data, context)
+        
+        try:
+            return await asyncio.to_thread(call)
+        finally:
+            if started:
+                record_wait((started[0] - submitted) * 1000)
+    
+    def _final_output(self, input_data: Any, outputs: Dict[str, Any]) -> Any:
+        """Output of the last step that produced one (the pipeline input if none did)"""
+        for step in reversed(self.steps):
+            if step.name in outputs:
+                return outputs[step.name]
+        return input_data
+    
+    @staticmethod
+    def _trace_step(span: Any, result: StepResult) -> None:
+        """Attach a step's status, data sizes and wait to its span"""
+        set_attributes(span, **{
+            "step.status": result.status.value,
+            "step.input_size": result.input_size,
+            "step.output_size": result.output_size,
+            "step.wait_ms": round(result.wait_ms, 2),
+        })
+        if result.status == StepStatus.FAILED:
+            mark_error(span, result.exception or result.error)
+    
+    def _build_result(
+        self,
+        data: Any,
+        step_results: List[StepResult],
+        started_at: datetime,
+        pipeline_start: float,
+    ) -> PipelineResult:
+        """Assemble the PipelineResult and log the outcome"""
+        total_duration = (time.time() - pipeline_start) * 1000
+        errors = [f"{r.step_name}: {r.error}" for r in step_results if r.status == StepStatus.FAILED]
+        success = len(errors) == 0
+        
+        for r in step_results:
+            if r.status in (StepStatus.SUCCESS, StepStatus.FAILED):
+                observe_step(self.name, r.step_name, r.duration_ms)
+        
+        if success:
+            self.logger.info(f"✅ Pipeline completed successfully ({total_duration:.0f}ms)")
+        else:
+            self.logger.error(f"❌ Pipeline failed with {len(errors)} error(s)")
+        
+        return PipelineResult(
+            success=success,
+            data=data,
+            steps=step_results,
+            total_duration_ms=total_duration,
+            started_at=started_at.isoformat(),
+            completed_at=datetime.now().isoformat(),
+            errors=errors,
+            metadata={
+                "pipeline_name": self.name,
+                "total_steps": len(self.steps),
+                "completed_steps": len([s for s in step_results if s.status == StepStatus.SUCCESS]),
+            }
+        )
+    
     def run(
         self,
         input_data: Any,
@@ -165,7 +385,11 @@ class Pipeline:
         stop_on_error: bool = True,
     ) -> PipelineResult:
         """
-        Run the complete pipeline.
+        Run the complete pipeline, one step at a time in insertion order.
+        
+        With stop_on_error=False a failed step passes its input on
+        unchanged, so later steps still run on the last successful output
+        (for a linear pipeline, exactly the step-by-step behaviour).
         
         Args:
             input_data: Initial input data
@@ -178,82 +402,150 @@ class Pipeline:
         started_at = datetime.now()
         pipeline_start = time.time()
         
-        current_data = input_data
-        context = context or {}
+        context = context if context is not None else {}
+        outputs: Dict[str, Any] = {}
         step_results: List[StepResult] = []
-        errors: List[str] = []
         
         self.logger.info(f"🚀 Starting pipeline: {self.name}")
         self.logger.info(f"   Steps: {len(self.steps)}")
         
-        for i, step in enumerate(self.steps, 1):
-            step_start = time.time()
-            self.logger.info(f"   [{i}/{len(self.steps)}] {step.name}...")
-            
-            try:
-                # Validate input
-                if not step.validate_input(current_data):
-                    raise ValueError(f"Invalid input for step: {step.name}")
-                
-                input_size = step.get_data_size(current_data)
-                
-                # Process
-                output_data = step.process(current_data, context)
-                
-                output_size = step.get_data_size(output_data)
-                duration_ms = (time.time() - step_start) * 1000
-                
-                step_results.append(StepResult(
-                    step_name=step.name,
-                    status=StepStatus.SUCCESS,
-                    duration_ms=duration_ms,
-                    input_size=input_size,
-                    output_size=output_size,
-                ))
-                
-                self.logger.info(f"       ✓ {step.name} ({duration_ms:.0f}ms)")
-                
-                # Update current data for next step
-                current_data = output_data
+        with start_span(self.name, {"pipeline.name": self.name, "pipeline.steps": len(self.steps)}):
+            for i, step in enumerate(self.steps, 1):
+                step_start = time.time()
+                self.logger.info(f"   [{i}/{len(self.steps)}] {step.name}...")
+                current_data = self._step_input(step, input_data, outputs)
                 
-            except Exception as e:
-                duration_ms = (time.time() - step_start) * 1000
-                error_msg = f"{step.name}: {str(e)}"
+                with start_span(step.name, {"pipeline.name": self.name}) as span:
+                    try:
+                        # Validate input
+                        if not step.validate_input(current_data):
+                            raise ValueError(f"Invalid input for step: {step.name}")
+                        
+                        input_size = step.get_data_size(current_data)
+                        
+                        # Process
+                        outputs[step.name] = step.process(current_data, context)
+                        step_results.append(self._success(step, step_start, input_size, outputs[step.name]))
+                        
+                    except Exception as e:
+                        step_results.append(self._failure(step, step_start, e))
+                    
+                    self._trace_step(span, step_results[-1])
                 
-                step_results.append(StepResult(
-                    step_name=step.name,
-                    status=StepStatus.FAILED,
-                    duration_ms=duration_ms,
-                    error=str(e),
-                ))
-                
-                errors.append(error_msg)
-                self.logger.error(f"       ✗ {step.name} FAILED: {e}")
-                self.logger.debug(traceback.format_exc())
+                if step_results[-1].status == StepStatus.FAILED:
+                    if stop_on_error:
+                        break
+                    outputs[step.name] = current_data  # Pass through to later steps
+        
+        return self._build_result(
+            self._final_output(input_data, outputs),
+            step_results,
+            started_at,
+            pipeline_start,
+        )
+    
+    async def arun(
+        self,
+        input_data: Any,
+        context: Optional[Dict[str, Any]] = None,
+        stop_on_error: bool = True,
+        run_in_threads: bool = False,
+    ) -> PipelineResult:
+        """
+        Run the pipeline as a DAG: every step starts as soon as all of its
+        dependencies have succeeded, so independent steps run concurrently.
+        
+        Steps run through `aprocess` (model work on the bounded model
+        executor, I/O on async clients). Each StepResult separates time
+        queued for executors and micro-batches (wait_ms) from the rest
+        of its wall time. A step whose dependency failed
+        is SKIPPED. With stop_on_error, the first failure also cancels
+        every step still running or waiting; they are reported SKIPPED.
+        Cancelling `arun` itself cancels all of its steps.
+        
+        Args:
+            input_data: Initial input data (for steps without dependencies)
+            context: Optional shared context dict (steps running at the
+                same time must write different keys)
+            stop_on_error: Cancel remaining steps on first error
+            run_in_threads: Run each step's sync `process` in its own
+                worker thread instead of `aprocess` (long ingestion jobs,
+                which must not occupy the model executor)
+            
+        Returns:
+            PipelineResult with step results in insertion order
+        """
+        started_at = datetime.now()
+        pipeline_start = time.time()
+        
+        context = context if context is not None else {}
+        outputs: Dict[str, Any] = {}
+        results: Dict[str, StepResult] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        
+        self.logger.info(f"🚀 Starting pipeline: {self.name}")
+        self.logger.info(f"   Steps: {len(self.steps)}")
+        
+        async def execute(step: PipelineStep) -> bool:
+            """Wait for dependencies, run the step, record its StepResult"""
+            upstream = await asyncio.gather(*(tasks[name] for name in self.dependencies[step.name]))
+            if not all(upstream):
+                results[step.name] = StepResult(step.name, StepStatus.SKIPPED, 0.0)
+                return False
+            
+            step_start = time.time()
+            track_waits()  # This task's context only
+            self.logger.info(f"   [{step.name}] started")
+            with start_span(step.name, {"pipeline.name": self.name}) as span:
+                try:
+                    data = self._step_input(step, input_data, outputs)
+                    if not step.validate_input(data):
+                        raise ValueError(f"Invalid input for step: {step.name}")
+                    
+                    input_size = step.get_data_size(data)
+                    if run_in_threads:
+                        output = await self._process_in_thread(step, data, context)
+                    else:
+                        output = await step.aprocess(data, context)
+                    
+                    outputs[step.name] = output
+                    results[step.name] = self._success(step, step_start, input_size, output, take_waits())
+                    return True
+                    
+                except Exception as e:
+                    results[step.name] = self._failure(step, step_start, e, take_waits())
+                    if stop_on_error:
+                        current = asyncio.current_task()
+                        for task in tasks.values():
+                            if task is not current:
+                                task.cancel()
+                    return False
                 
-                if stop_on_error:
-                    break
+                finally:
+                    if step.name in results:
+                        self._trace_step(span, results[step.name])
         
-        completed_at = datetime.now()
-        total_duration = (time.time() - pipeline_start) * 1000
-        success = len(errors) == 0
+        with start_span(self.name, {"pipeline.name": self.name, "pipeline.steps": len(self.steps)}):
+            # Tasks copy the current context, so step spans nest under this one
+            for step in self.steps:
+                tasks[step.name] = asyncio.create_task(execute(step))
+            
+            try:
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+            except asyncio.CancelledError:
+                for task in tasks.values():
+                    task.cancel()
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+                raise
         
-        if success:
-            self.logger.info(f"✅ Pipeline completed successfully ({total_duration:.0f}ms)")
-        else:
-            self.logger.error(f"❌ Pipeline failed with {len(errors)} error(s)")
+        step_results = [
+            results.get(step.name) or StepResult(step.name, StepStatus.SKIPPED, 0.0)
+            for step in self.steps
+        ]
         
-        return PipelineResult(
-            success=success,
-            data=current_data,
-            steps=step_results,
-            total_duration_ms=total_duration,
-            started_at=started_at.isoformat(),
-            completed_at=completed_at.isoformat(),
-            errors=errors,
-            metadata={
-                "pipeline_name": self.name,
-                "total_steps": len(self.steps),
-                "completed_steps": len([s for s in step_results if s.status == StepStatus.SUCCESS]),
-            }
+        return self._build_result(
+            self._final_output(input_data, outputs),
+            step_results,
+            started_at,
+            pipeline_start,
         )
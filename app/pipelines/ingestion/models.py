@@ -7,6 +7,8 @@ from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from app.utils.compression import compress_content_fields
+
 
 @dataclass
 class PageContent:
@@ -68,10 +70,10 @@ class DocumentChunk:
     sparse_vector: Optional[Dict[str, List]] = None
     
     def to_payload(self) -> Dict[str, Any]:
-        """Convert to Qdrant payload dict"""
+        """Convert to Qdrant payload dict (content compressed per CONTENT_COMPRESSION)"""
         return {
             "chunk_id": self.chunk_id,
-            "content": self.content,
+            **compress_content_fields(self.content),
             "article_number": self.article_number,
             "article_text": self.article_text,
             "page_number": self.page_number,
@@ -119,3 +121,7 @@ class IngestionOutput:
     # Detailed stats
     pages_processed: int = 0
     skipped_chunks: int = 0
+    
+    # Per-step breakdown: wall time, and the part of it spent queued
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    wait_ms: Dict[str, float] = field(default_factory=dict)
@@ -22,6 +22,7 @@ from app.pipelines.ingestion.steps import (
     SparseEncoderStep,
     QdrantStorerStep,
 )
+from app.utils.metrics import record_ingestion
 
 logger = logging.getLogger(__name__)
 
@@ -36,8 +37,10 @@ class IngestionPipeline:
     3. Article Splitter - Split by مادة (article) boundaries
     4. Metadata Enricher - Add metadata and create chunks
     5. Dense Embedder - Generate Qwen3 embeddings
-    6. Sparse Encoder - Generate BM25 sparse vectors
+    6. Sparse Encoder - Generate BM25 sparse vectors (concurrently with 5)
     7. Qdrant Storer - Store with dual vectors
+    
+    Step instances are stateless and shared by all ingestions.
     """
     
     def __init__(self):
@@ -45,17 +48,25 @@ class IngestionPipeline:
         self.pipeline = self._build_pipeline()
     
     def _build_pipeline(self) -> Pipeline:
-        """Build the 7-step pipeline"""
+        """Build the 7-step pipeline (steps 5 and 6 both depend only on step 4)"""
         pipeline = Pipeline("Legal Document Ingestion")
         
+        enricher = MetadataEnricherStep()
+        dense = DenseEmbedderStep()
+        sparse = SparseEncoderStep()
+        
         # Add all steps
         pipeline.add_step(PDFLoaderStep())       # Step 1
         pipeline.add_step(TextExtractorStep())   # Step 2
         pipeline.add_step(ArticleSplitterStep()) # Step 3
-        pipeline.add_step(MetadataEnricherStep())# Step 4
-        pipeline.add_step(DenseEmbedderStep())   # Step 5
-        pipeline.add_step(SparseEncoderStep())   # Step 6
-        pipeline.add_step(QdrantStorerStep())    # Step 7
+        pipeline.add_step(enricher)              # Step 4
+        pipeline.add_step(dense, depends_on=[enricher.name])   # Step 5
+        pipeline.add_step(sparse, depends_on=[enricher.name])  # Step 6
+        pipeline.add_step(                                     # Step 7
+            QdrantStorerStep(),
+            depends_on=[dense.name, sparse.name],
+            input_from=dense.name,  # Same chunk list, now carrying both vectors
+        )
         
         return pipeline
     
@@ -100,11 +111,21 @@ class IngestionPipeline:
         
         logger.info(f"Starting ingestion: {filename} -> {collection_name}")
         
-        # Run pipeline (synchronous but wrapped for async context)
-        result = self.pipeline.run(pdf_content, context)
+        # Steps run in worker threads - ingestion takes minutes and must
+        # not block the event loop (it stays off the bounded model executor
+        # so it cannot starve query traffic)
+        result = await self.pipeline.arun(pdf_content, context, run_in_threads=True)
         
         duration_ms = (time.time() - start_time) * 1000
         
+        if result.success:
+            record_ingestion(
+                pages=context.get("pages_with_text", 0),
+                chunks=context.get("chunks_created", 0),
+                points=context.get("points_stored", 0),
+                seconds=duration_ms / 1000,
+            )
+        
         # Build output
         return IngestionOutput(
             success=result.success,
@@ -114,6 +135,8 @@ class IngestionPipeline:
             duration_ms=duration_ms,
             errors=result.errors,
             pages_processed=context.get("pages_with_text", 0),
+            timings_ms=result.timings(),
+            wait_ms=result.waits(),
         )
 
 
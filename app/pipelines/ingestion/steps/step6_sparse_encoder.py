@@ -17,8 +17,11 @@ class SparseEncoderStep(PipelineStep):
     """
     Step 6: Generate sparse vectors using FastEmbed BM25.
     
-    Input: List[DocumentChunk] with dense_vector
-    Output: List[DocumentChunk] with both dense_vector and sparse_vector
+    Runs concurrently with the dense embedder on the same chunk list;
+    each step only sets its own vector field.
+    
+    Input: List[DocumentChunk]
+    Output: List[DocumentChunk] with sparse_vector populated
     """
     
     def __init__(self):
@@ -37,7 +40,7 @@ class SparseEncoderStep(PipelineStep):
         Generate sparse vectors for all chunks.
         
         Args:
-            data: List of DocumentChunk with dense embeddings
+            data: List of DocumentChunk
             context: Pipeline context
             
         Returns:
@@ -74,10 +77,4 @@ class SparseEncoderStep(PipelineStep):
         """Validate input"""
         if not isinstance(data, list):
             return False
-        # Check that dense vectors exist
-        for chunk in data:
-            if not isinstance(chunk, DocumentChunk):
-                return False
-            if chunk.dense_vector is None:
-                self.logger.warning(f"Chunk {chunk.chunk_id} missing dense vector")
-        return True
+        return all(isinstance(c, DocumentChunk) for c in data)
@@ -9,6 +9,7 @@ import logging
 from app.pipelines.base import PipelineStep
 from app.pipelines.ingestion.models import DocumentChunk
 from app.db.qdrant_client import get_qdrant_manager
+from app.services.cache_service import invalidate_collection
 
 logger = logging.getLogger(__name__)
 
@@ -61,12 +62,14 @@ class QdrantStorerStep(PipelineStep):
         stored = self.qdrant.upsert_points(
             collection_name=collection_name,
             points=points,
-            batch_size=100,
         )
         
         context["points_stored"] = stored
         self.logger.info(f"Stored {stored} points to {collection_name}")
         
+        # Cached query results for this collection are now stale
+        invalidate_collection(collection_name)
+        
         return stored
     
     def validate_input(self, data: Any) -> bool:
@@ -4,7 +4,9 @@ Data models for the query pipeline
 """
 
 from typing import List, Dict, Optional, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
+
+from app.utils.compression import payload_content
 
 
 @dataclass
@@ -15,6 +17,12 @@ class QueryInput:
     law_types: Optional[List[str]] = None
     session_id: Optional[str] = None
     top_k: int = 5
+    retrieval_mode: Optional[str] = None  # dense | sparse | hybrid_rrf | hybrid_dbsf
+    prefetch: Optional[int] = None  # Candidates before reranking (capped by MAX_PREFETCH)
+    search_profile: Optional[str] = None  # fast | balanced | accurate | exact
+    hnsw_ef: Optional[int] = None
+    exact: Optional[bool] = None  # None = planner decides
+    rescore: Optional[bool] = None
 
 
 @dataclass
@@ -39,11 +47,11 @@ class RetrievedChunk:
     
     @classmethod
     def from_qdrant_result(cls, result: Dict) -> 'RetrievedChunk':
-        """Create from Qdrant search result"""
+        """Create from Qdrant search result (decompresses stored content)"""
         payload = result.get("payload", {})
         return cls(
             chunk_id=payload.get("chunk_id", result.get("id", "")),
-            content=payload.get("content", ""),
+            content=payload_content(payload),
             article_number=payload.get("article_number"),
             article_text=payload.get("article_text"),
             law_name=payload.get("law_name", ""),
@@ -54,6 +62,26 @@ class RetrievedChunk:
             chunk_part=payload.get("chunk_part", 1),
             total_parts=payload.get("total_parts", 1),
         )
+    
+    def apply_payload(self, payload: Dict) -> None:
+        """Fill display fields from a payload fetched after reranking"""
+        self.article_number = payload.get("article_number", self.article_number)
+        self.article_text = payload.get("article_text", self.article_text)
+        self.law_name = payload.get("law_name", self.law_name)
+        self.law_type = payload.get("law_type", self.law_type)
+        self.page_number = payload.get("page_number", self.page_number)
+        self.chapter = payload.get("chapter", self.chapter)
+        self.chunk_part = payload.get("chunk_part", self.chunk_part)
+        self.total_parts = payload.get("total_parts", self.total_parts)
+    
+    def to_dict(self) -> Dict:
+        """Convert to dict (for caching)"""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RetrievedChunk':
+        """Create from to_dict() output"""
+        return cls(**data)
 
 
 @dataclass
@@ -103,9 +131,17 @@ class QueryOutput:
     reranker_model: str = "Qwen/Qwen3-Reranker-0.6B"
     llm_model: str = "gemini-2.5-flash"
     
+    # Caching
+    answer_cached: bool = False
+    cache_similarity: Optional[float] = None  # Set on semantic cache hits
+    
     # Errors
     errors: List[str] = field(default_factory=list)
     
+    # Per-stage breakdown: wall time, and the part of it spent queued
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    wait_ms: Dict[str, float] = field(default_factory=dict)
+    
     def to_dict(self) -> Dict:
         """Convert to dict for API response"""
         return {
@@ -119,6 +155,31 @@ class QueryOutput:
                 "embedding_model": self.embedding_model,
                 "reranker_model": self.reranker_model,
                 "llm_model": self.llm_model,
+                "answer_cached": self.answer_cached,
+                "cache_similarity": self.cache_similarity,
+                "timings_ms": self.timings_ms,
+                "wait_ms": self.wait_ms,
             },
             "errors": self.errors,
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'QueryOutput':
+        """Create from to_dict() output"""
+        metadata = data.get("metadata", {})
+        return cls(
+            success=data["success"],
+            answer=data["answer"],
+            sources=[Source(**s) for s in data.get("sources", [])],
+            query_time_ms=metadata.get("query_time_ms", 0.0),
+            chunks_retrieved=metadata.get("chunks_retrieved", 0),
+            chunks_after_rerank=metadata.get("chunks_after_rerank", 0),
+            embedding_model=metadata.get("embedding_model", ""),
+            reranker_model=metadata.get("reranker_model", ""),
+            llm_model=metadata.get("llm_model", ""),
+            answer_cached=metadata.get("answer_cached", False),
+            cache_similarity=metadata.get("cache_similarity"),
+            errors=data.get("errors", []),
+            timings_ms=metadata.get("timings_ms", {}),
+            wait_ms=metadata.get("wait_ms", {}),
+        )
@@ -3,21 +3,33 @@ Query Pipeline
 6-step pipeline for answering legal questions
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
+import asyncio
 import time
 import logging
 
-from app.pipelines.base import Pipeline, PipelineStep
+from app.pipelines.base import Pipeline, PipelineResult, PipelineStep
 from app.pipelines.query.models import QueryInput, QueryOutput, RetrievedChunk
 from app.pipelines.query.steps import (
     PreprocessorStep,
     DualEncoderStep,
+    DenseQueryEncoderStep,
+    SparseQueryEncoderStep,
+    CombineVectorsStep,
     HybridRetrieverStep,
     RerankerStep,
     GeneratorStep,
     FormatterStep,
 )
-from app.core.config import SupportedCountry
+from app.db.qdrant_client import get_qdrant_manager
+from app.services.cache_service import (
+    get_retrieval_cache,
+    get_semantic_cache,
+    get_collection_version_async,
+)
+from app.utils.metrics import observe_query_stage
+from app.utils.timing import take_waits, track_waits
+from app.core.config import RetrievalMode, SearchProfile, SupportedCountry, settings
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +46,37 @@ class CombineForFormatterStep(PipelineStep):
         return (data, chunks)
 
 
+class TopKStep(PipelineStep):
+    """Helper step to keep the top_k hybrid-ranked candidates (search without reranking)"""
+    
+    def __init__(self):
+        super().__init__("Top K")
+    
+    def process(self, data: List[RetrievedChunk], context: Dict[str, Any]) -> List[RetrievedChunk]:
+        """Truncate candidates to top_k"""
+        return data[:context["top_k"]]
+    
+    async def aprocess(self, data: List[RetrievedChunk], context: Dict[str, Any]) -> List[RetrievedChunk]:
+        """Pure list work - run inline"""
+        return self.process(data, context)
+
+
+class DisplayFieldsStep(PipelineStep):
+    """Helper step to fetch display fields for the final chunks only"""
+    
+    def __init__(self, retriever: HybridRetrieverStep):
+        super().__init__("Fetch Display Fields")
+        self.retriever = retriever
+    
+    def process(self, data: List[RetrievedChunk], context: Dict[str, Any]) -> List[RetrievedChunk]:
+        """Sync searches already return full payloads - nothing to fetch"""
+        return data
+    
+    async def aprocess(self, data: List[RetrievedChunk], context: Dict[str, Any]) -> List[RetrievedChunk]:
+        """One batched retrieve for the final chunks"""
+        return await self.retriever.afetch_display_fields(data, context)
+
+
 class QueryPipeline:
     """
     6-Step Query Pipeline for Legal Questions.
@@ -45,81 +88,235 @@ class QueryPipeline:
     4. Reranker - Cross-encoder rerank -> Top 5
     5. Generator - Gemini answer with citations
     6. Formatter - Format response with sources
+    
+    Steps 2-4 run as a DAG on Pipeline.arun (dense and sparse encoding
+    concurrently). Steps 1, 5 and 6 sit around the result caches and the
+    article fast path, so they are called directly. Step instances are
+    stateless and shared by all requests.
     """
     
+    # Retrieval DAG step -> timings_ms stage; concurrent steps share a
+    # stage, which records the slowest of them (its wall time)
+    STEP_STAGES = {
+        "Dense Encoder": "encode",
+        "Sparse Encoder": "encode",
+        "Hybrid Retriever": "search",
+        "Reranker": "rerank",
+        "Fetch Display Fields": "fetch_payload",
+    }
+    
     def __init__(self):
         """Initialize the query pipeline"""
-        self.pipeline = self._build_pipeline()
+        self.preprocessor = PreprocessorStep()
+        self.dual_encoder = DualEncoderStep()
+        self.retriever = HybridRetrieverStep()
+        self.reranker = RerankerStep()
+        self.generator = GeneratorStep()
+        self.formatter = FormatterStep()
+        
+        self.retrieval = self._build_retrieval(rerank=True)
+        self.unranked_retrieval = self._build_retrieval(rerank=False)
     
-    def _build_pipeline(self) -> Pipeline:
-        """Build the 6-step pipeline"""
-        pipeline = Pipeline("Legal Query")
+    def _build_retrieval(self, rerank: bool) -> Pipeline:
+        """
+        Build steps 2-4 as a DAG:
+        
+            Dense Encoder  --+
+                             +--> Combine Vectors -> Hybrid Retriever -> Reranker -> Fetch Display Fields
+            Sparse Encoder --+
         
-        # Add all steps
-        pipeline.add_step(PreprocessorStep())      # Step 1
-        pipeline.add_step(DualEncoderStep())       # Step 2
-        pipeline.add_step(HybridRetrieverStep())   # Step 3
-        pipeline.add_step(RerankerStep())          # Step 4
-        pipeline.add_step(GeneratorStep())         # Step 5
+        Without rerank, "Top K" replaces the reranker.
+        """
+        pipeline = Pipeline("Legal Query Retrieval" if rerank else "Legal Query Search")
+        
+        dense = DenseQueryEncoderStep(self.dual_encoder)
+        sparse = SparseQueryEncoderStep(self.dual_encoder)
+        
+        pipeline.add_step(dense, depends_on=[])                                   # Step 2 (dense)
+        pipeline.add_step(sparse, depends_on=[])                                  # Step 2 (sparse)
+        pipeline.add_step(
+            CombineVectorsStep(self.dual_encoder, dense.name, sparse.name),
+            depends_on=[dense.name, sparse.name],
+        )
+        pipeline.add_step(self.retriever)                                         # Step 3
+        pipeline.add_step(self.reranker if rerank else TopKStep())                # Step 4
+        pipeline.add_step(DisplayFieldsStep(self.retriever))                      # Final top-k payloads
         
         return pipeline
     
-    async def run(self, query_input: QueryInput) -> QueryOutput:
+    async def _run_retrieval(
+        self,
+        normalized_query: str,
+        context: Dict[str, Any],
+        rerank: bool = True,
+    ) -> List[RetrievedChunk]:
         """
-        Run the query pipeline.
+        Run the steps 2-4 DAG for one query.
         
-        Args:
-            query_input: QueryInput with question and filters
-            
-        Returns:
-            QueryOutput with answer and sources
+        Raises:
+            The first failed step's exception
         """
-        start_time = time.time()
+        pipeline = self.retrieval if rerank else self.unranked_retrieval
+        result = await pipeline.arun(normalized_query, context)
+        self._record_step_timings(context, result)
+        result.raise_for_errors()
+        return result.data
+    
+    def _record_step_timings(self, context: Dict[str, Any], result: PipelineResult) -> None:
+        """Record DAG step durations (and waits) under their timings_ms stages"""
+        timings, waits = context["timings_ms"], context["wait_ms"]
+        stages = set()
+        for step in result.steps:
+            stage = self.STEP_STAGES.get(step.step_name)
+            if stage is None or step.duration_ms < timings.get(stage, 0.0):
+                continue
+            stages.add(stage)
+            timings[stage] = round(step.duration_ms, 2)
+            if step.wait_ms > 0:
+                waits[stage] = round(step.wait_ms, 2)
+            else:
+                waits.pop(stage, None)
         
+        for stage in stages:
+            observe_query_stage(stage, timings[stage], waits.get(stage, 0.0))
+    
+    def _build_context(self, query_input: QueryInput) -> Dict[str, Any]:
+        """Build the shared pipeline context for a query"""
         # Build collection name from country
         collection_name = f"laws_{query_input.country}"
         
-        # Build context
-        context = {
+        return {
             "collection_name": collection_name,
             "country": query_input.country,
             "law_types": query_input.law_types,
             "session_id": query_input.session_id,
             "top_k": query_input.top_k,
+            "retrieval_mode": RetrievalMode(
+                query_input.retrieval_mode or settings.DEFAULT_RETRIEVAL_MODE
+            ).value,
+            "prefetch": self._resolve_prefetch(query_input),
+            "search_profile": (
+                SearchProfile(query_input.search_profile).value if query_input.search_profile else None
+            ),
+            "hnsw_ef": query_input.hnsw_ef,
+            "exact": query_input.exact,
+            "rescore": query_input.rescore,
+            "timings_ms": {},
+            "wait_ms": {},
         }
+    
+    @staticmethod
+    def _resolve_prefetch(query_input: QueryInput) -> int:
+        """Requested prefetch depth, clamped to [top_k, MAX_PREFETCH]"""
+        prefetch = query_input.prefetch or settings.HYBRID_PREFETCH
+        return max(query_input.top_k, min(prefetch, settings.MAX_PREFETCH))
+    
+    @staticmethod
+    def _record_timing(
+        context: Dict[str, Any],
+        stage: str,
+        started: float,
+        wait_ms: Optional[float] = None,
+    ) -> None:
+        """
+        Record elapsed ms for a stage since `started` (perf_counter), and
+        the executor/batcher wait recorded since the previous stage.
+        """
+        elapsed = (time.perf_counter() - started) * 1000
+        context["timings_ms"][stage] = round(elapsed, 2)
+        wait_ms = min(take_waits() if wait_ms is None else wait_ms, elapsed)
+        if wait_ms > 0:
+            context["wait_ms"][stage] = round(wait_ms, 2)
+        observe_query_stage(stage, elapsed, wait_ms)
+    
+    async def _retrieve(
+        self,
+        query_input: QueryInput,
+        context: Dict[str, Any],
+        start_time: float,
+    ) -> Tuple[Optional[QueryOutput], List[RetrievedChunk]]:
+        """
+        Run steps 1-4 (or serve them from cache).
         
-        logger.info(f"Query pipeline: '{query_input.question[:50]}...' -> {collection_name}")
+        Returns:
+            (cached QueryOutput on a semantic cache hit, else None; reranked chunks)
+        """
+        # Every step is awaited through aprocess: model inference runs on the
+        # bounded executor and Qdrant/Gemini calls use async clients, so the
+        # event loop stays free for other requests.
         
-        # Run first 4 steps to get reranked chunks
         # Step 1: Preprocess
-        preprocessor = PreprocessorStep()
-        normalized_query = preprocessor.process(query_input.question, context)
+        stage_start = time.perf_counter()
+        normalized_query = await self.preprocessor.aprocess(query_input.question, context)
+        
+        # Result caches are keyed on the collection's data version
+        if settings.RETRIEVAL_CACHE_ENABLED or settings.SEMANTIC_CACHE_ENABLED:
+            context["collection_version"] = await get_collection_version_async(
+                context["collection_name"]
+            )
+        self._record_timing(context, "preprocess", stage_start)
         
-        # Step 2: Dual Encode
-        dual_encoder = DualEncoderStep()
-        encoded = dual_encoder.process(normalized_query, context)
+        # Explicit article citation - exact payload lookup, no vector search
+        if context.get("article_reference"):
+            stage_start = time.perf_counter()
+            article_chunks = await self._lookup_article(context)
+            self._record_timing(context, "article_lookup", stage_start)
+            if article_chunks:
+                context["reranked_chunks"] = article_chunks
+                return None, article_chunks
         
-        # Step 3: Hybrid Retrieve
-        retriever = HybridRetrieverStep()
-        candidates = retriever.process(encoded, context)
+        # Near-duplicate question already answered - skip steps 3-6
+        # (needs the dense vector, so sparse-only queries bypass it)
+        context["semantic_scope"], context["query_vector"] = None, None
+        if settings.SEMANTIC_CACHE_ENABLED and context["retrieval_mode"] != RetrievalMode.SPARSE.value:
+            context["semantic_scope"] = get_semantic_cache().make_scope(context)
+        if context["semantic_scope"]:
+            stage_start = time.perf_counter()
+            context["query_vector"] = await self.dual_encoder.aencode_dense(normalized_query)
+            hit = await get_semantic_cache().lookup_async(
+                context["semantic_scope"], context["query_vector"]
+            )
+            self._record_timing(context, "semantic_cache", stage_start)
+            if hit:
+                similarity, cached = hit
+                output = QueryOutput.from_dict(cached)
+                output.query_time_ms = (time.time() - start_time) * 1000
+                output.timings_ms = dict(context["timings_ms"])
+                output.wait_ms = dict(context["wait_ms"])
+                output.answer_cached = True
+                output.cache_similarity = round(similarity, 4)
+                logger.info(
+                    f"♻️ Semantic cache hit (similarity={similarity:.3f}) "
+                    f"in {output.query_time_ms:.0f}ms"
+                )
+                return output, []
         
-        # Step 4: Rerank
-        reranker = RerankerStep()
-        reranked = reranker.process(candidates, context)
+        # Steps 2-4 only change when the collection does - try the cache first
+        reranked = await self._get_cached_retrieval(context)
+        
+        if reranked is None:
+            # Steps 2-4: encode, search (per retrieval_mode), rerank, then
+            # display fields for the final top-k only
+            reranked = await self._run_retrieval(normalized_query, context)
+            await self._cache_retrieval(context, reranked)
         
         # Store reranked for formatter
         context["reranked_chunks"] = reranked
         
-        # Step 5: Generate
-        generator = GeneratorStep()
-        answer = generator.process(reranked, context)
-        
-        # Step 6: Format
-        formatter = FormatterStep()
+        return None, reranked
+    
+    async def _finish(
+        self,
+        answer: str,
+        reranked: List[RetrievedChunk],
+        context: Dict[str, Any],
+        start_time: float,
+    ) -> QueryOutput:
+        """Step 6: format the response and feed the semantic cache"""
         query_time_ms = (time.time() - start_time) * 1000
         context["query_time_ms"] = query_time_ms
         
-        output = formatter.process((answer, reranked), context)
+        output = await self.formatter.aprocess((answer, reranked), context)
         
         # Ensure query_time_ms is a number for formatting
         if isinstance(query_time_ms, (int, float)):
@@ -127,8 +324,337 @@ class QueryPipeline:
         else:
             logger.info(f"Query completed in {query_time_ms}ms")
         
+        if context.get("semantic_scope") and output.sources:
+            await get_semantic_cache().store_async(
+                context["semantic_scope"], context["query_vector"], output.to_dict()
+            )
+        
         return output
     
+    async def run(self, query_input: QueryInput) -> QueryOutput:
+        """
+        Run the query pipeline.
+        
+        Args:
+            query_input: QueryInput with question and filters
+            
+        Returns:
+            QueryOutput with answer and sources
+        """
+        start_time = time.time()
+        context = self._build_context(query_input)
+        track_waits()
+        
+        logger.info(f"Query pipeline: '{query_input.question[:50]}...' -> {context['collection_name']}")
+        
+        # Steps 1-4
+        cached_output, reranked = await self._retrieve(query_input, context, start_time)
+        if cached_output is not None:
+            return cached_output
+        
+        # Step 5: Generate
+        stage_start = time.perf_counter()
+        answer = await self.generator.aprocess(reranked, context)
+        self._record_timing(context, "generate", stage_start)
+        
+        # Step 6: Format
+        return await self._finish(answer, reranked, context, start_time)
+    
+    async def run_stream(self, query_input: QueryInput) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run the query pipeline, yielding events as results become available.
+        
+        Events (name, data):
+        - ("sources", {"sources": [...]}) - as soon as reranking finishes
+        - ("token", {"text": "..."}) - answer text as Gemini streams it
+        - ("metadata", {...}) - QueryOutput metadata plus per-stage timings_ms
+        
+        Args:
+            query_input: QueryInput with question and filters
+            
+        Yields:
+            (event name, JSON-serializable data)
+        """
+        start_time = time.time()
+        context = self._build_context(query_input)
+        track_waits()
+        
+        logger.info(f"Streaming query: '{query_input.question[:50]}...' -> {context['collection_name']}")
+        
+        # Steps 1-4
+        cached_output, reranked = await self._retrieve(query_input, context, start_time)
+        if cached_output is not None:
+            yield "sources", {"sources": [s.to_dict() for s in cached_output.sources]}
+            yield "token", {"text": cached_output.answer}
+            yield "metadata", {
+                **cached_output.to_dict()["metadata"],
+                "timings_ms": context["timings_ms"],
+            }
+            return
+        
+        yield "sources", {"sources": [s.to_dict() for s in self.formatter.create_sources(reranked)]}
+        
+        # Step 5: Generate (streamed)
+        stage_start = time.perf_counter()
+        parts = []
+        async for text in self.generator.astream(reranked, context):
+            if not parts:
+                self._record_timing(context, "first_token", stage_start)
+            parts.append(text)
+            yield "token", {"text": text}
+        self._record_timing(context, "generate", stage_start)
+        
+        # Step 6: Format
+        output = await self._finish("".join(parts), reranked, context, start_time)
+        yield "metadata", {
+            **output.to_dict()["metadata"],
+            "timings_ms": context["timings_ms"],
+        }
+    
+    async def search(
+        self,
+        query_input: QueryInput,
+        rerank: bool = True,
+    ) -> Tuple[List[RetrievedChunk], Dict[str, Any]]:
+        """
+        Retrieval only: steps 1-3 and optionally 4, no generation.
+        
+        Args:
+            query_input: QueryInput with question and filters
+            rerank: Run the cross-encoder (False returns hybrid-ranked
+                candidates, for sub-100ms responses)
+            
+        Returns:
+            (top_k chunks, pipeline context with timings_ms and counts)
+        """
+        context = self._build_context(query_input)
+        context["rerank_top_k"] = query_input.top_k
+        track_waits()
+        
+        logger.info(
+            f"Search: '{query_input.question[:50]}...' -> {context['collection_name']} "
+            f"(rerank={rerank})"
+        )
+        
+        # Step 1: Preprocess
+        stage_start = time.perf_counter()
+        normalized_query = await self.preprocessor.aprocess(query_input.question, context)
+        self._record_timing(context, "preprocess", stage_start)
+        
+        # Steps 2-4 (top_k hybrid-ranked candidates without rerank), then
+        # display fields for the returned chunks only
+        results = await self._run_retrieval(normalized_query, context, rerank=rerank)
+        
+        return results, context
+    
+    async def run_batch(self, query_inputs: List[QueryInput]) -> List[QueryOutput]:
+        """
+        Answer many questions with shared model and database calls.
+        
+        - Step 2: one batched call per encoder for all questions
+        - Step 3: Qdrant batch query API instead of one search per question
+        - Step 4: all (question, candidate) pairs reranked in shared batches
+        - Step 5: Gemini calls run concurrently, at most BATCH_LLM_CONCURRENCY at once
+        
+        Failures are isolated per question: a failed item comes back as a
+        QueryOutput with success=False and its error. A shared stage that
+        fails (encoding, reranking) fails every item it was serving.
+        
+        Args:
+            query_inputs: Questions with filters (same country)
+            
+        Returns:
+            One QueryOutput per input, in input order
+            
+        Raises:
+            ValueError: If the questions target different countries
+        """
+        start_time = time.time()
+        contexts = [self._build_context(q) for q in query_inputs]
+        errors: Dict[int, str] = {}
+        
+        # Search and the display-field fetch run against one collection
+        if len({context["collection_name"] for context in contexts}) > 1:
+            raise ValueError("Batch questions must all target the same country")
+        track_waits()
+        
+        logger.info(f"Batch query pipeline: {len(query_inputs)} questions -> {contexts[0]['collection_name']}")
+        
+        # Step 1: Preprocess
+        stage_start = time.perf_counter()
+        queries = [
+            await self.preprocessor.aprocess(q.question, ctx)
+            for q, ctx in zip(query_inputs, contexts)
+        ]
+        self._record_batch_timing(contexts, "preprocess", stage_start)
+        
+        # Step 2: Dual Encode (shared)
+        stage_start = time.perf_counter()
+        try:
+            encoded = await self.dual_encoder.aprocess_batch(queries, contexts)
+        except Exception as e:
+            logger.error(f"Batch encoding failed: {e}")
+            return [self._failed_output(f"Encoding failed: {e}", start_time) for _ in query_inputs]
+        self._record_batch_timing(contexts, "encode", stage_start)
+        
+        # Step 3: Hybrid Retrieve (batched)
+        stage_start = time.perf_counter()
+        searched = await self.retriever.aprocess_batch(encoded, contexts)
+        self._record_batch_timing(contexts, "search", stage_start)
+        
+        candidates: List[List[RetrievedChunk]] = []
+        for i, result in enumerate(searched):
+            if isinstance(result, Exception):
+                errors[i] = f"Search failed: {result}"
+                candidates.append([])
+            else:
+                candidates.append(result)
+        
+        # Step 4: Rerank (shared batches)
+        stage_start = time.perf_counter()
+        try:
+            reranked = await self.reranker.aprocess_batch(candidates, contexts)
+        except Exception as e:
+            logger.error(f"Batch rerank failed: {e}")
+            for i in range(len(query_inputs)):
+                errors.setdefault(i, f"Rerank failed: {e}")
+            reranked = [[] for _ in query_inputs]
+        self._record_batch_timing(contexts, "rerank", stage_start)
+        
+        # Display fields for every item's final chunks, one retrieve call
+        stage_start = time.perf_counter()
+        try:
+            await self.retriever.afetch_display_fields(
+                [chunk for chunks in reranked for chunk in chunks], contexts[0]
+            )
+        except Exception as e:
+            logger.error(f"Batch payload fetch failed: {e}")
+            for i in range(len(query_inputs)):
+                errors.setdefault(i, f"Payload fetch failed: {e}")
+        self._record_batch_timing(contexts, "fetch_payload", stage_start)
+        
+        # Steps 5-6: Generate and format, bounded concurrency
+        semaphore = asyncio.Semaphore(max(1, settings.BATCH_LLM_CONCURRENCY))
+        
+        async def answer(i: int) -> QueryOutput:
+            context = contexts[i]
+            if i in errors:
+                return self._failed_output(errors[i], start_time)
+            
+            try:
+                async with semaphore:
+                    stage_start = time.perf_counter()
+                    context["reranked_chunks"] = reranked[i]
+                    text = await self.generator.aprocess(reranked[i], context)
+                    self._record_timing(context, "generate", stage_start)
+                return await self._finish(text, reranked[i], context, start_time)
+            except Exception as e:
+                logger.error(f"Batch item {i} failed: {e}")
+                return self._failed_output(f"Generation failed: {e}", start_time)
+        
+        outputs = await asyncio.gather(*(answer(i) for i in range(len(query_inputs))))
+        
+        failed = sum(1 for o in outputs if not o.success)
+        logger.info(
+            f"Batch completed: {len(outputs) - failed}/{len(outputs)} succeeded "
+            f"in {(time.time() - start_time) * 1000:.0f}ms"
+        )
+        
+        return list(outputs)
+    
+    def _record_batch_timing(self, contexts: List[Dict[str, Any]], stage: str, started: float) -> None:
+        """Record a shared stage's elapsed time (and wait) on every item"""
+        wait_ms = take_waits()
+        for context in contexts:
+            self._record_timing(context, stage, started, wait_ms)
+    
+    @staticmethod
+    def _failed_output(error: str, start_time: float) -> QueryOutput:
+        """QueryOutput for a batch item that could not be answered"""
+        return QueryOutput(
+            success=False,
+            answer="",
+            sources=[],
+            query_time_ms=(time.time() - start_time) * 1000,
+            chunks_retrieved=0,
+            chunks_after_rerank=0,
+            embedding_model=settings.EMBEDDING_MODEL,
+            reranker_model=settings.RERANKER_MODEL,
+            llm_model=settings.LLM_MODEL,
+            errors=[error],
+        )
+    
+    async def _lookup_article(self, context: Dict[str, Any]) -> Optional[List[RetrievedChunk]]:
+        """
+        Resolve an explicit article reference through the payload indexes.
+        
+        Returns all parts of the article in order, or None to fall back to
+        hybrid search (article not found, outside the requested law_types,
+        or present in several laws with no law named in the question).
+        """
+        reference = context["article_reference"]
+        law_types = context.get("law_types")
+        
+        if reference.law_type:
+            if law_types and reference.law_type not in law_types:
+                return None
+            law_types = [reference.law_type]
+        
+        results = await get_qdrant_manager().get_article_chunks_async(
+            context["collection_name"],
+            reference.article_number,
+            law_types=law_types,
+        )
+        
+        law_names = {r["payload"].get("law_name") for r in results}
+        if len(law_names) != 1:
+            logger.info(
+                f"Article {reference.article_number}: found in {len(law_names)} laws, "
+                "using hybrid search"
+            )
+            return None
+        
+        chunks = [RetrievedChunk.from_qdrant_result(r) for r in results]
+        context["chunks_retrieved"] = len(chunks)
+        context["chunks_after_rerank"] = len(chunks)
+        context["article_fast_path"] = True
+        logger.info(f"⚡ Article {reference.article_number} resolved directly ({len(chunks)} parts)")
+        return chunks
+    
+    async def _get_cached_retrieval(self, context: Dict[str, Any]) -> Optional[List[RetrievedChunk]]:
+        """Look up reranked chunks for this query (None on miss)"""
+        context["retrieval_cache_hit"] = False
+        if not settings.RETRIEVAL_CACHE_ENABLED:
+            return None
+        
+        cache = get_retrieval_cache()
+        key = cache.key_for(context)
+        context["retrieval_cache_key"] = key
+        if key is None:
+            return None
+        
+        cached = await cache.get_async(key)
+        if cached is None:
+            return None
+        
+        chunks = [RetrievedChunk.from_dict(c) for c in cached["chunks"]]
+        context["chunks_retrieved"] = cached["chunks_retrieved"]
+        context["chunks_after_rerank"] = len(chunks)
+        context["retrieval_cache_hit"] = True
+        logger.info(f"♻️ Retrieval cache hit ({len(chunks)} chunks)")
+        return chunks
+    
+    async def _cache_retrieval(self, context: Dict[str, Any], chunks: List[RetrievedChunk]) -> None:
+        """Store freshly reranked chunks for this query"""
+        key = context.get("retrieval_cache_key")
+        if key is None:
+            return
+        await get_retrieval_cache().set_async(
+            key,
+            [c.to_dict() for c in chunks],
+            context.get("chunks_retrieved", len(chunks)),
+        )
+    
     def run_sync(self, query_input: QueryInput) -> QueryOutput:
         """Synchronous version of run"""
         import asyncio
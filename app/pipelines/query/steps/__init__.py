@@ -1,7 +1,12 @@
 """Query pipeline steps"""
 
 from app.pipelines.query.steps.step1_preprocessor import PreprocessorStep
-from app.pipelines.query.steps.step2_dual_encoder import DualEncoderStep
+from app.pipelines.query.steps.step2_dual_encoder import (
+    DualEncoderStep,
+    DenseQueryEncoderStep,
+    SparseQueryEncoderStep,
+    CombineVectorsStep,
+)
 from app.pipelines.query.steps.step3_hybrid_retriever import HybridRetrieverStep
 from app.pipelines.query.steps.step4_reranker import RerankerStep
 from app.pipelines.query.steps.step5_generator import GeneratorStep
@@ -10,6 +15,9 @@ from app.pipelines.query.steps.step6_formatter import FormatterStep
 __all__ = [
     "PreprocessorStep",
     "DualEncoderStep",
+    "DenseQueryEncoderStep",
+    "SparseQueryEncoderStep",
+    "CombineVectorsStep",
     "HybridRetrieverStep",
     "RerankerStep",
     "GeneratorStep",
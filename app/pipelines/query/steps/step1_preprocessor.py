@@ -8,6 +8,8 @@ import logging
 
 from app.pipelines.base import PipelineStep
 from app.utils.arabic import ArabicNormalizer
+from app.utils.patterns import ArticlePatterns
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,7 @@ class PreprocessorStep(PipelineStep):
     - Arabic text normalization
     - Remove excessive whitespace
     - Basic cleaning
+    - Explicit article reference detection (context["article_reference"])
     """
     
     def __init__(self):
@@ -56,10 +59,24 @@ class PreprocessorStep(PipelineStep):
         context["original_query"] = original
         context["normalized_query"] = normalized
         
+        # "المادة ٣١٨ من قانون العقوبات" can be resolved by payload lookup
+        if settings.ARTICLE_FAST_PATH_ENABLED:
+            reference = ArticlePatterns.find_article_reference(original)
+            context["article_reference"] = reference
+            if reference:
+                self.logger.info(
+                    f"Article reference: {reference.article_number} "
+                    f"(law_type={reference.law_type or 'any'})"
+                )
+        
         self.logger.info(f"Preprocessed query: '{original[:50]}...' -> '{normalized[:50]}...'")
         
         return normalized
     
+    async def aprocess(self, data: str, context: Dict[str, Any]) -> str:
+        """Pure string work - run inline, cheaper than an executor hop"""
+        return self.process(data, context)
+    
     def validate_input(self, data: Any) -> bool:
         """Validate input is a non-empty string"""
         if not isinstance(data, str):
@@ -3,26 +3,37 @@ Step 2: Dual Encoder
 Generate both dense and sparse vectors for query
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
 import logging
 
 from app.pipelines.base import PipelineStep
-from app.services.embedding_service import get_embedding_service
+from app.services.embedding_service import get_embedding_service, get_embedding_batcher
 from app.services.sparse_encoder_service import get_sparse_encoder_service
+from app.services.cache_service import get_query_vector_cache
+from app.utils.concurrency import run_in_model_executor
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
-class DualEncoderStep(PipelineStep):
+class DualEncoderStep:
     """
     Step 2: Encode query to both dense and sparse vectors.
     
-    Input: str (normalized query)
-    Output: Dict with 'dense_vector' and 'sparse_vector'
+    The single encode implementation behind step 2's pipeline nodes
+    (DenseQueryEncoderStep, SparseQueryEncoderStep, CombineVectorsStep),
+    which Pipeline.arun runs concurrently, and behind batch queries
+    (aprocess_batch). It is not a pipeline node itself.
+    
+    Only the vectors the retrieval mode needs are computed: "dense"
+    skips the BM25 encoder and "sparse" never touches the embedding
+    model; the unused vector is None.
     """
     
     def __init__(self):
-        super().__init__("Dual Encoder")
+        self.name = "Dual Encoder"
+        self.logger = logging.getLogger(f"pipeline.{self.name}")
         self._embedding_service = None
         self._sparse_service = None
     
@@ -40,36 +51,125 @@ class DualEncoderStep(PipelineStep):
             self._sparse_service = get_sparse_encoder_service()
         return self._sparse_service
     
-    def process(self, data: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    def encode_dense(self, query: str) -> List[float]:
+        """Dense query vector (semantic), served from the query vector cache when possible"""
+        cache = get_query_vector_cache() if settings.QUERY_VECTOR_CACHE_ENABLED else None
+        dense_vector = cache.dense.get(cache.dense_key(query)) if cache else None
+        if dense_vector is None:
+            dense_vector = self.embedding_service.embed(query)
+            if cache:
+                cache.dense.set(cache.dense_key(query), dense_vector)
+        return dense_vector
+    
+    def encode_sparse(self, query: str) -> Dict[str, List]:
+        """Sparse query vector (keywords), served from the query vector cache when possible"""
+        cache = get_query_vector_cache() if settings.QUERY_VECTOR_CACHE_ENABLED else None
+        sparse_vector = cache.sparse.get(cache.sparse_key(query)) if cache else None
+        if sparse_vector is None:
+            sparse_vector = self.sparse_service.encode(query)
+            if cache:
+                cache.sparse.set(cache.sparse_key(query), sparse_vector)
+        return sparse_vector
+    
+    @staticmethod
+    def vectors_needed(context: Dict[str, Any]) -> Tuple[bool, bool]:
+        """(needs dense, needs sparse) for the context's retrieval mode"""
+        mode = context.get("retrieval_mode", "hybrid_rrf")
+        return mode != "sparse", mode != "dense"
+    
+    @staticmethod
+    async def _none() -> None:
+        """Placeholder for a vector the retrieval mode does not use"""
+        return None
+    
+    async def aencode_dense(self, query: str) -> List[float]:
+        """Dense query vector, served from the query vector cache when possible"""
+        cache = get_query_vector_cache() if settings.QUERY_VECTOR_CACHE_ENABLED else None
+        if cache:
+            cached = await cache.dense.get_async(cache.dense_key(query))
+            if cached is not None:
+                return cached
+        
+        dense_vector = await self._embed_dense(query)
+        if cache:
+            await cache.dense.set_async(cache.dense_key(query), dense_vector)
+        return dense_vector
+    
+    async def aencode_sparse(self, query: str) -> Dict[str, List]:
+        """Sparse query vector, served from the query vector cache when possible"""
+        cache = get_query_vector_cache() if settings.QUERY_VECTOR_CACHE_ENABLED else None
+        if cache:
+            cached = await cache.sparse.get_async(cache.sparse_key(query))
+            if cached is not None:
+                return cached
+        
+        sparse_vector = await run_in_model_executor(self.sparse_service.encode, query)
+        if cache:
+            await cache.sparse.set_async(cache.sparse_key(query), sparse_vector)
+        return sparse_vector
+    
+    async def aprocess_batch(self, data: List[str], contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Encode query to dual vectors.
+        Encode many queries with one batched call per encoder.
         
         Args:
-            data: Normalized query string
-            context: Pipeline context
+            data: Normalized query strings
+            contexts: One pipeline context per query
             
         Returns:
-            Dict with dense_vector and sparse_vector
+            One dict with dense_vector and sparse_vector per query
         """
-        self.logger.info("Generating dual vectors for query...")
+        self.logger.info(f"Generating dual vectors for {len(data)} queries...")
+        
+        needed = [self.vectors_needed(context) for context in contexts]
+        dense_idx = [i for i, (use_dense, _) in enumerate(needed) if use_dense]
+        sparse_idx = [i for i, (_, use_sparse) in enumerate(needed) if use_sparse]
         
-        # Generate dense vector (semantic)
-        dense_vector = self.embedding_service.embed(data)
+        dense_batch, sparse_batch = await asyncio.gather(
+            run_in_model_executor(
+                self.embedding_service.embed_queries, [data[i] for i in dense_idx], settings.EMBEDDING_BATCH_SIZE
+            )
+            if dense_idx else self._none(),
+            run_in_model_executor(self.sparse_service.encode_queries, [data[i] for i in sparse_idx])
+            if sparse_idx else self._none(),
+        )
         
-        # Generate sparse vector (keywords)
-        sparse_vector = self.sparse_service.encode(data)
+        dense_vectors: List[Optional[Any]] = [None] * len(data)
+        sparse_vectors: List[Optional[Dict[str, Any]]] = [None] * len(data)
+        for i, vector in zip(dense_idx, dense_batch or []):
+            dense_vectors[i] = vector
+        for i, vector in zip(sparse_idx, sparse_batch or []):
+            sparse_vectors[i] = vector
         
+        return [
+            self.build_output(query, dense, sparse, context)
+            for query, dense, sparse, context in zip(data, dense_vectors, sparse_vectors, contexts)
+        ]
+    
+    async def _embed_dense(self, query: str) -> List[float]:
+        """Embed via the shared micro-batcher when enabled, else directly"""
+        if settings.EMBEDDING_MICRO_BATCHING:
+            return await get_embedding_batcher().submit(query)
+        return await run_in_model_executor(self.embedding_service.embed, query)
+    
+    def build_output(
+        self,
+        query: str,
+        dense_vector: Optional[Any],
+        sparse_vector: Optional[Dict[str, Any]],
+        context: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Store vectors in context and build the step output"""
         # Store in context for later steps
         context["dense_vector"] = dense_vector
         context["sparse_vector"] = sparse_vector
         
-        self.logger.info(
-            f"Encoded query: dense={len(dense_vector)}D, "
-            f"sparse={len(sparse_vector['indices'])} non-zero"
-        )
+        dense_info = f"{len(dense_vector)}D" if dense_vector is not None else "skipped"
+        sparse_info = f"{len(sparse_vector['indices'])} non-zero" if sparse_vector is not None else "skipped"
+        self.logger.info(f"Encoded query: dense={dense_info}, sparse={sparse_info}")
         
         return {
-            "query": data,
+            "query": query,
             "dense_vector": dense_vector,
             "sparse_vector": sparse_vector,
         }
@@ -77,3 +177,93 @@ class DualEncoderStep(PipelineStep):
     def validate_input(self, data: Any) -> bool:
         """Validate input"""
         return isinstance(data, str) and len(data) > 0
+
+
+class DenseQueryEncoderStep(PipelineStep):
+    """
+    Dense half of step 2 as its own pipeline node, so Pipeline.arun runs
+    it concurrently with SparseQueryEncoderStep. Delegates to a shared
+    DualEncoderStep (same caches, micro-batcher and executor).
+    
+    Input: str (normalized query)
+    Output: Dense vector, or None if the retrieval mode does not use it
+    """
+    
+    def __init__(self, encoder: DualEncoderStep):
+        super().__init__("Dense Encoder")
+        self.encoder = encoder
+    
+    def process(self, data: str, context: Dict[str, Any]) -> Optional[List[float]]:
+        """Encode the dense query vector"""
+        if not self.encoder.vectors_needed(context)[0]:
+            return None
+        return self.encoder.encode_dense(data)
+    
+    async def aprocess(self, data: str, context: Dict[str, Any]) -> Optional[List[float]]:
+        """Encode the dense query vector (reuses the semantic cache lookup's vector)"""
+        if not self.encoder.vectors_needed(context)[0]:
+            return None
+        if context.get("query_vector") is not None:
+            return context["query_vector"]
+        return await self.encoder.aencode_dense(data)
+    
+    def validate_input(self, data: Any) -> bool:
+        """Validate input"""
+        return self.encoder.validate_input(data)
+
+
+class SparseQueryEncoderStep(PipelineStep):
+    """
+    Sparse half of step 2 as its own pipeline node (see DenseQueryEncoderStep).
+    
+    Input: str (normalized query)
+    Output: Sparse vector, or None if the retrieval mode does not use it
+    """
+    
+    def __init__(self, encoder: DualEncoderStep):
+        super().__init__("Sparse Encoder")
+        self.encoder = encoder
+    
+    def process(self, data: str, context: Dict[str, Any]) -> Optional[Dict[str, List]]:
+        """Encode the sparse query vector"""
+        if not self.encoder.vectors_needed(context)[1]:
+            return None
+        return self.encoder.encode_sparse(data)
+    
+    async def aprocess(self, data: str, context: Dict[str, Any]) -> Optional[Dict[str, List]]:
+        """Encode the sparse query vector"""
+        if not self.encoder.vectors_needed(context)[1]:
+            return None
+        return await self.encoder.aencode_sparse(data)
+    
+    def validate_input(self, data: Any) -> bool:
+        """Validate input"""
+        return self.encoder.validate_input(data)
+
+
+class CombineVectorsStep(PipelineStep):
+    """
+    Joins the dense and sparse encoder nodes into step 2's output.
+    
+    Input: {dense step name: vector, sparse step name: vector}
+    Output: Dict with 'dense_vector' and 'sparse_vector' (as DualEncoderStep)
+    """
+    
+    def __init__(self, encoder: DualEncoderStep, dense_step: str, sparse_step: str):
+        super().__init__("Combine Vectors")
+        self.encoder = encoder
+        self.dense_step = dense_step
+        self.sparse_step = sparse_step
+    
+    def process(self, data: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine both vectors for the retriever"""
+        return self.encoder.build_output(
+            context["normalized_query"],
+            data[self.dense_step],
+            data[self.sparse_step],
+            context,
+        )
+    
+    async def aprocess(self, data: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+        """Pure dict work - run inline"""
+        return self.process(data, context)
@@ -1,9 +1,10 @@
 """
 Step 3: Hybrid Retriever
-Perform hybrid search with RRF fusion
+Perform hybrid search with RRF/DBSF fusion, or a single-vector search
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
+import asyncio
 import logging
 
 from qdrant_client import models
@@ -11,10 +12,16 @@ from qdrant_client import models
 from app.pipelines.base import PipelineStep
 from app.pipelines.query.models import RetrievedChunk
 from app.db.qdrant_client import get_qdrant_manager
-from app.core.config import settings
+from app.db.factory import CollectionFactory
+from app.db.collection_registry import get_collection_registry
+from app.services.cache_service import LRUCache
+from app.core.config import SupportedCountry, settings
 
 logger = logging.getLogger(__name__)
 
+# Filtered point counts for the exact-search planner, shared across requests
+_filter_counts = LRUCache(max_size=1024, ttl=settings.EXACT_SEARCH_COUNT_TTL)
+
 
 class HybridRetrieverStep(PipelineStep):
     """
@@ -23,11 +30,24 @@ class HybridRetrieverStep(PipelineStep):
     Input: Dict with query, dense_vector, sparse_vector
     Output: List[RetrievedChunk] - Top 25 candidates
     
-    Strategy:
+    Strategy (hybrid_rrf, the default):
     1. Prefetch dense search (semantic) -> Top 25
     2. Prefetch sparse search (keywords) -> Top 25
     3. Fuse with Reciprocal Rank Fusion (RRF)
     4. Return unique Top 25
+    
+    context["retrieval_mode"] switches to hybrid_dbsf (Distribution-Based
+    Score Fusion), dense or sparse only; context["prefetch"] sets the depth.
+    
+    Candidates carry only the payload fields reranking needs
+    (QdrantManager.RERANK_PAYLOAD_FIELDS); afetch_display_fields() fills in
+    the rest for the final top-k with one batched retrieve.
+    
+    Dense search effort comes from context["search_profile"] with optional
+    hnsw_ef / exact / rescore overrides. When a law_types filter matches at
+    most EXACT_SEARCH_THRESHOLD points, the planner switches the dense
+    search to exact: brute force over a few thousand vectors is faster
+    than HNSW traversal with filtering, and has full recall.
     """
     
     def __init__(self):
@@ -52,30 +72,237 @@ class HybridRetrieverStep(PipelineStep):
         Returns:
             List of RetrievedChunk candidates
         """
+        schema = self._schema(context)
+        collection_name, search_kwargs = self._prepare_search(data, context, schema)
+        
+        if self._needs_plan(context):
+            key = self._plan_key(collection_name, context)
+            count = _filter_counts.get(key)
+            if count is None:
+                count = self.qdrant.count_points(collection_name, search_kwargs["filter_conditions"])
+                _filter_counts.set(key, count)
+            self._apply_plan(search_kwargs, context, count)
+        
+        # Sync path (scripts) has no display-field fetch - take full payloads
+        search_kwargs["with_payload"] = True
+        search_kwargs["matryoshka_size"] = schema.get("matryoshka_size")
+        
+        # Perform hybrid search with RRF fusion
+        results = self.qdrant.hybrid_search(collection_name=collection_name, **search_kwargs)
+        
+        return self._to_chunks(results, context)
+    
+    async def aprocess(self, data: Dict[str, Any], context: Dict[str, Any]) -> List[RetrievedChunk]:
+        """
+        Perform hybrid search through the async Qdrant client.
+        
+        Args:
+            data: Dict with dense_vector and sparse_vector
+            context: Pipeline context (must contain collection_name)
+            
+        Returns:
+            List of RetrievedChunk candidates
+        """
+        schema = await self._aschema(context)
+        collection_name, search_kwargs = self._prepare_search(data, context, schema)
+        await self._aplan(collection_name, search_kwargs, context)
+        
+        results = await self.qdrant.hybrid_search_async(
+            collection_name=collection_name,
+            **search_kwargs,
+            matryoshka_size=schema.get("matryoshka_size"),
+        )
+        
+        return self._to_chunks(results, context)
+    
+    async def aprocess_batch(
+        self,
+        data: List[Dict[str, Any]],
+        contexts: List[Dict[str, Any]],
+    ) -> List[Union[List[RetrievedChunk], Exception]]:
+        """
+        Perform many hybrid searches through Qdrant's batch query API.
+        
+        Searches are sent in groups of QDRANT_BATCH_QUERY_SIZE per round
+        trip. A query whose planning (filter count) fails, or whose group
+        fails, gets the exception in place of its result, so one bad
+        request does not fail the whole batch.
+        
+        Args:
+            data: One dict with dense_vector and sparse_vector per query
+            contexts: One pipeline context per query (same collection)
+            
+        Returns:
+            Candidate chunks (or the exception raised) per query, in order
+        """
+        outcomes: List[Union[List[RetrievedChunk], Exception, None]] = [None] * len(data)
+        
+        try:
+            schema = await self._aschema(contexts[0])
+        except Exception as e:
+            self.logger.error(f"Collection schema lookup failed: {e}")
+            return [e] * len(data)
+        
+        # Plan each search on its own, so a failed count fails only its query
+        collection_name = contexts[0].get("collection_name")
+        planned: List[Tuple[int, Dict[str, Any]]] = []
+        for i, (d, context) in enumerate(zip(data, contexts)):
+            try:
+                collection_name, kwargs = self._prepare_search(d, context, schema)
+                await self._aplan(collection_name, kwargs, context)  # Counts are cached per filter
+                planned.append((i, kwargs))
+            except Exception as e:
+                self.logger.error(f"Planning search {i} failed: {e}")
+                outcomes[i] = e
+        
+        group_size = max(1, settings.QDRANT_BATCH_QUERY_SIZE)
+        groups = [planned[i:i + group_size] for i in range(0, len(planned), group_size)]
+        
+        group_results = await asyncio.gather(
+            *(
+                self.qdrant.hybrid_search_batch_async(
+                    collection_name, [kwargs for _, kwargs in group], schema.get("matryoshka_size")
+                )
+                for group in groups
+            ),
+            return_exceptions=True,
+        )
+        
+        for group, result in zip(groups, group_results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Batch search of {len(group)} queries failed: {result}")
+                for i, _ in group:
+                    outcomes[i] = result
+            else:
+                for (i, _), points in zip(group, result):
+                    outcomes[i] = self._to_chunks(points, contexts[i])
+        
+        return outcomes
+    
+    def _prepare_search(
+        self,
+        data: Dict[str, Any],
+        context: Dict[str, Any],
+        schema: Dict[str, Any],
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Resolve collection name and hybrid_search arguments for the collection's schema"""
         collection_name = context.get("collection_name")
         if not collection_name:
             raise ValueError("collection_name not found in context")
         
-        dense_vector = data["dense_vector"]
-        sparse_vector = data["sparse_vector"]
+        limit = context.get("prefetch", settings.HYBRID_PREFETCH)  # 25
+        mode = context.get("retrieval_mode", "hybrid_rrf")
         
-        # Build filter from context
-        filter_conditions = self._build_filter(context)
+        search_params = self._search_params(context, schema.get("storage_profile"))
+        context["exact_search"] = bool(search_params and search_params.exact)
         
-        limit = settings.HYBRID_PREFETCH  # 25
+        self.logger.info(f"Search in {collection_name} (mode={mode}, limit={limit})")
         
-        self.logger.info(f"Hybrid search in {collection_name} (limit={limit})")
+        return collection_name, {
+            "dense_vector": data.get("dense_vector"),
+            "sparse_vector": data.get("sparse_vector"),
+            "filter_conditions": self._build_filter(context),
+            "limit": limit,
+            "mode": mode,
+            "search_params": search_params,
+            "with_payload": self.qdrant.RERANK_PAYLOAD_FIELDS,
+        }
+    
+    @staticmethod
+    async def _aschema(context: Dict[str, Any]) -> Dict[str, Any]:
+        """The collection's schema (storage profile, Matryoshka size) from the registry's cache"""
+        return await get_collection_registry().schema(SupportedCountry(context["country"])) or {}
+    
+    @staticmethod
+    def _schema(context: Dict[str, Any]) -> Dict[str, Any]:
+        """Blocking _aschema (sync path)"""
+        return get_collection_registry().schema_sync(SupportedCountry(context["country"])) or {}
+    
+    async def afetch_display_fields(self, chunks: List[RetrievedChunk], context: Dict[str, Any]) -> List[RetrievedChunk]:
+        """
+        Fill display fields (law name, article text, page, ...) of the final
+        chunks with one batched retrieve. Chunks are updated in place.
         
-        # Perform hybrid search with RRF fusion
-        results = self.qdrant.hybrid_search(
-            collection_name=collection_name,
-            dense_vector=dense_vector,
-            sparse_vector=sparse_vector,
-            filter_conditions=filter_conditions,
-            limit=limit,
+        Args:
+            chunks: Final chunks (may span several queries of one collection)
+            context: Pipeline context (must contain collection_name)
+            
+        Returns:
+            The same chunks
+        """
+        ids = list({chunk.chunk_id for chunk in chunks})
+        if not ids:
+            return chunks
+        payloads = await self.qdrant.retrieve_payloads_async(context["collection_name"], ids)
+        
+        for chunk in chunks:
+            payload = payloads.get(str(chunk.chunk_id))
+            if payload:
+                chunk.apply_payload(payload)
+        
+        return chunks
+    
+    @staticmethod
+    def _search_params(context: Dict[str, Any], storage_profile: Optional[str]) -> models.SearchParams:
+        """
+        Dense search params for the collection's storage profile, from the
+        context's search profile and overrides. Never None, so the client
+        does not fall back to the global VECTOR_STORAGE_PROFILE.
+        """
+        params = CollectionFactory.get_search_params(
+            profile=storage_profile,
+            search_profile=context.get("search_profile"),
+            hnsw_ef=context.get("hnsw_ef"),
+            exact=context.get("exact"),
+            rescore=context.get("rescore"),
+        )
+        return params or models.SearchParams()
+    
+    @staticmethod
+    def _needs_plan(context: Dict[str, Any]) -> bool:
+        """Plan only filtered dense searches where the caller left exact unset"""
+        return (
+            settings.EXACT_SEARCH_THRESHOLD > 0
+            and context.get("exact") is None
+            and not context.get("exact_search")
+            and bool(context.get("law_types"))
+            and context.get("retrieval_mode") != "sparse"
         )
+    
+    @staticmethod
+    def _plan_key(collection_name: str, context: Dict[str, Any]) -> str:
+        """
+        Count cache key for the context's filter. It includes the
+        registry's generation of the collection, so counts taken before
+        an ingest, delete or reset are not reused.
+        """
+        generation = get_collection_registry().generation(collection_name)
+        law_types = ",".join(sorted(context["law_types"]))
+        return f"{collection_name}@{generation}:{context.get('country')}:{law_types}"
+    
+    async def _aplan(self, collection_name: str, search_kwargs: Dict[str, Any], context: Dict[str, Any]) -> None:
+        """Switch to exact search if the filter is selective enough"""
+        if not self._needs_plan(context):
+            return
+        
+        key = self._plan_key(collection_name, context)
+        count = _filter_counts.get(key)
+        if count is None:
+            count = await self.qdrant.count_points_async(collection_name, search_kwargs["filter_conditions"])
+            _filter_counts.set(key, count)
+        self._apply_plan(search_kwargs, context, count)
+    
+    def _apply_plan(self, search_kwargs: Dict[str, Any], context: Dict[str, Any], count: int) -> None:
+        """Use exact search when `count` filtered points are cheap to scan"""
+        if count > settings.EXACT_SEARCH_THRESHOLD:
+            return
         
-        # Convert to RetrievedChunk objects
+        search_kwargs["search_params"] = search_kwargs["search_params"].model_copy(update={"exact": True})
+        context["exact_search"] = True
+        self.logger.info(f"Filter matches {count} points - using exact search")
+    
+    def _to_chunks(self, results: List[Dict], context: Dict[str, Any]) -> List[RetrievedChunk]:
+        """Convert search results to RetrievedChunk objects"""
         chunks = [
             RetrievedChunk.from_qdrant_result(r)
             for r in results
@@ -119,7 +346,7 @@ class HybridRetrieverStep(PipelineStep):
         """Validate input"""
         if not isinstance(data, dict):
             return False
-        if "dense_vector" not in data or "sparse_vector" not in data:
-            self.logger.error("Missing dense_vector or sparse_vector")
+        if data.get("dense_vector") is None and data.get("sparse_vector") is None:
+            self.logger.error("Missing dense_vector and sparse_vector")
             return False
         return True
@@ -3,12 +3,17 @@ Step 4: Reranker
 Cross-encoder reranking of candidates
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 import logging
 
 from app.pipelines.base import PipelineStep
 from app.pipelines.query.models import RetrievedChunk
-from app.services.reranker_service import get_reranker_service
+from app.services.reranker_service import (
+    RerankerService,
+    get_reranker_service,
+    get_rerank_scheduler,
+)
+from app.utils.concurrency import run_in_model_executor
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -49,13 +54,7 @@ class RerankerStep(PipelineStep):
         if not data:
             return []
         
-        query = context.get("normalized_query") or context.get("original_query", "")
-        top_k = settings.RERANK_TOP_K  # 5
-        
-        self.logger.info(f"Reranking {len(data)} candidates to top {top_k}...")
-        
-        # Convert to dicts for reranker
-        docs = [{"content": chunk.content, "chunk": chunk} for chunk in data]
+        query, top_k, docs = self._prepare(data, context)
         
         # Rerank
         import traceback
@@ -71,6 +70,95 @@ class RerankerStep(PipelineStep):
             self.logger.error(f"Traceback:\n{traceback.format_exc()}")
             raise
         
+        return self._collect(reranked, context)
+    
+    async def aprocess(self, data: List[RetrievedChunk], context: Dict[str, Any]) -> List[RetrievedChunk]:
+        """
+        Rerank without blocking the event loop.
+        
+        With RERANKER_CROSS_REQUEST_BATCHING enabled, this request's pairs go
+        through the shared scheduler and may be scored together with pairs
+        from other in-flight requests; otherwise the whole step runs on the
+        model executor.
+        
+        Args:
+            data: List of candidate chunks
+            context: Pipeline context (must contain original query)
+            
+        Returns:
+            Top K reranked chunks
+        """
+        if not settings.RERANKER_CROSS_REQUEST_BATCHING:
+            return await super().aprocess(data, context)
+        
+        if not data:
+            return []
+        
+        query, top_k, docs = self._prepare(data, context)
+        
+        scores = await get_rerank_scheduler().submit_many(
+            [(query, doc["content"]) for doc in docs]
+        )
+        reranked = RerankerService.rank_by_scores(docs, scores, top_k)
+        
+        return self._collect(reranked, context)
+    
+    async def aprocess_batch(
+        self,
+        data: List[List[RetrievedChunk]],
+        contexts: List[Dict[str, Any]],
+    ) -> List[List[RetrievedChunk]]:
+        """
+        Rerank candidates of many queries in shared batches.
+        
+        All (query, candidate) pairs are scored together, so length-bucketed
+        sub-batches mix pairs from different queries.
+        
+        Args:
+            data: Candidate chunks per query
+            contexts: One pipeline context per query
+            
+        Returns:
+            Top K reranked chunks per query, in order
+        """
+        prepared = [self._prepare(chunks, context) for chunks, context in zip(data, contexts)]
+        pairs = [(query, doc["content"]) for query, _, docs in prepared for doc in docs]
+        
+        if not pairs:
+            return [[] for _ in data]
+        
+        if settings.RERANKER_CROSS_REQUEST_BATCHING:
+            scores = await get_rerank_scheduler().submit_many(pairs)
+        else:
+            scores = await run_in_model_executor(self.reranker.score_pairs, pairs)
+        
+        results, offset = [], 0
+        for (_, top_k, docs), context in zip(prepared, contexts):
+            doc_scores = scores[offset:offset + len(docs)]
+            offset += len(docs)
+            reranked = RerankerService.rank_by_scores(docs, doc_scores, top_k)
+            results.append(self._collect(reranked, context))
+        
+        return results
+    
+    def _prepare(
+        self,
+        data: List[RetrievedChunk],
+        context: Dict[str, Any],
+    ) -> Tuple[str, int, List[Dict[str, Any]]]:
+        """Resolve query and top-k, and convert chunks to reranker docs"""
+        query = context.get("normalized_query") or context.get("original_query", "")
+        top_k = context.get("rerank_top_k", settings.RERANK_TOP_K)  # 5 unless overridden
+        
+        self.logger.info(f"Reranking {len(data)} candidates to top {top_k}...")
+        
+        # Convert to dicts for reranker
+        docs = [{"content": chunk.content, "chunk": chunk} for chunk in data]
+        
+        return query, top_k, docs
+    
+    def _collect(self, reranked: List[Dict[str, Any]], context: Dict[str, Any]) -> List[RetrievedChunk]:
+        """Extract chunks with rerank scores from reranked docs"""
         # Extract chunks with rerank scores
         result = []
         for doc in reranked:
@@ -3,12 +3,14 @@ Step 5: Generator
 Generate answer using Gemini LLM
 """
 
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import logging
 
 from app.pipelines.base import PipelineStep
 from app.pipelines.query.models import RetrievedChunk
-from app.services.llm_service import get_llm_service
+from app.services.llm_service import LLMService, get_llm_service
+from app.services.cache_service import get_answer_cache
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +23,8 @@ class GeneratorStep(PipelineStep):
     Output: str - Generated answer with article citations
     """
     
+    NO_ANSWER = "لم أجد معلومات كافية للإجابة على سؤالك."
+    
     def __init__(self):
         super().__init__("Answer Generator")
         self._llm = None
@@ -43,9 +47,124 @@ class GeneratorStep(PipelineStep):
         Returns:
             Generated answer string
         """
+        context["answer_cached"] = False
         if not data:
-            return "لم أجد معلومات كافية للإجابة على سؤالك."
+            return self.NO_ANSWER
+        
+        cache_key = self._answer_cache_key(data, context)
+        if cache_key:
+            cached = get_answer_cache().get(cache_key)
+            if cached is not None:
+                return self._finish(cached, context, cached=True)
+        
+        query, context_docs = self._prepare_generation(data, context)
+        
+        # Generate answer
+        answer = self.llm.generate(
+            query=query,
+            context_docs=context_docs,
+        )
+        
+        if cache_key and answer:
+            get_answer_cache().set(cache_key, answer)
+        
+        return self._finish(answer, context)
+    
+    async def aprocess(self, data: List[RetrievedChunk], context: Dict[str, Any]) -> str:
+        """
+        Generate answer through the async Gemini client.
+        
+        Args:
+            data: List of reranked chunks
+            context: Pipeline context (must contain query)
+            
+        Returns:
+            Generated answer string
+        """
+        context["answer_cached"] = False
+        if not data:
+            return self.NO_ANSWER
+        
+        cache_key = self._answer_cache_key(data, context)
+        if cache_key:
+            cached = await get_answer_cache().get_async(cache_key)
+            if cached is not None:
+                return self._finish(cached, context, cached=True)
+        
+        query, context_docs = self._prepare_generation(data, context)
+        
+        answer = await self.llm.generate_async(
+            query=query,
+            context_docs=context_docs,
+        )
+        
+        if cache_key and answer:
+            await get_answer_cache().set_async(cache_key, answer)
         
+        return self._finish(answer, context)
+    
+    async def astream(self, data: List[RetrievedChunk], context: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Stream the answer from Gemini's streaming API.
+        
+        Cached answers are yielded in one piece; fresh answers are cached
+        once the stream completes.
+        
+        Args:
+            data: List of reranked chunks
+            context: Pipeline context (must contain query)
+            
+        Yields:
+            Answer text fragments in order
+        """
+        context["answer_cached"] = False
+        if not data:
+            self._finish(self.NO_ANSWER, context)
+            yield self.NO_ANSWER
+            return
+        
+        cache_key = self._answer_cache_key(data, context)
+        if cache_key:
+            cached = await get_answer_cache().get_async(cache_key)
+            if cached is not None:
+                self._finish(cached, context, cached=True)
+                yield cached
+                return
+        
+        query, context_docs = self._prepare_generation(data, context)
+        
+        parts = []
+        async for text in self.llm.generate_stream_async(
+            query=query,
+            context_docs=context_docs,
+        ):
+            parts.append(text)
+            yield text
+        
+        answer = "".join(parts)
+        if cache_key and answer:
+            await get_answer_cache().set_async(cache_key, answer)
+        
+        self._finish(answer, context)
+    
+    def _answer_cache_key(self, data: List[RetrievedChunk], context: Dict[str, Any]) -> Optional[str]:
+        """Cache key for this question + evidence set (None when caching is off)"""
+        if not settings.ANSWER_CACHE_ENABLED:
+            return None
+        
+        question = context.get("normalized_query") or context.get("original_query", "")
+        return get_answer_cache().make_key(
+            question,
+            [chunk.chunk_id for chunk in data],
+            LLMService.SYSTEM_PROMPT,
+        )
+    
+    def _prepare_generation(
+        self,
+        data: List[RetrievedChunk],
+        context: Dict[str, Any],
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Resolve the query and convert chunks to LLM context docs"""
         query = context.get("original_query") or context.get("normalized_query", "")
         
         self.logger.info(f"Generating answer from {len(data)} chunks...")
@@ -61,14 +180,16 @@ class GeneratorStep(PipelineStep):
             for chunk in data
         ]
         
-        # Generate answer
-        answer = self.llm.generate(
-            query=query,
-            context_docs=context_docs,
-        )
-        
+        return query, context_docs
+    
+    def _finish(self, answer: str, context: Dict[str, Any], cached: bool = False) -> str:
+        """Record the generated answer in context"""
         context["generated_answer"] = answer
-        self.logger.info(f"Generated answer ({len(answer)} chars)")
+        context["answer_cached"] = cached
+        if cached:
+            self.logger.info(f"♻️ Answer cache hit ({len(answer)} chars)")
+        else:
+            self.logger.info(f"Generated answer ({len(answer)} chars)")
         
         return answer
     
@@ -38,7 +38,7 @@ class FormatterStep(PipelineStep):
         answer, chunks = data
         
         # Create sources from chunks
-        sources = self._create_sources(chunks)
+        sources = self.create_sources(chunks)
         
         # Get timing from context
         query_time_ms = context.get("query_time_ms", 0)
@@ -63,13 +63,24 @@ class FormatterStep(PipelineStep):
             embedding_model=settings.EMBEDDING_MODEL,
             reranker_model=settings.RERANKER_MODEL,
             llm_model=settings.LLM_MODEL,
+            answer_cached=context.get("answer_cached", False),
+            timings_ms=dict(context.get("timings_ms", {})),
+            wait_ms=dict(context.get("wait_ms", {})),
         )
         
         self.logger.info(f"Formatted response with {len(sources)} sources")
         
         return output
     
-    def _create_sources(self, chunks: List[RetrievedChunk]) -> List[Source]:
+    async def aprocess(
+        self,
+        data: Tuple[str, List[RetrievedChunk]],
+        context: Dict[str, Any],
+    ) -> QueryOutput:
+        """Pure formatting work - run inline, cheaper than an executor hop"""
+        return self.process(data, context)
+    
+    def create_sources(self, chunks: List[RetrievedChunk]) -> List[Source]:
         """Create Source objects from chunks"""
         sources = []
         
@@ -1,18 +1,28 @@
 """Services layer modules"""
 
-from app.services.embedding_service import EmbeddingService, get_embedding_service
+from app.services.embedding_service import (
+    EmbeddingService,
+    get_embedding_service,
+    get_embedding_batcher,
+)
 from app.services.sparse_encoder_service import SparseEncoderService, get_sparse_encoder_service
-from app.services.reranker_service import RerankerService, get_reranker_service
+from app.services.reranker_service import (
+    RerankerService,
+    get_reranker_service,
+    get_rerank_scheduler,
+)
 from app.services.llm_service import LLMService, get_llm_service
 from app.services.session_service import SessionService, get_session_service
 
 __all__ = [
     "EmbeddingService",
     "get_embedding_service",
+    "get_embedding_batcher",
     "SparseEncoderService", 
     "get_sparse_encoder_service",
     "RerankerService",
     "get_reranker_service",
+    "get_rerank_scheduler",
     "LLMService",
     "get_llm_service",
     "SessionService",
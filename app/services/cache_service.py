@@ -0,0 +1,817 @@
+"""
+Cache Service
+In-process LRU and two-tier (LRU + Redis) caches with hit/miss counters
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import base64
+import hashlib
+import json
+import time
+import uuid
+import logging
+
+import numpy as np
+
+from app.db.redis_client import get_redis_manager, RedisManager
+from app.db.collection_registry import get_collection_registry
+from app.core.config import settings
+from app.utils.metrics import count_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded in-process cache with optional TTL.
+
+    Features:
+    - Least-recently-used eviction once max_size is reached
+    - Per-entry expiry (ttl seconds, 0 = never)
+    - Hit / miss / eviction counters
+    """
+
+    def __init__(self, max_size: int, ttl: int = 0):
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Maximum number of entries
+            ttl: Entry lifetime in seconds (0 = no expiry)
+        """
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value (None on miss or expiry)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Set a value, evicting the least recently used entry if full"""
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all values"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class TwoTierCache:
+    """
+    In-process LRU in front of the shared Redis cache.
+
+    Lookups hit the local LRU first, then Redis (via RedisManager's
+    cache_get/cache_set); Redis hits are promoted into the LRU. Values are
+    passed through `encode` / `decode` so callers can store compact forms.
+    Redis errors are logged and treated as misses - a cache must never
+    fail a request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int,
+        ttl: int,
+        use_redis: bool = True,
+        encode: Optional[Callable[[Any], Any]] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            name: Cache name (Redis key namespace and stats label)
+            max_size: Max entries in the in-process tier
+            ttl: Entry lifetime in seconds (both tiers)
+            use_redis: Enable the shared Redis tier
+            encode: Value -> JSON-serializable form for Redis
+            decode: Inverse of encode
+        """
+        self.name = name
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self.local = LRUCache(max_size=max_size, ttl=ttl)
+        self.encode = encode or (lambda v: v)
+        self.decode = decode or (lambda v: v)
+
+        self.redis_hits = 0
+        self.redis_errors = 0
+        self._redis: Optional[RedisManager] = None
+
+    @property
+    def redis(self) -> RedisManager:
+        """Lazy load Redis manager"""
+        if self._redis is None:
+            self._redis = get_redis_manager()
+        return self._redis
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    def _on_redis_error(self, e: Exception) -> None:
+        self.redis_errors += 1
+        logger.warning(f"Cache '{self.name}' Redis tier unavailable: {e}")
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        """Local tier lookup; counts a full miss when Redis is off"""
+        value = self.local.get(key)
+        if value is not None:
+            count_cache_lookup(self.name, "local_hit")
+        elif not self.use_redis:
+            count_cache_lookup(self.name, "miss")
+        return value
+
+    def _from_redis(self, key: str, stored: Any) -> Optional[Any]:
+        """Decode a Redis tier result and promote it into the local tier"""
+        if stored is None:
+            count_cache_lookup(self.name, "miss")
+            return None
+
+        value = self.decode(stored)
+        self.redis_hits += 1
+        count_cache_lookup(self.name, "redis_hit")
+        self.local.set(key, value)
+        return value
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value from the local tier, then Redis"""
+        value = self._get_local(key)
+        if value is not None or not self.use_redis:
+            return value
+
+        try:
+            stored = self.redis.cache_get(self._redis_key(key))
+        except Exception as e:
+            self._on_redis_error(e)
+            stored = None
+
+        return self._from_redis(key, stored)
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """Async version of get"""
+        value = self._get_local(key)
+        if value is not None or not self.use_redis:
+            return value
+
+        try:
+            stored = await self.redis.cache_get_async(self._redis_key(key))
+        except Exception as e:
+            self._on_redis_error(e)
+            stored = None
+
+        return self._from_redis(key, stored)
+
+    def set(self, key: str, value: Any) -> None:
+        """Set a value in both tiers"""
+        self.local.set(key, value)
+        if not self.use_redis:
+            return
+
+        try:
+            self.redis.cache_set(self._redis_key(key), self.encode(value), ttl=self.ttl)
+        except Exception as e:
+            self._on_redis_error(e)
+
+    async def set_async(self, key: str, value: Any) -> None:
+        """Async version of set"""
+        self.local.set(key, value)
+        if not self.use_redis:
+            return
+
+        try:
+            await self.redis.cache_set_async(self._redis_key(key), self.encode(value), ttl=self.ttl)
+        except Exception as e:
+            self._on_redis_error(e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics for both tiers"""
+        local = self.local.get_stats()
+        # Local misses fall through to Redis; the rest are full misses
+        misses = local["misses"] - self.redis_hits
+        lookups = local["hits"] + local["misses"]
+        return {
+            "local": local,
+            "redis_enabled": self.use_redis,
+            "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors,
+            "misses": misses,
+            "hit_rate": round((lookups - misses) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# === Query Vector Cache ===
+
+def _pack(values: List, dtype: str) -> str:
+    """Pack a numeric list as base64 of its little-endian binary form"""
+    return base64.b64encode(np.asarray(values, dtype=dtype).tobytes()).decode("ascii")
+
+
+def _unpack(data: str, dtype: str) -> List:
+    """Inverse of _pack"""
+    return np.frombuffer(base64.b64decode(data), dtype=dtype).tolist()
+
+
+def encode_dense(vector: List[float]) -> str:
+    """Dense vector -> base64 float32 (4 bytes / dim instead of ~20 as JSON)"""
+    return _pack(vector, "<f4")
+
+
+def decode_dense(data: str) -> List[float]:
+    return _unpack(data, "<f4")
+
+
+def encode_sparse(vector: Dict[str, List]) -> Dict[str, str]:
+    """Sparse vector -> base64 int32 indices + float32 values"""
+    return {"i": _pack(vector["indices"], "<i4"), "v": _pack(vector["values"], "<f4")}
+
+
+def decode_sparse(data: Dict[str, str]) -> Dict[str, List]:
+    return {"indices": _unpack(data["i"], "<i4"), "values": _unpack(data["v"], "<f4")}
+
+
+class QueryVectorCache:
+    """
+    Cache of dense and sparse query vectors.
+
+    Keys hash the encoder model name together with the normalized query,
+    so changing EMBEDDING_MODEL or SPARSE_MODEL never serves stale vectors.
+    Dense and sparse entries are cached separately so either encoder can
+    be skipped independently.
+    """
+
+    def __init__(self):
+        self.dense = TwoTierCache(
+            name="qvec:dense",
+            max_size=settings.QUERY_VECTOR_CACHE_SIZE,
+            ttl=settings.QUERY_VECTOR_CACHE_TTL,
+            use_redis=settings.QUERY_VECTOR_CACHE_REDIS,
+            encode=encode_dense,
+            decode=decode_dense,
+        )
+        self.sparse = TwoTierCache(
+            name="qvec:sparse",
+            max_size=settings.QUERY_VECTOR_CACHE_SIZE,
+            ttl=settings.QUERY_VECTOR_CACHE_TTL,
+            use_redis=settings.QUERY_VECTOR_CACHE_REDIS,
+            encode=encode_sparse,
+            decode=decode_sparse,
+        )
+
+    @staticmethod
+    def make_key(model_name: str, query: str) -> str:
+        """Build a cache key from model name and normalized query"""
+        raw = f"{model_name}\x00{' '.join(query.split())}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def dense_key(self, query: str) -> str:
+        return self.make_key(settings.EMBEDDING_MODEL, query)
+
+    def sparse_key(self, query: str) -> str:
+        return self.make_key(settings.SPARSE_MODEL, query)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics for both vector caches"""
+        return {
+            "dense": self.dense.get_stats(),
+            "sparse": self.sparse.get_stats(),
+        }
+
+
+_query_vector_cache: Optional[QueryVectorCache] = None
+
+
+def get_query_vector_cache() -> QueryVectorCache:
+    """Get query vector cache singleton"""
+    global _query_vector_cache
+    if _query_vector_cache is None:
+        _query_vector_cache = QueryVectorCache()
+    return _query_vector_cache
+
+
+# === Retrieval Result Cache ===
+
+def _search_effort(context: Dict[str, Any]) -> List[Any]:
+    """Dense search effort of a pipeline context, for cache keys (results depend on it)"""
+    return [
+        context.get("search_profile") or settings.SEARCH_PROFILE.value,
+        context.get("hnsw_ef"),
+        context.get("exact"),
+        context.get("rescore"),
+    ]
+
+
+class RetrievalCache:
+    """
+    Cache of reranked chunk lists (steps 2-4 of the query pipeline).
+
+    Keys include the collection's data version from Redis. Ingesting,
+    deleting or resetting a country bumps its version, so that country's
+    entries stop matching (and age out of both tiers) while every other
+    country keeps its cache. If the version cannot be read the cache is
+    bypassed rather than risk serving stale results.
+
+    Chunks are stored as RetrievedChunk.to_dict() dicts, so every hit
+    gets fresh objects that later steps may mutate freely.
+    """
+
+    def __init__(self):
+        self.cache = TwoTierCache(
+            name="retrieval",
+            max_size=settings.RETRIEVAL_CACHE_SIZE,
+            ttl=settings.RETRIEVAL_CACHE_TTL,
+        )
+
+    @staticmethod
+    def make_key(
+        query: str,
+        collection_name: str,
+        law_types: Optional[List[str]],
+        top_k: int,
+        version: int,
+        retrieval_mode: str = "hybrid_rrf",
+        prefetch: int = 25,
+        search_effort: Optional[List[Any]] = None,
+    ) -> str:
+        """Build a cache key from everything that determines the result"""
+        raw = json.dumps(
+            [
+                " ".join(query.split()),
+                collection_name,
+                sorted(law_types or []),
+                top_k,
+                version,
+                retrieval_mode,
+                prefetch,
+                search_effort or [],
+                settings.EMBEDDING_MODEL,
+                settings.SPARSE_MODEL,
+                settings.RERANKER_MODEL,
+                settings.RERANK_TOP_K,
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def key_for(self, context: Dict[str, Any]) -> Optional[str]:
+        """
+        Build the key for a query pipeline context.
+
+        Args:
+            context: Pipeline context (after preprocessing, with 'collection_version')
+
+        Returns:
+            Cache key, or None if the collection version is unavailable
+        """
+        version = context.get("collection_version")
+        if version is None:
+            return None
+
+        return self.make_key(
+            context.get("normalized_query", ""),
+            context["collection_name"],
+            context.get("law_types"),
+            context.get("top_k", settings.DEFAULT_TOP_K),
+            version,
+            context.get("retrieval_mode", "hybrid_rrf"),
+            context.get("prefetch", settings.HYBRID_PREFETCH),
+            _search_effort(context),
+        )
+
+    async def get_async(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get cached {'chunks': [chunk dicts], 'chunks_retrieved': n} for a key"""
+        return await self.cache.get_async(key)
+
+    async def set_async(self, key: str, chunks: List[Dict[str, Any]], chunks_retrieved: int) -> None:
+        """Cache reranked chunk dicts for a key"""
+        await self.cache.set_async(key, {"chunks": chunks, "chunks_retrieved": chunks_retrieved})
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get retrieval cache statistics"""
+        return self.cache.get_stats()
+
+
+_retrieval_cache: Optional[RetrievalCache] = None
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    """Get retrieval cache singleton"""
+    global _retrieval_cache
+    if _retrieval_cache is None:
+        _retrieval_cache = RetrievalCache()
+    return _retrieval_cache
+
+
+# === LLM Answer Cache ===
+
+class AnswerCache:
+    """
+    Cache of generated answers.
+
+    Keyed on the normalized question, the ordered chunk_ids given to the
+    LLM as evidence, and everything that shapes generation (model,
+    temperature, max tokens, system prompt hash). A hit costs no API
+    quota and returns in milliseconds.
+    """
+
+    def __init__(self):
+        self.cache = TwoTierCache(
+            name="answer",
+            max_size=settings.ANSWER_CACHE_SIZE,
+            ttl=settings.ANSWER_CACHE_TTL,
+        )
+
+    @staticmethod
+    def make_key(question: str, chunk_ids: List[str], system_prompt: str) -> str:
+        """Build a cache key from the question, evidence and generation settings"""
+        raw = json.dumps(
+            [
+                " ".join(question.split()),
+                list(chunk_ids),
+                settings.LLM_MODEL,
+                settings.LLM_TEMPERATURE,
+                settings.LLM_MAX_TOKENS,
+                hashlib.sha256(system_prompt.encode("utf-8")).hexdigest(),
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        return self.cache.get(key)
+
+    async def get_async(self, key: str) -> Optional[str]:
+        return await self.cache.get_async(key)
+
+    def set(self, key: str, answer: str) -> None:
+        self.cache.set(key, answer)
+
+    async def set_async(self, key: str, answer: str) -> None:
+        await self.cache.set_async(key, answer)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get answer cache statistics"""
+        return self.cache.get_stats()
+
+
+_answer_cache: Optional[AnswerCache] = None
+
+
+def get_answer_cache() -> AnswerCache:
+    """Get answer cache singleton"""
+    global _answer_cache
+    if _answer_cache is None:
+        _answer_cache = AnswerCache()
+    return _answer_cache
+
+
+# === Semantic Query Cache ===
+
+@dataclass
+class _SemanticEntry:
+    """A cached query embedding with its final output"""
+    scope: str
+    vector: np.ndarray  # Unit-norm float32
+    value: Dict[str, Any]  # QueryOutput.to_dict()
+    expires_at: float
+
+
+class SemanticCache:
+    """
+    Near-duplicate query cache.
+
+    Stores recent query embeddings with their final QueryOutput in a small
+    in-memory vector index. A new query whose embedding has cosine
+    similarity >= SEMANTIC_CACHE_THRESHOLD with a cached query in the same
+    scope is answered from the cache, skipping retrieval, reranking and
+    generation.
+
+    The scope covers collection + data version, law_types, top_k and the
+    models, so a hit is only served for an equivalent request against
+    unchanged data.
+
+    With SEMANTIC_CACHE_REDIS the index is also kept in Redis (one
+    float16 vector list per scope, outputs stored separately) so workers
+    share hits; local misses fall back to searching that list.
+    """
+
+    HISTOGRAM_BIN = 0.01
+
+    def __init__(self):
+        self.threshold = settings.SEMANTIC_CACHE_THRESHOLD
+        self.max_size = max(1, settings.SEMANTIC_CACHE_SIZE)
+        self.ttl = settings.SEMANTIC_CACHE_TTL
+        self.use_redis = settings.SEMANTIC_CACHE_REDIS
+        self.redis_max_per_scope = max(1, settings.SEMANTIC_CACHE_REDIS_MAX_PER_SCOPE)
+
+        self._entries: "OrderedDict[str, _SemanticEntry]" = OrderedDict()
+        self._indexes: Dict[str, Tuple[List[str], np.ndarray]] = {}  # scope -> (ids, matrix)
+        self._lock = Lock()
+        self._redis: Optional[RedisManager] = None
+
+        self.lookups = 0
+        self.hits = 0
+        self.redis_hits = 0
+        self.evictions = 0
+        self.redis_errors = 0
+        self.similarity_histogram: Dict[str, int] = {}
+
+    @property
+    def redis(self) -> RedisManager:
+        """Lazy load Redis manager"""
+        if self._redis is None:
+            self._redis = get_redis_manager()
+        return self._redis
+
+    @staticmethod
+    def make_scope(context: Dict[str, Any]) -> Optional[str]:
+        """
+        Build the scope for a query pipeline context.
+
+        Returns:
+            Scope id, or None if the collection version is unavailable
+        """
+        version = context.get("collection_version")
+        if version is None:
+            return None
+
+        raw = json.dumps(
+            [
+                context["collection_name"],
+                version,
+                sorted(context.get("law_types") or []),
+                context.get("top_k", settings.DEFAULT_TOP_K),
+                context.get("retrieval_mode", "hybrid_rrf"),
+                context.get("prefetch", settings.HYBRID_PREFETCH),
+                _search_effort(context),
+                settings.EMBEDDING_MODEL,
+                settings.RERANKER_MODEL,
+                settings.LLM_MODEL,
+                settings.LLM_TEMPERATURE,
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def _unit(vector: Any) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def _search_local(self, scope: str, vec: np.ndarray) -> Tuple[float, Optional[Dict[str, Any]]]:
+        """Best match in the local index for a scope"""
+        with self._lock:
+            index = self._indexes.get(scope)
+            if index is None:
+                ids = [i for i, e in self._entries.items() if e.scope == scope]
+                matrix = (
+                    np.stack([self._entries[i].vector for i in ids])
+                    if ids else np.empty((0, vec.shape[0]), dtype=np.float32)
+                )
+                index = self._indexes[scope] = (ids, matrix)
+
+            ids, matrix = index
+            if not ids:
+                return -1.0, None
+
+            sims = matrix @ vec
+            best = int(np.argmax(sims))
+            entry = self._entries.get(ids[best])
+            if entry is None:
+                return -1.0, None
+
+            if entry.expires_at < time.monotonic():
+                self._remove(ids[best])
+                return -1.0, None
+
+            self._entries.move_to_end(ids[best])
+            return float(sims[best]), entry.value
+
+    def _remove(self, entry_id: str) -> None:
+        """Remove an entry (lock held)"""
+        entry = self._entries.pop(entry_id, None)
+        if entry is not None:
+            self._indexes.pop(entry.scope, None)
+
+    def _insert_local(self, scope: str, vec: np.ndarray, value: Dict[str, Any]) -> None:
+        """Add an entry, evicting the least recently used ones if full"""
+        with self._lock:
+            self._entries[uuid.uuid4().hex] = _SemanticEntry(
+                scope=scope,
+                vector=vec,
+                value=value,
+                expires_at=time.monotonic() + self.ttl,
+            )
+            self._indexes.pop(scope, None)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    async def _search_redis(self, scope: str, vec: np.ndarray) -> Tuple[float, Optional[Dict[str, Any]]]:
+        """Best match in the shared Redis index for a scope"""
+        try:
+            index = await self.redis.cache_get_async(f"semantic:{scope}:index")
+            if not index or not index["ids"]:
+                return -1.0, None
+
+            matrix = np.stack([
+                self._unit(np.frombuffer(base64.b64decode(v), dtype="<f2"))
+                for v in index["vectors"]
+            ])
+            sims = matrix @ vec
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return float(sims[best]), None
+
+            value = await self.redis.cache_get_async(f"semantic:out:{index['ids'][best]}")
+            return float(sims[best]), value
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Semantic cache Redis store unavailable: {e}")
+            return -1.0, None
+
+    async def _store_redis(self, scope: str, vec: np.ndarray, value: Dict[str, Any]) -> None:
+        """Append an entry to the shared Redis index (last writer wins)"""
+        entry_id = uuid.uuid4().hex
+        try:
+            await self.redis.cache_set_async(f"semantic:out:{entry_id}", value, ttl=self.ttl)
+
+            key = f"semantic:{scope}:index"
+            index = await self.redis.cache_get_async(key) or {"ids": [], "vectors": []}
+            index["ids"].append(entry_id)
+            index["vectors"].append(base64.b64encode(vec.astype("<f2").tobytes()).decode("ascii"))
+            index["ids"] = index["ids"][-self.redis_max_per_scope:]
+            index["vectors"] = index["vectors"][-self.redis_max_per_scope:]
+            await self.redis.cache_set_async(key, index, ttl=self.ttl)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Semantic cache Redis store unavailable: {e}")
+
+    def _record_hit(self, similarity: float) -> None:
+        self.hits += 1
+        bucket = f"{int(similarity / self.HISTOGRAM_BIN) * self.HISTOGRAM_BIN:.2f}"
+        self.similarity_histogram[bucket] = self.similarity_histogram.get(bucket, 0) + 1
+
+    async def lookup_async(self, scope: str, vector: Any) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """
+        Find a cached output for a near-duplicate query.
+
+        Args:
+            scope: Scope from make_scope()
+            vector: Dense query embedding
+
+        Returns:
+            (similarity, QueryOutput dict) on a hit, else None
+        """
+        self.lookups += 1
+        vec = self._unit(vector)
+
+        similarity, value = self._search_local(scope, vec)
+        if value is not None and similarity >= self.threshold:
+            self._record_hit(similarity)
+            count_cache_lookup("semantic", "local_hit")
+            return similarity, value
+
+        if not self.use_redis:
+            count_cache_lookup("semantic", "miss")
+            return None
+
+        similarity, value = await self._search_redis(scope, vec)
+        if value is None:
+            count_cache_lookup("semantic", "miss")
+            return None
+
+        self.redis_hits += 1
+        self._record_hit(similarity)
+        count_cache_lookup("semantic", "redis_hit")
+        self._insert_local(scope, vec, value)
+        return similarity, value
+
+    async def store_async(self, scope: str, vector: Any, value: Dict[str, Any]) -> None:
+        """
+        Cache the final output of a query.
+
+        Args:
+            scope: Scope from make_scope()
+            vector: Dense query embedding
+            value: QueryOutput.to_dict()
+        """
+        vec = self._unit(vector)
+        self._insert_local(scope, vec, value)
+        if self.use_redis:
+            await self._store_redis(scope, vec, value)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get semantic cache statistics, including the hit similarity histogram"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "threshold": self.threshold,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "redis_enabled": self.use_redis,
+            "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "similarity_histogram": dict(sorted(self.similarity_histogram.items())),
+        }
+
+
+_semantic_cache: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Get semantic cache singleton"""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache()
+    return _semantic_cache
+
+
+async def get_collection_version_async(collection_name: str) -> Optional[int]:
+    """
+    Read a collection's data version for use in cache keys.
+
+    Returns:
+        Version, or None if Redis is unavailable (callers bypass caches)
+    """
+    try:
+        return await get_redis_manager().get_collection_version_async(collection_name)
+    except Exception as e:
+        logger.warning(f"Result caches bypassed, no data version for {collection_name}: {e}")
+        return None
+
+
+def invalidate_collection(collection_name: str) -> None:
+    """
+    Invalidate cached results for one collection by bumping its version,
+    and drop its cached metadata from the collection registry.
+    Called after ingest, delete and reset.
+    """
+    get_collection_registry().invalidate(collection_name)
+    try:
+        version = get_redis_manager().bump_collection_version(collection_name)
+        logger.info(f"🔄 {collection_name} data version -> {version}")
+    except Exception as e:
+        logger.warning(f"Could not bump data version of {collection_name}: {e}")
+
+
+async def invalidate_collection_async(collection_name: str) -> None:
+    """Async version of invalidate_collection"""
+    get_collection_registry().invalidate(collection_name)
+    try:
+        version = await get_redis_manager().bump_collection_version_async(collection_name)
+        logger.info(f"🔄 {collection_name} data version -> {version}")
+    except Exception as e:
+        logger.warning(f"Could not bump data version of {collection_name}: {e}")
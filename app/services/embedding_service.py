@@ -10,6 +10,9 @@ import logging
 
 from app.core.config import settings
 from app.utils.device import get_device, get_torch_dtype
+from app.utils.batching import MicroBatcher
+from app.utils.metrics import observe_model_call
+from app.utils.tracing import start_span
 
 logger = logging.getLogger(__name__)
 
@@ -86,7 +89,9 @@ class EmbeddingService:
         Returns:
             List of floats (1024-dimensional vector)
         """
-        with torch.no_grad():
+        with torch.no_grad(), observe_model_call("embedding", 1), start_span(
+            "model.embedding", {"model.name": settings.EMBEDDING_MODEL, "batch.size": 1}
+        ):
             embedding = self.model.encode(
                 text,
                 normalize_embeddings=True,
@@ -119,7 +124,10 @@ class EmbeddingService:
         
         logger.info(f"📊 Embedding {total} chunks (batch_size={bs})...")
         
-        with torch.no_grad():
+        with torch.no_grad(), start_span(
+            "model.embedding",
+            {"model.name": settings.EMBEDDING_MODEL, "batch.size": total, "batch.forward_size": bs},
+        ):
             embeddings = self.model.encode(
                 texts,
                 normalize_embeddings=True,
@@ -131,6 +139,33 @@ class EmbeddingService:
         logger.info(f"✅ Embedded {total} chunks successfully")
         return embeddings.tolist()
     
+    def embed_queries(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[float]]:
+        """
+        Embed a batch of queries.
+        Quiet, instrumented counterpart of embed_batch used on the query path.
+        
+        Args:
+            texts: Query texts
+            batch_size: Forward pass size (default: all texts in one pass)
+            
+        Returns:
+            List of embedding vectors
+        """
+        if not texts:
+            return []
+        
+        with torch.no_grad(), observe_model_call("embedding", len(texts)), start_span(
+            "model.embedding", {"model.name": settings.EMBEDDING_MODEL, "batch.size": len(texts)}
+        ):
+            embeddings = self.model.encode(
+                texts,
+                normalize_embeddings=True,
+                batch_size=batch_size or len(texts),
+                show_progress_bar=False,
+                convert_to_numpy=True,
+            )
+        return embeddings.tolist()
+    
     def get_dimension(self) -> int:
         """Get embedding dimension"""
         return self.dimension
@@ -155,3 +190,24 @@ def get_embedding_service() -> EmbeddingService:
     if _embedding_service is None:
         _embedding_service = EmbeddingService()
     return _embedding_service
+
+
+_embedding_batcher: Optional[MicroBatcher] = None
+
+
+def get_embedding_batcher() -> MicroBatcher:
+    """
+    Get the query embedding micro-batcher singleton.
+    
+    Concurrent `submit(text)` calls arriving within
+    EMBEDDING_MICRO_BATCH_WINDOW_MS share one model.encode call.
+    """
+    global _embedding_batcher
+    if _embedding_batcher is None:
+        _embedding_batcher = MicroBatcher(
+            name="embedding",
+            process_batch=lambda texts: get_embedding_service().embed_queries(texts),
+            max_batch_cost=settings.EMBEDDING_MICRO_BATCH_MAX_SIZE,
+            window_ms=settings.EMBEDDING_MICRO_BATCH_WINDOW_MS,
+        )
+    return _embedding_batcher
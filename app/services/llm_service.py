@@ -3,13 +3,16 @@ LLM Service
 Google Gemini for answer generation
 """
 
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 import logging
+import time
 
 from google import genai
 from google.genai import types
 
 from app.core.config import settings
+from app.utils.metrics import observe_llm_call
+from app.utils.tracing import set_attributes, start_span
 
 logger = logging.getLogger(__name__)
 
@@ -85,22 +88,16 @@ class LLMService:
             self._initialize()
         return self._client
     
-    def generate(
-        self,
-        query: str,
-        context_docs: List[Dict],
-        system_prompt: Optional[str] = None,
-    ) -> str:
+    def _build_prompt(self, query: str, context_docs: List[Dict]) -> str:
         """
-        Generate answer from query and context documents.
+        Build the user prompt from query and context documents.
         
         Args:
             query: User question
             context_docs: Retrieved documents with content, article_number, law_name
-            system_prompt: Override system prompt
             
         Returns:
-            Generated answer text
+            Prompt text
         """
         # Format context with article citations
         context_parts = []
@@ -116,7 +113,7 @@ class LLMService:
         context = "\n\n---\n\n".join(context_parts)
         
         # Build prompt
-        prompt = f"""السؤال: {query}
+        return f"""السؤال: {query}
 
 المواد القانونية المتاحة:
 
@@ -125,20 +122,126 @@ class LLMService:
 ---
 
 أجب على السؤال بناءً على المواد المقدمة فقط. اذكر رقم المادة واسم القانون لكل معلومة."""
-
-        # Generate response
-        response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                system_instruction=system_prompt or self.SYSTEM_PROMPT,
-                temperature=self.temperature,
-                max_output_tokens=self.max_tokens,
-            ),
+    
+    def _build_config(self, system_prompt: Optional[str] = None) -> types.GenerateContentConfig:
+        """Build the generation config"""
+        return types.GenerateContentConfig(
+            system_instruction=system_prompt or self.SYSTEM_PROMPT,
+            temperature=self.temperature,
+            max_output_tokens=self.max_tokens,
         )
+    
+    def _span(self, mode: str, context_docs: Optional[List[Dict]] = None, current: bool = True):
+        """Trace span for a Gemini call"""
+        return start_span(f"gemini.{mode}", {
+            "gen_ai.system": "gemini",
+            "gen_ai.request.model": self.model_name,
+            "gen_ai.request.temperature": self.temperature,
+            "gen_ai.request.max_tokens": self.max_tokens,
+            "llm.context_docs": len(context_docs) if context_docs is not None else None,
+        }, current=current)
+    
+    def _record_call(self, span, mode: str, started: float, usage) -> None:
+        """Latency/token metrics and span attributes for a finished Gemini call"""
+        observe_llm_call(self.model_name, mode, time.perf_counter() - started, usage)
+        if usage is not None:
+            set_attributes(span, **{
+                "gen_ai.usage.input_tokens": usage.prompt_token_count,
+                "gen_ai.usage.output_tokens": usage.candidates_token_count,
+                "gen_ai.usage.thinking_tokens": getattr(usage, "thoughts_token_count", None),
+            })
+    
+    def generate(
+        self,
+        query: str,
+        context_docs: List[Dict],
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        """
+        Generate answer from query and context documents.
+        
+        Args:
+            query: User question
+            context_docs: Retrieved documents with content, article_number, law_name
+            system_prompt: Override system prompt
+            
+        Returns:
+            Generated answer text
+        """
+        with self._span("generate", context_docs) as span:
+            start = time.perf_counter()
+            response = self.client.models.generate_content(
+                model=self.model_name,
+                contents=self._build_prompt(query, context_docs),
+                config=self._build_config(system_prompt),
+            )
+            self._record_call(span, "generate", start, response.usage_metadata)
         
         return response.text
     
+    async def generate_async(
+        self,
+        query: str,
+        context_docs: List[Dict],
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        """
+        Async version of generate using the non-blocking genai client.
+        
+        Args:
+            query: User question
+            context_docs: Retrieved documents with content, article_number, law_name
+            system_prompt: Override system prompt
+            
+        Returns:
+            Generated answer text
+        """
+        with self._span("generate", context_docs) as span:
+            start = time.perf_counter()
+            response = await self.client.aio.models.generate_content(
+                model=self.model_name,
+                contents=self._build_prompt(query, context_docs),
+                config=self._build_config(system_prompt),
+            )
+            self._record_call(span, "generate", start, response.usage_metadata)
+        
+        return response.text
+    
+    async def generate_stream_async(
+        self,
+        query: str,
+        context_docs: List[Dict],
+        system_prompt: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream the answer as Gemini generates it.
+        
+        Args:
+            query: User question
+            context_docs: Retrieved documents with content, article_number, law_name
+            system_prompt: Override system prompt
+            
+        Yields:
+            Answer text fragments in order
+        """
+        # Not the current span: the generator may be resumed or closed
+        # from another context
+        with self._span("stream", context_docs, current=False) as span:
+            start = time.perf_counter()
+            stream = await self.client.aio.models.generate_content_stream(
+                model=self.model_name,
+                contents=self._build_prompt(query, context_docs),
+                config=self._build_config(system_prompt),
+            )
+            
+            usage = None
+            async for chunk in stream:
+                usage = chunk.usage_metadata or usage  # Totals arrive with the last chunk
+                if chunk.text:
+                    yield chunk.text
+            
+            self._record_call(span, "stream", start, usage)
+    
     def generate_simple(self, prompt: str) -> str:
         """
         Generate response for a simple prompt (without context).
@@ -149,14 +252,17 @@ class LLMService:
         Returns:
             Generated text
         """
-        response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                temperature=self.temperature,
-                max_output_tokens=self.max_tokens,
-            ),
-        )
+        with self._span("simple") as span:
+            start = time.perf_counter()
+            response = self.client.models.generate_content(
+                model=self.model_name,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    temperature=self.temperature,
+                    max_output_tokens=self.max_tokens,
+                ),
+            )
+            self._record_call(span, "simple", start, response.usage_metadata)
         
         return response.text
     
@@ -3,13 +3,17 @@ Reranker Service
 Qwen3-Reranker-0.6B for cross-encoder reranking
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import copy
 import torch
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
 import logging
 
 from app.core.config import settings
 from app.utils.device import get_device, get_torch_dtype
+from app.utils.batching import MicroBatcher
+from app.utils.metrics import observe_model_call
+from app.utils.tracing import set_attributes, start_span
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +26,8 @@ class RerankerService:
     Features:
     - Cross-encoder architecture for accurate relevance scoring
     - Automatic GPU/CPU detection
-    - Batch scoring for efficiency
+    - Length-bucketed batch scoring (minimal padding)
+    - Optional query-prefix KV-cache reuse across a query's candidates
     """
     
     _instance: Optional['RerankerService'] = None
@@ -113,6 +118,303 @@ class RerankerService:
             self._load_model()
         return self._tokenizer
     
+    @staticmethod
+    def _logits_to_scores(logits: torch.Tensor) -> torch.Tensor:
+        """
+        Reduce model logits to one relevance score per pair.
+        
+        Handles different model output shapes:
+        - Single output (num_labels=1): logits shape [batch, 1] -> squeeze to [batch]
+        - Binary classification (num_labels=2): use positive class logit at index 1
+        - Multi-class: use max logit as relevance score
+        """
+        if logits.shape[-1] == 1:
+            scores = logits.squeeze(-1)
+        elif logits.shape[-1] == 2:
+            # Binary classification: use positive class logit
+            scores = logits[:, 1]
+        else:
+            # Multi-class: use max logit as relevance score
+            scores = logits.max(dim=-1).values
+        
+        # Handle single document case (0-dim tensor after squeeze)
+        if len(scores.shape) == 0:
+            scores = scores.unsqueeze(0)
+        
+        return scores
+    
+    @staticmethod
+    def plan_sub_batches(lengths: List[int], token_budget: int) -> List[List[int]]:
+        """
+        Group pair indices into length-bucketed sub-batches.
+        
+        Pairs are sorted by token length and packed greedily so that each
+        sub-batch's padded size (pairs x longest pair) stays within the
+        budget. Neighbouring lengths end up together, so little padding
+        is needed.
+        
+        Args:
+            lengths: Token length of each pair
+            token_budget: Max padded tokens per sub-batch
+            
+        Returns:
+            List of index lists (one per sub-batch)
+        """
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+        
+        batches: List[List[int]] = []
+        current: List[int] = []
+        for idx in order:
+            # Sorted ascending, so the new pair sets the padded width
+            if current and (len(current) + 1) * lengths[idx] > token_budget:
+                batches.append(current)
+                current = []
+            current.append(idx)
+        if current:
+            batches.append(current)
+        
+        return batches
+    
+    @staticmethod
+    def padding_ratio(lengths: List[int], batches: List[List[int]]) -> float:
+        """
+        Fraction of computed tokens that are padding for a batch plan.
+        
+        Args:
+            lengths: Token length of each pair
+            batches: Sub-batch plan (index lists)
+            
+        Returns:
+            Padding tokens / padded tokens (0.0 = no padding)
+        """
+        padded = sum(len(b) * max(lengths[i] for i in b) for b in batches if b)
+        if padded == 0:
+            return 0.0
+        return 1 - sum(lengths) / padded
+    
+    def tokenize_pairs(self, pairs: List[Tuple[str, str]]) -> Dict[str, List[List[int]]]:
+        """
+        Tokenize pairs without padding (truncated to max_length).
+        
+        Args:
+            pairs: List of (query, document) tuples
+            
+        Returns:
+            Tokenizer output with unpadded input_ids / attention_mask lists
+        """
+        return self.tokenizer(
+            [list(pair) for pair in pairs],
+            padding=False,
+            truncation=True,
+            max_length=self.max_length,
+        )
+    
+    def score_pairs(
+        self,
+        pairs: List[Tuple[str, str]],
+        token_budget: Optional[int] = None,
+        prefix_cache: Optional[bool] = None,
+    ) -> List[float]:
+        """
+        Score (query, document) pairs.
+        Pairs may belong to different queries.
+        
+        Pairs are tokenized once, sorted by length and scored in sub-batches
+        that are each padded only to their own longest pair, then scores are
+        returned in the original order.
+        
+        Args:
+            pairs: List of (query, document) tuples
+            token_budget: Max padded tokens per sub-batch
+                (default RERANKER_SUBBATCH_TOKEN_BUDGET)
+            prefix_cache: Reuse the shared query prefix KV cache per query
+                (default RERANKER_PREFIX_CACHE)
+            
+        Returns:
+            Relevance scores in the same order as pairs
+        """
+        if not pairs:
+            return []
+        
+        budget = token_budget or settings.RERANKER_SUBBATCH_TOKEN_BUDGET
+        use_prefix_cache = settings.RERANKER_PREFIX_CACHE if prefix_cache is None else prefix_cache
+        
+        with observe_model_call("reranker", len(pairs)), start_span(
+            "model.reranker", {"model.name": settings.RERANKER_MODEL, "batch.size": len(pairs)}
+        ) as span:
+            # Tokenize once, unpadded
+            encoded = self.tokenize_pairs(pairs)
+            scores: List[float] = [0.0] * len(pairs)
+            set_attributes(span, **{
+                "batch.tokens": sum(len(ids) for ids in encoded["input_ids"]),
+                "rerank.prefix_cache": use_prefix_cache,
+            })
+            
+            if not use_prefix_cache:
+                self._score_bucketed(encoded["input_ids"], list(range(len(pairs))), budget, scores)
+                return scores
+            
+            # Group by query so each group shares one prefix
+            groups: Dict[str, List[int]] = {}
+            for i, (query, _) in enumerate(pairs):
+                groups.setdefault(query, []).append(i)
+            
+            for indices in groups.values():
+                if len(indices) == 1:
+                    self._score_bucketed(encoded["input_ids"], indices, budget, scores)
+                else:
+                    self._score_with_prefix_cache(encoded["input_ids"], indices, budget, scores)
+            
+            return scores
+    
+    def _score_bucketed(
+        self,
+        input_ids: List[List[int]],
+        indices: List[int],
+        budget: int,
+        scores: List[float],
+    ) -> None:
+        """Score full sequences in length-bucketed, left-padded sub-batches"""
+        lengths = [len(input_ids[i]) for i in indices]
+        
+        for batch in self.plan_sub_batches(lengths, budget):
+            rows = [indices[j] for j in batch]
+            features = [
+                {"input_ids": input_ids[i], "attention_mask": [1] * len(input_ids[i])}
+                for i in rows
+            ]
+            
+            # Pad this sub-batch to its own longest pair only
+            inputs = self.tokenizer.pad(
+                features,
+                padding=True,
+                return_tensors="pt",
+            ).to(self.device)
+            
+            # Score
+            with torch.no_grad():
+                logits = self.model(**inputs).logits
+                batch_scores = self._logits_to_scores(logits).float().cpu().tolist()
+            
+            # Scatter back to original order
+            for i, score in zip(rows, batch_scores):
+                scores[i] = score
+    
+    def _score_with_prefix_cache(
+        self,
+        input_ids: List[List[int]],
+        indices: List[int],
+        budget: int,
+        scores: List[float],
+    ) -> None:
+        """
+        Score pairs of one query, encoding their shared prefix only once.
+        
+        The prefix is the longest common token prefix of the group's
+        sequences, so every scored sequence is token-for-token identical to
+        the full-sequence path. Its key/value cache is computed once and
+        reused for each sub-batch of document suffixes, which are
+        right-padded so cached positions stay contiguous.
+        """
+        sequences = [input_ids[i] for i in indices]
+        
+        # Longest common prefix, leaving at least one suffix token per pair
+        prefix_len = min(len(seq) for seq in sequences) - 1
+        for pos in range(prefix_len):
+            token = sequences[0][pos]
+            if any(seq[pos] != token for seq in sequences):
+                prefix_len = pos
+                break
+        
+        if prefix_len <= 0:
+            self._score_bucketed(input_ids, indices, budget, scores)
+            return
+        
+        prefix = torch.tensor([sequences[0][:prefix_len]], device=self.device)
+        with torch.no_grad():
+            prefix_out = self.model.base_model(input_ids=prefix, use_cache=True)
+        prefix_cache = prefix_out.past_key_values
+        
+        pad_id = self.tokenizer.pad_token_id
+        suffixes = [seq[prefix_len:] for seq in sequences]
+        lengths = [len(suffix) for suffix in suffixes]
+        
+        for batch in self.plan_sub_batches(lengths, budget):
+            width = max(lengths[j] for j in batch)
+            
+            ids = torch.full((len(batch), width), pad_id, dtype=torch.long)
+            mask = torch.zeros((len(batch), prefix_len + width), dtype=torch.long)
+            mask[:, :prefix_len] = 1
+            for row, j in enumerate(batch):
+                ids[row, :lengths[j]] = torch.tensor(suffixes[j])
+                mask[row, prefix_len:prefix_len + lengths[j]] = 1
+            
+            positions = torch.arange(prefix_len, prefix_len + width).unsqueeze(0).expand(len(batch), -1)
+            
+            with torch.no_grad():
+                logits = self.model(
+                    input_ids=ids.to(self.device),
+                    attention_mask=mask.to(self.device),
+                    position_ids=positions.to(self.device),
+                    past_key_values=self._expand_cache(prefix_cache, len(batch)),
+                    use_cache=True,
+                ).logits
+                batch_scores = self._logits_to_scores(logits).float().cpu().tolist()
+            
+            for j, score in zip(batch, batch_scores):
+                scores[indices[j]] = score
+    
+    @staticmethod
+    def _expand_cache(prefix_cache, batch_size: int):
+        """
+        Copy a batch-1 prefix cache (DynamicCache) repeated to batch_size rows.
+        
+        A copy is made per call because the model appends to the cache in
+        place during the forward pass.
+        """
+        cache = copy.deepcopy(prefix_cache)
+        cache.batch_repeat_interleave(batch_size)
+        return cache
+    
+    @staticmethod
+    def rank_by_scores(
+        documents: List[Dict],
+        scores: List[float],
+        top_k: int,
+    ) -> List[Dict]:
+        """
+        Attach scores to documents, sort descending and keep top-k.
+        
+        Args:
+            documents: Candidate document dicts
+            scores: One score per document
+            top_k: Number of documents to keep
+            
+        Returns:
+            Top-k document copies with rerank_score added
+        """
+        scored_docs = []
+        for doc, score in zip(documents, scores):
+            doc_copy = doc.copy()
+            doc_copy["rerank_score"] = score
+            scored_docs.append(doc_copy)
+        
+        # Sort by score (descending) and take top-k
+        scored_docs.sort(key=lambda x: x["rerank_score"], reverse=True)
+        
+        return scored_docs[:top_k]
+    
+    @staticmethod
+    def estimate_pair_tokens(pair: Tuple[str, str]) -> int:
+        """
+        Cheap token estimate for a (query, document) pair.
+        Uses the same ~1.5 chars/token ratio for Arabic as chunking,
+        capped at RERANKER_MAX_LENGTH (pairs are truncated there).
+        """
+        query, document = pair
+        estimated = int((len(query) + len(document)) / 1.5) + 1
+        return min(estimated, settings.RERANKER_MAX_LENGTH)
+    
     def rerank(
         self,
         query: str,
@@ -137,55 +439,12 @@ class RerankerService:
         
         k = top_k or settings.RERANK_TOP_K
         
-        # Extract content
-        contents = [doc.get(content_key, "") for doc in documents]
-        
         # Create query-document pairs
-        pairs = [[query, content] for content in contents]
-        
-        # Tokenize
-        inputs = self.tokenizer(
-            pairs,
-            padding=True,
-            truncation=True,
-            return_tensors="pt",
-            max_length=self.max_length,
-        ).to(self.device)
-        
-        # Score
-        with torch.no_grad():
-            logits = self.model(**inputs).logits
-            # Handle different model output shapes:
-            # - Single output (num_labels=1): logits shape [batch, 1] -> squeeze to [batch]
-            # - Binary classification (num_labels=2): use positive class logit at index 1
-            # - Multi-class: use max logit as relevance score
-            if logits.shape[-1] == 1:
-                scores = logits.squeeze(-1)
-            elif logits.shape[-1] == 2:
-                # Binary classification: use positive class logit
-                scores = logits[:, 1]
-            else:
-                # Multi-class: use max logit as relevance score
-                scores = logits.max(dim=-1).values
-
-        # Handle single document case (0-dim tensor after squeeze)
-        if len(scores.shape) == 0:
-            scores = scores.unsqueeze(0)
-
-        # Convert to list of floats
-        scores_list = scores.cpu().tolist()
-        
-        # Add scores to documents
-        scored_docs = []
-        for i, doc in enumerate(documents):
-            doc_copy = doc.copy()
-            doc_copy["rerank_score"] = scores_list[i]
-            scored_docs.append(doc_copy)
+        pairs = [(query, doc.get(content_key, "")) for doc in documents]
         
-        # Sort by score (descending) and take top-k
-        scored_docs.sort(key=lambda x: x["rerank_score"], reverse=True)
+        scores = self.score_pairs(pairs)
         
-        return scored_docs[:k]
+        return self.rank_by_scores(documents, scores, k)
     
     def score_pair(self, query: str, document: str) -> float:
         """
@@ -198,28 +457,7 @@ class RerankerService:
         Returns:
             Relevance score
         """
-        inputs = self.tokenizer(
-            [[query, document]],
-            padding=True,
-            truncation=True,
-            return_tensors="pt",
-            max_length=self.max_length,
-        ).to(self.device)
-        
-        with torch.no_grad():
-            logits = self.model(**inputs).logits
-            # Handle different model output shapes
-            if logits.shape[-1] == 1:
-                score = logits.squeeze(-1)
-            elif logits.shape[-1] == 2:
-                # Binary classification: use positive class logit
-                score = logits[:, 1]
-            else:
-                score = logits.max(dim=-1).values
-            # Squeeze batch dimension for single pair
-            score = score.squeeze()
-
-        return float(score.cpu())
+        return self.score_pairs([(query, document)])[0]
     
     def get_model_info(self) -> dict:
         """Get model information"""
@@ -241,3 +479,26 @@ def get_reranker_service() -> RerankerService:
     if _reranker_service is None:
         _reranker_service = RerankerService()
     return _reranker_service
+
+
+_rerank_scheduler: Optional[MicroBatcher] = None
+
+
+def get_rerank_scheduler() -> MicroBatcher:
+    """
+    Get the cross-request reranking scheduler singleton.
+    
+    (query, document) pairs from concurrent requests are merged into
+    shared forward passes, capped by estimated total tokens rather than
+    pair count, and scores are scattered back to each caller.
+    """
+    global _rerank_scheduler
+    if _rerank_scheduler is None:
+        _rerank_scheduler = MicroBatcher(
+            name="reranker",
+            process_batch=lambda pairs: get_reranker_service().score_pairs(pairs),
+            max_batch_cost=settings.RERANKER_BATCH_MAX_TOKENS,
+            window_ms=settings.RERANKER_BATCH_WINDOW_MS,
+            cost_fn=RerankerService.estimate_pair_tokens,
+        )
+    return _rerank_scheduler
@@ -92,6 +92,10 @@ class SessionService:
         """Check if session exists"""
         return self.redis.session_exists(session_id)
     
+    async def session_exists_async(self, session_id: str) -> bool:
+        """Async version of session_exists"""
+        return await self.redis.session_exists_async(session_id)
+    
     def add_user_message(
         self,
         session_id: str,
@@ -116,6 +120,20 @@ class SessionService:
             metadata=metadata,
         )
     
+    async def add_user_message_async(
+        self,
+        session_id: str,
+        content: str,
+        metadata: Optional[Dict] = None,
+    ) -> bool:
+        """Async version of add_user_message"""
+        return await self.redis.add_message_async(
+            session_id=session_id,
+            role="user",
+            content=content,
+            metadata=metadata,
+        )
+    
     def add_assistant_message(
         self,
         session_id: str,
@@ -146,6 +164,25 @@ class SessionService:
             metadata=msg_metadata,
         )
     
+    async def add_assistant_message_async(
+        self,
+        session_id: str,
+        content: str,
+        sources: Optional[List[Dict]] = None,
+        metadata: Optional[Dict] = None,
+    ) -> bool:
+        """Async version of add_assistant_message"""
+        msg_metadata = metadata or {}
+        if sources:
+            msg_metadata["sources"] = sources
+        
+        return await self.redis.add_message_async(
+            session_id=session_id,
+            role="assistant",
+            content=content,
+            metadata=msg_metadata,
+        )
+    
     def get_conversation_history(
         self,
         session_id: str,
@@ -110,6 +110,22 @@ class SparseEncoderService:
         logger.info(f"✅ Sparse encoded {total} texts successfully")
         return results
     
+    def encode_queries(self, texts: List[str]) -> List[Dict[str, List]]:
+        """
+        Encode a batch of queries.
+        Quiet counterpart of encode_batch used on the query path.
+        
+        Args:
+            texts: Query texts
+            
+        Returns:
+            List of sparse vector dicts
+        """
+        return [
+            {"indices": emb.indices.tolist(), "values": emb.values.tolist()}
+            for emb in self.model.embed(texts)
+        ]
+    
     def get_model_info(self) -> dict:
         """Get model information"""
         return {
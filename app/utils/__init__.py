@@ -2,7 +2,8 @@
 
 from app.utils.device import get_device, get_torch_dtype
 from app.utils.arabic import ArabicNormalizer, ArabicNumerals
-from app.utils.patterns import ArticlePatterns
+from app.utils.patterns import ArticlePatterns, ArticleReference
+from app.utils.concurrency import run_in_model_executor
 
 __all__ = [
     "get_device",
@@ -10,4 +11,6 @@ __all__ = [
     "ArabicNormalizer",
     "ArabicNumerals",
     "ArticlePatterns",
+    "ArticleReference",
+    "run_in_model_executor",
 ]
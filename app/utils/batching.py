@@ -0,0 +1,240 @@
+"""
+Dynamic Micro-Batching
+Coalesces concurrent single-item requests into shared model calls
+"""
+
+import asyncio
+import contextvars
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+import logging
+
+from app.utils.concurrency import run_in_model_executor
+from app.utils.timing import record_wait, take_waits, track_waits
+from app.utils.tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+I = TypeVar('I')
+O = TypeVar('O')
+
+
+@dataclass
+class _PendingItem:
+    """An item waiting in the batch queue"""
+    item: Any
+    cost: int
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    wait_ms: float = 0.0  # Batch window + executor queue, set on dispatch
+
+
+@dataclass
+class BatcherStats:
+    """Running statistics for a MicroBatcher"""
+    batches: int = 0
+    items: int = 0
+    max_batch_size: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    total_compute_ms: float = 0.0
+
+    def record(self, batch_size: int, waits_ms: List[float], compute_ms: float) -> None:
+        """Record one executed batch"""
+        self.batches += 1
+        self.items += batch_size
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.total_wait_ms += sum(waits_ms)
+        self.max_wait_ms = max(self.max_wait_ms, max(waits_ms, default=0.0))
+        self.total_compute_ms += compute_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict for JSON serialization"""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "avg_wait_ms": round(self.total_wait_ms / self.items, 2) if self.items else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 2),
+            "avg_compute_ms": round(self.total_compute_ms / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+class MicroBatcher(Generic[I, O]):
+    """
+    Async front-end that groups concurrently submitted items into batches.
+
+    Items arriving within `window_ms` of the first queued item are merged
+    until the batch reaches `max_batch_cost`. Each batch is handed to
+    `process_batch` on the model executor and results are scattered back
+    to the individual callers in submission order.
+
+    Cost defaults to 1 per item (i.e. a batch-size cap); pass `cost_fn` to
+    cap by something else, such as estimated token count.
+
+    Each caller's time in the queue (batch window plus executor queue) is
+    recorded as wait time for its request stage; submit_many records the
+    longest of its items' waits.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        process_batch: Callable[[List[I]], List[O]],
+        max_batch_cost: int,
+        window_ms: float,
+        cost_fn: Optional[Callable[[I], int]] = None,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            name: Name for logging and stats
+            process_batch: Blocking callable mapping a list of items to results
+            max_batch_cost: Maximum total cost per batch
+            window_ms: Maximum time to hold the first item while collecting more
+            cost_fn: Optional per-item cost (default 1)
+        """
+        self.name = name
+        self.process_batch = process_batch
+        self.max_batch_cost = max(1, max_batch_cost)
+        self.window_s = max(0.0, window_ms) / 1000
+        self.cost_fn = cost_fn or (lambda _: 1)
+        self.stats = BatcherStats()
+        self.logger = logging.getLogger(f"batcher.{name}")
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._carry: Optional[_PendingItem] = None
+
+    def _ensure_worker(self) -> None:
+        """Start the worker task on the running loop (lazily)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._carry = None
+            # Fresh context: the worker serves every caller, so it must not
+            # inherit the first caller's trace span or wait tracking
+            self._worker = loop.create_task(
+                self._run(), name=f"batcher-{self.name}", context=contextvars.Context()
+            )
+
+    async def submit(self, item: I) -> O:
+        """
+        Submit one item and wait for its result.
+
+        Args:
+            item: Item to process
+
+        Returns:
+            Result for this item
+        """
+        result, wait_ms = await self._submit(item)
+        record_wait(wait_ms)
+        return result
+
+    async def submit_many(self, items: List[I]) -> List[O]:
+        """
+        Submit several items; they may be split across batches.
+
+        Args:
+            items: Items to process
+
+        Returns:
+            Results in the same order as items
+        """
+        outcomes = await asyncio.gather(*(self._submit(item) for item in items))
+        if outcomes:
+            record_wait(max(wait_ms for _, wait_ms in outcomes))
+        return [result for result, _ in outcomes]
+
+    async def _submit(self, item: I) -> Tuple[O, float]:
+        """Queue one item; return (result, ms spent waiting)"""
+        self._ensure_worker()
+        pending = _PendingItem(item, self.cost_fn(item), self._loop.create_future())
+        self._queue.put_nowait(pending)
+        result = await pending.future
+        return result, pending.wait_ms
+
+    async def _collect(self) -> List[_PendingItem]:
+        """Collect the next batch from the queue"""
+        first = self._carry or await self._queue.get()
+        self._carry = None
+
+        batch = [first]
+        cost = first.cost
+        deadline = first.enqueued_at + self.window_s
+
+        while cost < self.max_batch_cost:
+            if self._queue.empty():
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                pending = self._queue.get_nowait()
+
+            if cost + pending.cost > self.max_batch_cost:
+                # Does not fit - hold it for the next batch
+                self._carry = pending
+                break
+
+            batch.append(pending)
+            cost += pending.cost
+
+        return batch
+
+    async def _run(self) -> None:
+        """Worker loop: collect, execute, scatter"""
+        track_waits()  # This task's own executor waits, not the first caller's
+        while True:
+            batch = await self._collect()
+            batch = [p for p in batch if not p.future.done()]  # Drop cancelled callers
+            if not batch:
+                continue
+
+            dispatched_at = time.perf_counter()
+            waits_ms = [(dispatched_at - p.enqueued_at) * 1000 for p in batch]
+
+            try:
+                # Root span per batch: it serves several requests' traces
+                with start_span(f"batch {self.name}", {
+                    "batch.size": len(batch),
+                    "batch.cost": sum(p.cost for p in batch),
+                    "batch.max_wait_ms": round(max(waits_ms), 2),
+                }):
+                    results = await run_in_model_executor(
+                        self.process_batch, [p.item for p in batch]
+                    )
+            except Exception as e:
+                take_waits()
+                self.logger.error(f"Batch of {len(batch)} failed: {e}")
+                for p in batch:
+                    if not p.future.done():
+                        p.future.set_exception(e)
+                continue
+
+            compute_ms = (time.perf_counter() - dispatched_at) * 1000
+            self.stats.record(len(batch), waits_ms, compute_ms)
+
+            executor_wait_ms = take_waits()
+            for p, wait_ms, result in zip(batch, waits_ms, results):
+                p.wait_ms = wait_ms + executor_wait_ms
+                if not p.future.done():
+                    p.future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics"""
+        return {
+            "name": self.name,
+            "max_batch_cost": self.max_batch_cost,
+            "window_ms": self.window_s * 1000,
+            **self.stats.to_dict(),
+        }
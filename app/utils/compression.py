@@ -0,0 +1,117 @@
+"""
+Content Compression
+zstd compression of chunk content for Qdrant payloads
+"""
+
+from typing import Any, Dict, Optional
+from pathlib import Path
+import base64
+import threading
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Payload fields used when content is stored compressed
+COMPRESSED_CONTENT_FIELD = "content_z"  # base64 zstd frame
+PREVIEW_FIELD = "preview"  # First CONTENT_PREVIEW_CHARS chars, uncompressed
+
+
+class ContentCodec:
+    """
+    zstd codec for article text, with an optional shared dictionary.
+
+    Legal Arabic chunks are short and repetitive across the corpus, so a
+    dictionary trained on it (scripts/train_content_dictionary.py)
+    compresses far better than per-chunk zstd alone. Frames record the
+    dictionary ID, so a wrong or missing dictionary fails loudly instead
+    of returning garbage.
+
+    zstd (de)compressor objects are not thread-safe; one pair is kept
+    per thread.
+    """
+
+    _instance: Optional['ContentCodec'] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        import zstandard as zstd  # Optional dependency - only needed with compression
+
+        self._zstd = zstd
+        self._dict = None
+        self._local = threading.local()
+
+        if settings.CONTENT_ZSTD_DICT_PATH:
+            path = Path(settings.CONTENT_ZSTD_DICT_PATH)
+            self._dict = zstd.ZstdCompressionDict(path.read_bytes())
+            logger.info(f"📚 Loaded zstd dictionary {path.name} (id={self._dict.dict_id()})")
+
+        self._initialized = True
+
+    def _compressor(self):
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = self._zstd.ZstdCompressor(
+                level=settings.CONTENT_ZSTD_LEVEL,
+                dict_data=self._dict,
+            )
+        return self._local.compressor
+
+    def _decompressor(self):
+        if not hasattr(self._local, "decompressor"):
+            self._local.decompressor = self._zstd.ZstdDecompressor(dict_data=self._dict)
+        return self._local.decompressor
+
+    def compress(self, text: str) -> str:
+        """Compress text to a base64 zstd frame"""
+        frame = self._compressor().compress(text.encode("utf-8"))
+        return base64.b64encode(frame).decode("ascii")
+
+    def decompress(self, data: str) -> str:
+        """Decompress a base64 zstd frame to text"""
+        frame = base64.b64decode(data)
+        return self._decompressor().decompress(frame).decode("utf-8")
+
+
+def get_content_codec() -> ContentCodec:
+    """Get content codec singleton"""
+    return ContentCodec()
+
+
+def compress_content_fields(content: str) -> Dict[str, str]:
+    """
+    Payload fields for a chunk's content under CONTENT_COMPRESSION.
+
+    Returns:
+        {"content": ...} when compression is off, else
+        {"content_z": ..., "preview": ...}
+    """
+    if settings.CONTENT_COMPRESSION != "zstd":
+        return {"content": content}
+
+    return {
+        COMPRESSED_CONTENT_FIELD: get_content_codec().compress(content),
+        PREVIEW_FIELD: content[:settings.CONTENT_PREVIEW_CHARS],
+    }
+
+
+def payload_content(payload: Dict[str, Any]) -> str:
+    """Chunk content from a payload, decompressing if stored compressed"""
+    if COMPRESSED_CONTENT_FIELD in payload:
+        return get_content_codec().decompress(payload[COMPRESSED_CONTENT_FIELD])
+    return payload.get("content", "")
+
+
+def payload_preview(payload: Dict[str, Any]) -> str:
+    """Uncompressed preview from a payload (never decompresses)"""
+    if PREVIEW_FIELD in payload:
+        return payload[PREVIEW_FIELD]
+    return payload.get("content", "")[:settings.CONTENT_PREVIEW_CHARS]
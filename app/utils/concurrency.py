@@ -0,0 +1,79 @@
+"""
+Concurrency Utilities
+Bounded executor for running blocking model inference off the event loop
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, TypeVar
+import logging
+import time
+
+from app.core.config import settings
+from app.utils.timing import record_wait
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_model_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_model_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared model executor.
+
+    The pool is deliberately small: torch already parallelizes a single
+    forward pass across cores, so extra threads only add contention.
+    """
+    global _model_executor
+    if _model_executor is None:
+        workers = max(1, settings.MODEL_EXECUTOR_WORKERS)
+        _model_executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="model",
+        )
+        logger.info(f"Model executor started ({workers} workers)")
+    return _model_executor
+
+
+async def run_in_model_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking callable on the model executor.
+
+    Time spent queued for a free worker is recorded as wait time for
+    the calling request stage (see app.utils.timing). func runs in a
+    copy of the caller's context (as with asyncio.to_thread), so trace
+    spans it opens nest under the caller's.
+
+    Args:
+        func: Blocking callable (model inference, tokenization, ...)
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Result of func
+    """
+    loop = asyncio.get_running_loop()
+    submitted = time.perf_counter()
+    started: List[float] = []
+    context = contextvars.copy_context()
+
+    def call() -> T:
+        started.append(time.perf_counter())
+        return context.run(func, *args, **kwargs)
+
+    try:
+        return await loop.run_in_executor(get_model_executor(), call)
+    finally:
+        if started:
+            record_wait((started[0] - submitted) * 1000)
+
+
+def shutdown_model_executor() -> None:
+    """Shut down the model executor (called on application shutdown)"""
+    global _model_executor
+    if _model_executor is not None:
+        _model_executor.shutdown(wait=False, cancel_futures=True)
+        _model_executor = None
@@ -0,0 +1,356 @@
+"""
+Prometheus Metrics
+Latency histograms, batch sizes and counters served at /metrics
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Sequence, Tuple
+import functools
+import inspect
+import logging
+import os
+import time
+
+from starlette.routing import Match
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds; spans a cache hit (~1ms) to a slow Gemini answer
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+INGESTION_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+
+class Metrics:
+    """
+    Prometheus collectors for the API.
+
+    Recording is a label lookup plus an in-memory (or, with several
+    workers, mmap) write - a few microseconds, negligible next to model
+    and network calls.
+
+    With several uvicorn workers each process keeps its own values, so
+    PROMETHEUS_MULTIPROC_DIR must point at a directory shared by all
+    workers and emptied before they start; /metrics then aggregates
+    every worker's files. prometheus_client reads the variable when it
+    is first imported, which is why it is imported here and nowhere else.
+    """
+
+    def __init__(self):
+        if settings.PROMETHEUS_MULTIPROC_DIR:
+            Path(settings.PROMETHEUS_MULTIPROC_DIR).mkdir(parents=True, exist_ok=True)
+            os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+
+        from prometheus_client import Counter, Gauge, Histogram  # Optional dependency
+
+        self.multiprocess = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+        # === Pipelines ===
+        self.step_seconds = Histogram(
+            "rag_pipeline_step_seconds",
+            "Pipeline step latency",
+            ["pipeline", "step"],
+            buckets=LATENCY_BUCKETS,
+        )
+        self.query_stage_seconds = Histogram(
+            "rag_query_stage_seconds",
+            "Query pipeline stage latency (timings_ms stages)",
+            ["stage"],
+            buckets=LATENCY_BUCKETS,
+        )
+        self.query_stage_wait_seconds = Histogram(
+            "rag_query_stage_wait_seconds",
+            "Time a query stage spent queued for a model executor or batch",
+            ["stage"],
+            buckets=LATENCY_BUCKETS,
+        )
+
+        # === Models ===
+        self.model_batch_size = Histogram(
+            "rag_model_batch_size",
+            "Items per model forward call",
+            ["model"],
+            buckets=BATCH_SIZE_BUCKETS,
+        )
+        self.model_seconds = Histogram(
+            "rag_model_inference_seconds",
+            "Model forward call latency",
+            ["model"],
+            buckets=LATENCY_BUCKETS,
+        )
+
+        # === Qdrant ===
+        self.qdrant_seconds = Histogram(
+            "rag_qdrant_request_seconds",
+            "Qdrant call latency",
+            ["operation"],
+            buckets=LATENCY_BUCKETS,
+        )
+        self.qdrant_errors = Counter(
+            "rag_qdrant_errors_total",
+            "Failed Qdrant calls",
+            ["operation"],
+        )
+
+        # === Gemini ===
+        self.llm_seconds = Histogram(
+            "rag_llm_request_seconds",
+            "Gemini call latency (streams: until the last chunk)",
+            ["model", "mode"],
+            buckets=LATENCY_BUCKETS,
+        )
+        self.llm_tokens = Counter(
+            "rag_llm_tokens_total",
+            "Gemini tokens used",
+            ["model", "kind"],
+        )
+
+        # === Caches ===
+        self.cache_lookups = Counter(
+            "rag_cache_lookups_total",
+            "Cache lookups by result (local_hit, redis_hit, miss)",
+            ["cache", "result"],
+        )
+
+        # === HTTP ===
+        self.requests_in_flight = Gauge(
+            "rag_http_requests_in_flight",
+            "Requests being served",
+            ["route"],
+            multiprocess_mode="livesum",
+        )
+
+        # === Ingestion ===
+        self.ingested = Counter(
+            "rag_ingested_total",
+            "Ingested pages, chunks and points",
+            ["unit"],
+        )
+        self.ingestion_seconds = Histogram(
+            "rag_ingestion_seconds",
+            "Document ingestion duration",
+            buckets=INGESTION_BUCKETS,
+        )
+        self.ingestion_throughput = Gauge(
+            "rag_ingestion_throughput_per_second",
+            "Throughput of the most recent ingestion",
+            ["unit"],
+            multiprocess_mode="mostrecent",
+        )
+
+    def render(self) -> Tuple[bytes, str]:
+        """
+        Exposition of every metric (all workers in multiprocess mode).
+
+        Returns:
+            (body, content type)
+        """
+        from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+        registry = REGISTRY
+        if self.multiprocess:
+            from prometheus_client import multiprocess
+
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    def mark_process_dead(self) -> None:
+        """Drop this worker's live gauges (called on shutdown)"""
+        if self.multiprocess:
+            from prometheus_client import multiprocess
+
+            multiprocess.mark_process_dead(os.getpid())
+
+
+_metrics: Optional[Metrics] = None
+_metrics_checked = False
+
+
+def get_metrics() -> Optional[Metrics]:
+    """
+    Get metrics singleton.
+
+    Returns:
+        Metrics, or None when METRICS_ENABLED is off or
+        prometheus-client is not installed (recording is then a no-op)
+    """
+    global _metrics, _metrics_checked
+    if not _metrics_checked:
+        _metrics_checked = True
+        if settings.METRICS_ENABLED:
+            try:
+                _metrics = Metrics()
+            except ImportError:
+                logger.warning("⚠️ prometheus-client not installed - /metrics disabled")
+    return _metrics
+
+
+# === Recording helpers (no-ops when metrics are off) ===
+
+def observe_step(pipeline: str, step: str, duration_ms: float) -> None:
+    """Record a pipeline step's duration"""
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.step_seconds.labels(pipeline, step).observe(duration_ms / 1000)
+
+
+def observe_query_stage(stage: str, duration_ms: float, wait_ms: float = 0.0) -> None:
+    """Record a query pipeline stage's duration and queue wait"""
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.query_stage_seconds.labels(stage).observe(duration_ms / 1000)
+        if wait_ms > 0:
+            metrics.query_stage_wait_seconds.labels(stage).observe(wait_ms / 1000)
+
+
+@contextmanager
+def observe_model_call(model: str, batch_size: int) -> Iterator[None]:
+    """Record batch size and latency of a model forward call"""
+    metrics = get_metrics()
+    if metrics is None:
+        yield
+        return
+
+    metrics.model_batch_size.labels(model).observe(batch_size)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.model_seconds.labels(model).observe(time.perf_counter() - start)
+
+
+def observe_qdrant(operation: str) -> Callable:
+    """
+    Decorator recording a QdrantManager method's latency (and failures)
+    under `operation`. Works on sync and async methods.
+    """
+    def decorator(func: Callable) -> Callable:
+        def record(start: float, failed: bool) -> None:
+            metrics = get_metrics()
+            if metrics is None:
+                return
+            metrics.qdrant_seconds.labels(operation).observe(time.perf_counter() - start)
+            if failed:
+                metrics.qdrant_errors.labels(operation).inc()
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception:
+                    record(start, failed=True)
+                    raise
+                record(start, failed=False)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                record(start, failed=True)
+                raise
+            record(start, failed=False)
+            return result
+        return wrapper
+
+    return decorator
+
+
+def observe_llm_call(model: str, mode: str, seconds: float, usage: Any = None) -> None:
+    """
+    Record a Gemini call's latency and token usage.
+
+    Args:
+        model: Model name
+        mode: generate, stream or simple
+        seconds: Call duration
+        usage: Response usage_metadata (prompt/candidates/thoughts token counts)
+    """
+    metrics = get_metrics()
+    if metrics is None:
+        return
+
+    metrics.llm_seconds.labels(model, mode).observe(seconds)
+    if usage is None:
+        return
+    for kind, attr in (
+        ("prompt", "prompt_token_count"),
+        ("output", "candidates_token_count"),
+        ("thinking", "thoughts_token_count"),
+    ):
+        count = getattr(usage, attr, None)
+        if count:
+            metrics.llm_tokens.labels(model, kind).inc(count)
+
+
+def count_cache_lookup(cache: str, result: str) -> None:
+    """Record a cache lookup: local_hit, redis_hit or miss"""
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.cache_lookups.labels(cache, result).inc()
+
+
+def record_ingestion(pages: int, chunks: int, points: int, seconds: float) -> None:
+    """Record a completed ingestion's volume, duration and throughput"""
+    metrics = get_metrics()
+    if metrics is None:
+        return
+
+    metrics.ingestion_seconds.observe(seconds)
+    for unit, count in (("pages", pages), ("chunks", chunks), ("points", points)):
+        metrics.ingested.labels(unit).inc(count)
+        if seconds > 0:
+            metrics.ingestion_throughput.labels(unit).set(count / seconds)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware tracking in-flight HTTP requests.
+
+    Requests are labelled by the template of the route they will hit
+    (/api/v1/query, /api/v1/laws/{country}, ...); paths matching no
+    route share "other", so label cardinality stays fixed. The gauge is
+    raised before routing runs, so the request is matched here against
+    the routes passed in - the routers' own routes, whose paths already
+    carry their prefix. Plain ASGI rather than BaseHTTPMiddleware, so
+    streamed responses count until their last chunk and no per-request
+    task is added.
+    """
+
+    def __init__(self, app, routes: Sequence[Any] = ()):
+        self.app = app
+        self.routes = list(routes)
+
+    def _route_label(self, scope) -> str:
+        """Template of the route matching the request ("other" if none)"""
+        partial = None
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path  # Path matches, method does not (a 405)
+        return partial or "other"
+
+    async def __call__(self, scope, receive, send):
+        metrics = get_metrics()
+        if scope["type"] != "http" or metrics is None:
+            await self.app(scope, receive, send)
+            return
+
+        gauge = metrics.requests_in_flight.labels(self._route_label(scope))
+        gauge.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gauge.dec()
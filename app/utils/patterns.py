@@ -7,7 +7,25 @@ import re
 from typing import List, Optional, Tuple
 from dataclasses import dataclass
 
-from app.utils.arabic import ArabicNumerals
+from app.utils.arabic import ArabicNumerals, ArabicNormalizer
+
+
+# === LAW TYPE KEYWORDS ===
+# Keyword in a question -> law_type payload value ("قانون العمل" rather
+# than "عمل", which is part of too many words; scripts/ingest_all.py keeps
+# its own file-name map)
+LAW_TYPE_KEYWORDS = {
+    "عقوبات": "criminal",
+    "جنائي": "criminal",
+    "جنايات": "criminal",
+    "مدني": "civil",
+    "تجاري": "commercial",
+    "اقتصادي": "economic",
+    "تحكيم": "arbitration",
+    "قانون العمل": "labor",
+    "أحوال شخصية": "personal_status",
+    "إداري": "administrative",
+}
 
 
 @dataclass
@@ -19,6 +37,14 @@ class ArticleMatch:
     end_pos: int
 
 
+@dataclass
+class ArticleReference:
+    """An explicit article citation in a question (e.g., "المادة ٣١٨ من قانون العقوبات")"""
+    article_number: int
+    article_text: str  # The matched text (e.g., "المادة ٣١٨")
+    law_type: Optional[str] = None  # Detected from law keywords, if any
+
+
 class ArticlePatterns:
     """
     Article detection patterns for Arabic legal documents.
@@ -149,6 +175,38 @@ class ArticlePatterns:
         
         return None
     
+    @classmethod
+    def find_article_reference(cls, text: str) -> Optional[ArticleReference]:
+        """
+        Detect an explicit reference to a single article in a question.
+        
+        Args:
+            text: User question (Arabic or English numerals)
+            
+        Returns:
+            ArticleReference, or None if no article (or several different
+            articles) are referenced
+        """
+        matches = cls.find_all_articles(text)
+        if not matches or len({m.article_number for m in matches}) != 1:
+            return None
+        
+        normalized = ArabicNormalizer.normalize_for_search(text)
+        law_type = next(
+            (
+                law_type
+                for keyword, law_type in LAW_TYPE_KEYWORDS.items()
+                if ArabicNormalizer.normalize_for_search(keyword) in normalized
+            ),
+            None,
+        )
+        
+        return ArticleReference(
+            article_number=matches[0].article_number,
+            article_text=matches[0].article_text,
+            law_type=law_type,
+        )
+    
     @classmethod
     def extract_chapter_info(cls, text: str) -> Optional[str]:
         """
@@ -0,0 +1,79 @@
+"""
+Request Timing
+Queue/wait accounting and Server-Timing headers
+"""
+
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+import re
+
+# Waits recorded by the current request stage (None = not tracking).
+# asyncio tasks copy the context, so a task that calls track_waits()
+# gets its own list while child tasks of a stage share the stage's list.
+_waits: ContextVar[Optional[List[float]]] = ContextVar("timing_waits", default=None)
+
+
+def track_waits() -> List[float]:
+    """
+    Start collecting waits in the current context.
+
+    Returns:
+        The list waits are appended to (ms)
+    """
+    waits: List[float] = []
+    _waits.set(waits)
+    return waits
+
+
+def record_wait(ms: float) -> None:
+    """
+    Record time spent queued rather than computing - waiting for a
+    model executor thread or for a micro-batch to be dispatched.
+    No-op when the current context is not tracking.
+    """
+    waits = _waits.get()
+    if waits is not None:
+        waits.append(ms)
+
+
+def take_waits() -> float:
+    """Total wait recorded since tracking started or the last take (ms), then reset"""
+    waits = _waits.get()
+    if not waits:
+        return 0.0
+    total = sum(waits)
+    waits.clear()
+    return total
+
+
+def server_timing_header(
+    timings_ms: Dict[str, float],
+    wait_ms: Optional[Dict[str, float]] = None,
+    total_ms: Optional[float] = None,
+) -> str:
+    """
+    Format a Server-Timing header value.
+
+    Each stage becomes `stage;dur=<ms>`; stages that queued also get
+    `stage-wait;dur=<ms>` (their compute time is the difference). Stage
+    names are lowercased with non-alphanumerics as "-" ("Dense Embedder"
+    -> dense-embedder).
+
+    Args:
+        timings_ms: Stage -> wall time
+        wait_ms: Stage -> queue/wait time included in the wall time
+        total_ms: End-to-end time, emitted as `total`
+
+    Returns:
+        Header value, e.g. "encode;dur=35.1, encode-wait;dur=12.4, total;dur=912.0"
+    """
+    wait_ms = wait_ms or {}
+    metrics = []
+    for stage, duration in timings_ms.items():
+        name = re.sub(r"[^a-z0-9]+", "-", stage.lower()).strip("-")
+        metrics.append(f"{name};dur={duration:.1f}")
+        if wait_ms.get(stage):
+            metrics.append(f"{name}-wait;dur={wait_ms[stage]:.1f}")
+    if total_ms is not None:
+        metrics.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(metrics)
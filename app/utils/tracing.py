@@ -0,0 +1,283 @@
+"""
+Tracing
+Optional OpenTelemetry spans for requests, pipeline steps and I/O calls
+"""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+import functools
+import inspect
+import logging
+import os
+import socket
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Span attribute values must be primitives (or lists of them)
+_PRIMITIVES = (str, bool, int, float)
+
+
+def _attribute_value(value: Any) -> Any:
+    """Span-safe attribute value: primitives as-is, enums by value, collections by size"""
+    if isinstance(value, _PRIMITIVES):
+        return getattr(value, "value", value)
+    if hasattr(value, "__len__"):
+        return len(value)
+    return str(value)
+
+
+def _clean(attributes: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {k: _attribute_value(v) for k, v in (attributes or {}).items() if v is not None}
+
+
+class Tracing:
+    """
+    OpenTelemetry tracer provider for this process.
+
+    Spans are batched and exported off the request path:
+
+    - file: one JSON span per line appended to TRACING_FILE_PATH, for
+      offline analysis (several workers/processes can share the file)
+    - otlp: OTLP/HTTP to a local collector at TRACING_OTLP_ENDPOINT
+    - console: stdout
+
+    Incoming `traceparent` headers are honoured (TracingMiddleware), so
+    a client such as an ingestion script can join its own trace.
+    """
+
+    def __init__(self):
+        # Optional dependencies - only needed with TRACING_ENABLED
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+        resource = Resource.create({
+            "service.name": settings.TRACING_SERVICE_NAME,
+            "service.version": settings.APP_VERSION,
+            "service.instance.id": f"{socket.gethostname()}-{os.getpid()}",
+            "deployment.environment": settings.APP_ENV,
+        })
+        self.provider = TracerProvider(
+            resource=resource,
+            sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+        )
+        self.provider.add_span_processor(BatchSpanProcessor(self._build_exporter()))
+        self.tracer = self.provider.get_tracer("law_rag")
+
+        logger.info(f"🔭 Tracing enabled ({settings.TRACING_EXPORTER} exporter)")
+
+    @staticmethod
+    def _build_exporter():
+        exporter = settings.TRACING_EXPORTER
+        if exporter == "otlp":
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+            return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        if exporter == "console":
+            return ConsoleSpanExporter()
+        if exporter != "file":
+            raise ValueError(f"Unknown TRACING_EXPORTER: {exporter}")
+
+        # Each span is written and flushed as one line; O_APPEND keeps
+        # lines from concurrent processes whole
+        out = open(settings.TRACING_FILE_PATH, "a", encoding="utf-8")
+        return ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+
+    def shutdown(self) -> None:
+        """Flush pending spans and stop exporting"""
+        self.provider.shutdown()
+
+
+_tracing: Optional[Tracing] = None
+_tracing_checked = False
+
+
+def get_tracing() -> Optional[Tracing]:
+    """
+    Get tracing singleton.
+
+    Returns:
+        Tracing, or None when TRACING_ENABLED is off or the OpenTelemetry
+        SDK is not installed (spans are then no-ops)
+    """
+    global _tracing, _tracing_checked
+    if not _tracing_checked:
+        _tracing_checked = True
+        if settings.TRACING_ENABLED:
+            try:
+                _tracing = Tracing()
+            except ImportError:
+                logger.warning("⚠️ opentelemetry-sdk not installed - tracing disabled")
+    return _tracing
+
+
+def shutdown_tracing() -> None:
+    """Flush and stop the exporter (called on application shutdown)"""
+    if _tracing is not None:
+        _tracing.shutdown()
+
+
+@contextmanager
+def start_span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    current: bool = True,
+) -> Iterator[Any]:
+    """
+    Run a block inside a span.
+
+    Args:
+        name: Span name
+        attributes: Initial attributes (None values dropped)
+        current: Make it the current span, so spans opened inside the
+            block (and tasks/threads started from it) become children.
+            Use False around async generators, which may be resumed
+            from another context.
+
+    Yields:
+        The span, or None when tracing is off
+    """
+    tracing = get_tracing()
+    if tracing is None:
+        yield None
+        return
+
+    if current:
+        with tracing.tracer.start_as_current_span(name, attributes=_clean(attributes)) as span:
+            yield span
+        return
+
+    span = tracing.tracer.start_span(name, attributes=_clean(attributes))
+    try:
+        yield span
+    except Exception as e:  # Not GeneratorExit - a closed stream is not a failure
+        mark_error(span, e)
+        raise
+    finally:
+        span.end()
+
+
+def set_attributes(span: Any, **attributes: Any) -> None:
+    """Add attributes to a span from start_span (no-op for None)"""
+    if span is not None:
+        span.set_attributes(_clean(attributes))
+
+
+def mark_error(span: Any, error: Any) -> None:
+    """Mark a span failed with an exception or message (no-op for None)"""
+    if span is None:
+        return
+
+    from opentelemetry.trace import Status, StatusCode
+
+    if isinstance(error, BaseException):
+        span.record_exception(error)
+    span.set_status(Status(StatusCode.ERROR, str(error)))
+
+
+def traced(
+    name: str,
+    arg_attributes: Optional[Dict[str, str]] = None,
+    **attributes: Any,
+) -> Callable:
+    """
+    Decorator running a sync or async function inside a span.
+
+    A list result adds `result.count` (e.g. search hits).
+
+    Args:
+        name: Span name
+        arg_attributes: Attribute -> parameter name, recorded from each
+            call's arguments (collections as their size)
+        **attributes: Static attributes
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        def call_attributes(args: tuple, kwargs: dict) -> Dict[str, Any]:
+            values = dict(attributes)
+            if arg_attributes:
+                bound = signature.bind_partial(*args, **kwargs).arguments
+                for attribute, param in arg_attributes.items():
+                    values[attribute] = bound.get(param)
+            return values
+
+        def record_result(span: Any, result: Any) -> None:
+            if span is not None and isinstance(result, list):
+                span.set_attribute("result.count", len(result))
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if get_tracing() is None:
+                    return await func(*args, **kwargs)
+                with start_span(name, call_attributes(args, kwargs)) as span:
+                    result = await func(*args, **kwargs)
+                    record_result(span, result)
+                    return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if get_tracing() is None:
+                return func(*args, **kwargs)
+            with start_span(name, call_attributes(args, kwargs)) as span:
+                result = func(*args, **kwargs)
+                record_result(span, result)
+                return result
+        return wrapper
+
+    return decorator
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a server span per HTTP request.
+
+    Continues the caller's trace when a W3C `traceparent` header is
+    sent. The span is renamed to the matched route template
+    ("POST /api/v1/query") once routing has run.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        tracing = get_tracing()
+        if scope["type"] != "http" or tracing is None:
+            await self.app(scope, receive, send)
+            return
+
+        from opentelemetry import propagate
+        from opentelemetry.trace import SpanKind
+
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        method = scope["method"]
+
+        with tracing.tracer.start_as_current_span(
+            f"{method} {scope['path']}",
+            context=propagate.extract(headers),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        ) as span:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    span.set_attribute("http.response.status_code", status)
+                    if status >= 500:
+                        mark_error(span, f"HTTP {status}")
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None and hasattr(route, "path"):
+                    span.update_name(f"{method} {route.path}")
+                    span.set_attribute("http.route", route.path)
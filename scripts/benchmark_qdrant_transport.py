@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Qdrant Transport Benchmark
+==========================
+Compare REST/JSON and gRPC against a local Qdrant for the two calls that
+dominate our traffic: bulk upsert (ingestion) and hybrid search (queries).
+
+Points carry the real payloads of the bundled law chunks. Vectors are
+random but have the production shape (EMBEDDING_DIMENSION dense floats,
+BM25-sized sparse vectors), which is what the transport has to serialize,
+so no model is loaded.
+
+Each transport gets its own scratch collection, which is deleted afterwards.
+
+Usage:
+    python scripts/benchmark_qdrant_transport.py
+    python scripts/benchmark_qdrant_transport.py --queries 500 --batch-size 256
+    python scripts/benchmark_qdrant_transport.py --mode hybrid_dbsf --max-files 3
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from corpus import load_corpus_chunks
+
+BENCH_COLLECTION = "bench_transport_{}"
+
+
+def percentile(values, pct: float) -> float:
+    """Simple percentile for small samples"""
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def random_dense(rng: random.Random, dim: int):
+    """Random unit vector with the embedding model's shape"""
+    vec = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+    norm = sum(v * v for v in vec) ** 0.5
+    return [v / norm for v in vec]
+
+
+def random_sparse(rng: random.Random, nnz: int):
+    """Random BM25-like sparse vector"""
+    indices = sorted(rng.sample(range(2 ** 31 - 1), nnz))
+    return {"indices": indices, "values": [rng.uniform(0.5, 3.0) for _ in indices]}
+
+
+def build_points(chunks, dim: int, seed: int):
+    """Real chunk payloads with production-shaped synthetic vectors"""
+    from qdrant_client import models
+
+    rng = random.Random(seed)
+    points = []
+    for chunk in chunks:
+        sparse = random_sparse(rng, rng.randint(20, 120))
+        points.append(models.PointStruct(
+            id=chunk.chunk_id,
+            vector={
+                "dense": random_dense(rng, dim),
+                "sparse": models.SparseVector(**sparse),
+            },
+            payload=chunk.to_payload(),
+        ))
+    return points
+
+
+def run_transport(label: str, prefer_grpc: bool, points, queries, args) -> dict:
+    """Upsert all points, then run every query; return timings"""
+    from qdrant_client import QdrantClient
+    from app.db.factory import CollectionFactory
+    from app.db.qdrant_client import QdrantManager
+
+    client = QdrantClient(**QdrantManager.connection_kwargs(prefer_grpc=prefer_grpc))
+    collection_name = BENCH_COLLECTION.format("grpc" if prefer_grpc else "rest")
+
+    if client.collection_exists(collection_name):
+        client.delete_collection(collection_name)
+    CollectionFactory(client).create_golden_collection(collection_name)
+
+    try:
+        # === Bulk upsert ===
+        start = time.perf_counter()
+        for i in range(0, len(points), args.batch_size):
+            client.upsert(
+                collection_name=collection_name,
+                points=points[i:i + args.batch_size],
+                wait=True,
+            )
+        upsert_s = time.perf_counter() - start
+
+        # === Search ===
+        for dense, sparse in queries[:5]:  # Warm up connection and caches
+            client.query_points(
+                collection_name=collection_name,
+                **QdrantManager._query_points_kwargs(args.mode, dense, sparse, args.limit),
+                limit=args.limit,
+                with_payload=True,
+            )
+
+        timings = []
+        for dense, sparse in queries:
+            start = time.perf_counter()
+            client.query_points(
+                collection_name=collection_name,
+                **QdrantManager._query_points_kwargs(args.mode, dense, sparse, args.limit),
+                limit=args.limit,
+                with_payload=True,
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        client.delete_collection(collection_name)
+        client.close()
+
+    print(f"   {label}: upsert {upsert_s:.2f}s ({len(points) / upsert_s:.0f} points/s)  "
+          f"search p50 {percentile(timings, 50):.1f}ms  p95 {percentile(timings, 95):.1f}ms")
+
+    return {"upsert_s": upsert_s, "search_ms": timings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Qdrant REST vs gRPC transport")
+    parser.add_argument("--country", type=str, default="egypt", help="Corpus country")
+    parser.add_argument("--max-files", type=int, default=None, help="Cap number of PDFs")
+    parser.add_argument("--queries", type=int, default=200, help="Number of searches")
+    parser.add_argument("--batch-size", type=int, default=None, help="Points per upsert call")
+    parser.add_argument("--limit", type=int, default=None, help="Results (and prefetch) per search")
+    parser.add_argument(
+        "--mode",
+        type=str,
+        default="hybrid_rrf",
+        choices=["dense", "sparse", "hybrid_rrf", "hybrid_dbsf"],
+        help="Retrieval mode",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    from app.core.config import settings
+
+    args.batch_size = args.batch_size or settings.QDRANT_UPSERT_BATCH_SIZE
+    args.limit = args.limit or settings.HYBRID_PREFETCH
+
+    print("=" * 60)
+    print("Qdrant Transport Benchmark")
+    print("=" * 60)
+    print(f"Qdrant:     {settings.QDRANT_HOST} (REST :{settings.QDRANT_PORT}, gRPC :{settings.QDRANT_GRPC_PORT})")
+    print(f"Vectors:    {settings.EMBEDDING_DIMENSION}D dense + sparse")
+    print(f"Upsert:     {args.batch_size} points / call")
+    print(f"Search:     {args.queries} x {args.mode} (limit={args.limit})")
+    print("=" * 60 + "\n")
+
+    print("Loading corpus chunks...")
+    chunks = load_corpus_chunks(args.country, max_files=args.max_files)
+    print(f"   {len(chunks)} chunks\n")
+
+    points = build_points(chunks, settings.EMBEDDING_DIMENSION, args.seed)
+    rng = random.Random(args.seed + 1)
+    queries = [
+        (random_dense(rng, settings.EMBEDDING_DIMENSION), random_sparse(rng, rng.randint(3, 12)))
+        for _ in range(args.queries)
+    ]
+
+    print("Results")
+    rest = run_transport("REST", False, points, queries, args)
+    grpc = run_transport("gRPC", True, points, queries, args)
+
+    print("\nSpeedup (REST / gRPC)")
+    print(f"   Upsert:       {rest['upsert_s'] / grpc['upsert_s']:.2f}x")
+    print(f"   Search p50:   {statistics.median(rest['search_ms']) / statistics.median(grpc['search_ms']):.2f}x")
+    print(f"   Search mean:  {statistics.mean(rest['search_ms']) / statistics.mean(grpc['search_ms']):.2f}x")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Reranker Benchmark
+==================
+Measure how much reranker compute goes on padding, before (all candidates
+padded to the longest pair) and after length-bucketed sub-batching, using
+real article chunks from the bundled laws. Optionally verify that
+query-prefix KV-cache scoring matches the full-sequence scores.
+
+Usage:
+    python scripts/benchmark_reranker.py                 # Padding ratio only (tokenizer)
+    python scripts/benchmark_reranker.py --time          # Also time scoring on this device
+    python scripts/benchmark_reranker.py --prefix-cache  # Compare query-prefix KV-cache scoring
+    python scripts/benchmark_reranker.py --queries 50 --candidates 25 --budget 4096
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from corpus import load_corpus_chunks
+
+SAMPLE_QUERIES = [
+    "ما هي عقوبة السرقة؟",
+    "ما هي مدة التقادم في الدعوى المدنية؟",
+    "متى يكون العقد باطلا؟",
+    "ما هي شروط صحة حكم التحكيم؟",
+    "ما هي التزامات التاجر بمسك الدفاتر التجارية؟",
+    "ما عقوبة خيانة الأمانة؟",
+    "كيف يتم فسخ العقد؟",
+    "ما هي حقوق المستأجر؟",
+]
+
+
+def build_candidate_sets(chunks, num_queries: int, num_candidates: int, seed: int):
+    """Pair sample queries with random candidate sets drawn from the corpus"""
+    rng = random.Random(seed)
+    contents = [c.content for c in chunks]
+    return [
+        (SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)], rng.sample(contents, min(num_candidates, len(contents))))
+        for i in range(num_queries)
+    ]
+
+
+def percentile(values, pct: float) -> float:
+    """Simple percentile for small samples"""
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reranker padding and latency")
+    parser.add_argument("--country", type=str, default="egypt", help="Corpus country")
+    parser.add_argument("--queries", type=int, default=40, help="Number of simulated queries")
+    parser.add_argument("--candidates", type=int, default=25, help="Candidates per query")
+    parser.add_argument("--budget", type=int, default=None, help="Sub-batch token budget")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--time", action="store_true", help="Also time scoring (loads the model)")
+    parser.add_argument(
+        "--prefix-cache",
+        action="store_true",
+        help="Compare prefix KV-cache scores and latency against full sequences (loads the model)",
+    )
+    args = parser.parse_args()
+
+    from app.core.config import settings
+    from app.services.reranker_service import RerankerService
+
+    budget = args.budget or settings.RERANKER_SUBBATCH_TOKEN_BUDGET
+
+    print("=" * 60)
+    print("Reranker Padding Benchmark")
+    print("=" * 60)
+    print(f"Model:      {settings.RERANKER_MODEL}")
+    print(f"Max length: {settings.RERANKER_MAX_LENGTH}")
+    print(f"Budget:     {budget} padded tokens / sub-batch")
+    print("=" * 60 + "\n")
+
+    print("Loading corpus chunks...")
+    chunks = load_corpus_chunks(args.country)
+    print(f"   {len(chunks)} chunks\n")
+
+    candidate_sets = build_candidate_sets(chunks, args.queries, args.candidates, args.seed)
+
+    if args.time or args.prefix_cache:
+        reranker = RerankerService()
+        tokenizer = reranker.tokenizer
+    else:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(settings.RERANKER_MODEL, trust_remote_code=True)
+
+    # === Padding ratio ===
+    before, after, sub_batch_counts = [], [], []
+    for query, docs in candidate_sets:
+        encoded = tokenizer(
+            [[query, d] for d in docs],
+            padding=False,
+            truncation=True,
+            max_length=settings.RERANKER_MAX_LENGTH,
+        )
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+
+        single = [list(range(len(lengths)))]
+        bucketed = RerankerService.plan_sub_batches(lengths, budget)
+
+        before.append(RerankerService.padding_ratio(lengths, single))
+        after.append(RerankerService.padding_ratio(lengths, bucketed))
+        sub_batch_counts.append(len(bucketed))
+
+    print("1. Padding ratio (padding tokens / computed tokens)")
+    print(f"   Before (single batch): mean {statistics.mean(before):.1%}  max {max(before):.1%}")
+    print(f"   After  (bucketed):     mean {statistics.mean(after):.1%}  max {max(after):.1%}")
+    print(f"   Sub-batches per query: mean {statistics.mean(sub_batch_counts):.1f}")
+
+    # === Latency ===
+    if args.time:
+        print("\n2. Scoring latency per query")
+        unbounded = 10 ** 9  # One sub-batch = legacy single padded batch
+
+        for label, token_budget in (("Before (single batch)", unbounded), ("After  (bucketed)", budget)):
+            warmup_query, warmup_docs = candidate_sets[0]
+            reranker.score_pairs([(warmup_query, d) for d in warmup_docs], token_budget)
+
+            timings = []
+            for query, docs in candidate_sets:
+                start = time.perf_counter()
+                reranker.score_pairs([(query, d) for d in docs], token_budget)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(
+                f"   {label}: p50 {percentile(timings, 50):.0f}ms  "
+                f"p95 {percentile(timings, 95):.0f}ms  (device={reranker.device})"
+            )
+
+    # === Prefix KV cache ===
+    if args.prefix_cache:
+        print("\n3. Query-prefix KV cache vs full sequences")
+        max_diff, rank_agreement = 0.0, 0
+        timings = {False: [], True: []}
+
+        for query, docs in candidate_sets:
+            pairs = [(query, d) for d in docs]
+            results = {}
+            for use_cache in (False, True):
+                start = time.perf_counter()
+                results[use_cache] = reranker.score_pairs(pairs, budget, prefix_cache=use_cache)
+                timings[use_cache].append((time.perf_counter() - start) * 1000)
+
+            max_diff = max(max_diff, max(abs(a - b) for a, b in zip(results[False], results[True])))
+            top = lambda scores: sorted(range(len(scores)), key=lambda i: -scores[i])[:settings.RERANK_TOP_K]
+            rank_agreement += top(results[False]) == top(results[True])
+
+        print(f"   Max |score diff|:   {max_diff:.5f}")
+        print(f"   Same top-{settings.RERANK_TOP_K} order:  {rank_agreement}/{len(candidate_sets)} queries")
+        print(f"   Full sequences:     p50 {percentile(timings[False], 50):.0f}ms")
+        print(f"   Prefix KV cache:    p50 {percentile(timings[True], 50):.0f}ms")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    main()
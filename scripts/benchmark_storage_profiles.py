@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Storage Profile Benchmark
+=========================
+Measure the memory / latency / recall trade-off of each dense vector
+storage profile (float32, float16, int8 scalar quantization, binary
+quantization) on the bundled laws, against a local Qdrant.
+
+The bundled chunks and sample queries are embedded once with the
+production model. Each profile then gets a scratch collection built with
+the Golden Schema and the configured HNSW m / ef_construct. Dense search
+runs with the profile's search params (oversampling + rescoring).
+
+With --matryoshka, extra rows search a truncated first-stage vector
+(MATRYOSHKA_OVERSAMPLING x k candidates) and rescore on the full vector.
+
+Recall@k is measured against exact (brute-force) float32 search.
+Vector RAM is estimated from the stored representation. For the quantized
+profiles and the Matryoshka rows, the full-size vectors stay on disk.
+
+Usage:
+    python scripts/benchmark_storage_profiles.py
+    python scripts/benchmark_storage_profiles.py --max-files 3 --queries 100
+    python scripts/benchmark_storage_profiles.py --vectors-cache /tmp/egypt_vectors.npz
+    python scripts/benchmark_storage_profiles.py --profiles float32 int8 --no-rescore
+    python scripts/benchmark_storage_profiles.py --profiles float32 --matryoshka 256 512
+"""
+
+import argparse
+import os
+import random
+import time
+
+from corpus import load_corpus_chunks
+
+SAMPLE_QUERIES = [
+    "ما هي عقوبة السرقة؟",
+    "ما هي مدة التقادم في الدعوى المدنية؟",
+    "متى يكون العقد باطلا؟",
+    "ما هي شروط صحة حكم التحكيم؟",
+    "ما هي التزامات التاجر بمسك الدفاتر التجارية؟",
+    "ما عقوبة خيانة الأمانة؟",
+    "كيف يتم فسخ العقد؟",
+    "ما هي حقوق المستأجر؟",
+]
+
+BENCH_COLLECTION = "bench_profile_{}"
+
+
+def percentile(values, pct: float) -> float:
+    """Simple percentile for small samples"""
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def build_queries(chunks, num_queries: int, seed: int):
+    """Sample questions plus opening phrases of random articles"""
+    rng = random.Random(seed)
+    queries = list(SAMPLE_QUERIES)
+    while len(queries) < num_queries:
+        words = rng.choice(chunks).content.split()
+        if len(words) >= 8:
+            queries.append(" ".join(words[:12]))
+    return queries[:num_queries]
+
+
+def embed(chunks, queries, cache_path):
+    """Embed chunk contents and queries (optionally cached to .npz)"""
+    import numpy as np
+
+    if cache_path and os.path.exists(cache_path):
+        data = np.load(cache_path)
+        if len(data["docs"]) == len(chunks) and len(data["queries"]) == len(queries):
+            print(f"   Loaded vectors from {cache_path}")
+            return data["docs"].tolist(), data["queries"].tolist()
+
+    from app.services.embedding_service import EmbeddingService
+
+    service = EmbeddingService()
+    docs = service.embed_batch([c.content for c in chunks])
+    query_vectors = service.embed_queries(queries)
+
+    if cache_path:
+        np.savez(cache_path, docs=np.asarray(docs, dtype=np.float32), queries=np.asarray(query_vectors, dtype=np.float32))
+    return docs, query_vectors
+
+
+def vector_ram_mb(profile, count: int, dim: int, m: int) -> float:
+    """Estimated RAM for dense vectors + HNSW links (originals on disk when quantized)"""
+    bytes_per_vector = {"float32": dim * 4, "float16": dim * 2, "int8": dim, "binary": dim / 8}[profile]
+    hnsw_links = m * 2 * 4  # Layer-0 links, 4 bytes each
+    return count * (bytes_per_vector + hnsw_links) / (1024 * 1024)
+
+
+def wait_indexed(client, collection_name: str, count: int, timeout_s: float = 600.0) -> None:
+    """Wait until the optimizer has built the HNSW index for all points"""
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        info = client.get_collection(collection_name)
+        if info.status.value == "green" and (info.indexed_vectors_count or 0) >= count:
+            return
+        time.sleep(1)
+    print(f"   ⚠️ {collection_name}: index not complete after {timeout_s:.0f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dense vector storage profiles")
+    parser.add_argument("--country", type=str, default="egypt", help="Corpus country")
+    parser.add_argument("--max-files", type=int, default=None, help="Cap number of PDFs")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--top-k", type=int, default=None, help="Recall@k (default HYBRID_PREFETCH)")
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=["float32", "float16", "int8", "binary"],
+        choices=["float32", "float16", "int8", "binary"],
+        help="Profiles to compare (float32 always runs first, as the baseline)",
+    )
+    parser.add_argument("--no-rescore", action="store_true", help="Disable rescoring for quantized profiles")
+    parser.add_argument(
+        "--matryoshka",
+        type=int,
+        nargs="*",
+        default=[],
+        help="Also run Matryoshka first-stage dimensions (e.g. 256 512), rescored on the full vector",
+    )
+    parser.add_argument(
+        "--matryoshka-profile",
+        type=str,
+        default="float32",
+        choices=["float32", "float16", "int8", "binary"],
+        help="Storage profile for the Matryoshka first-stage vector",
+    )
+    parser.add_argument("--vectors-cache", type=str, default=None, help="Cache embeddings in this .npz file")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    from qdrant_client import QdrantClient, models
+    from app.core.config import StorageProfile, settings
+    from app.db.factory import CollectionFactory
+    from app.db.qdrant_client import QdrantManager
+
+    top_k = args.top_k or settings.HYBRID_PREFETCH
+    profiles = ["float32"] + [p for p in args.profiles if p != "float32"]
+    if args.no_rescore:
+        settings.QUANTIZATION_RESCORE = False
+
+    print("=" * 60)
+    print("Storage Profile Benchmark")
+    print("=" * 60)
+    print(f"Model:      {settings.EMBEDDING_MODEL} ({settings.EMBEDDING_DIMENSION}D)")
+    print(f"HNSW:       m={settings.HNSW_M} ef_construct={settings.HNSW_EF_CONSTRUCT}")
+    print(f"Rescore:    {settings.QUANTIZATION_RESCORE}")
+    if args.matryoshka:
+        print(f"Matryoshka: {args.matryoshka} ({args.matryoshka_profile}, x{settings.MATRYOSHKA_OVERSAMPLING} candidates)")
+    print(f"Recall@k:   k={top_k} vs exact float32")
+    print("=" * 60 + "\n")
+
+    print("Loading corpus chunks...")
+    chunks = load_corpus_chunks(args.country, max_files=args.max_files)
+    queries = build_queries(chunks, args.queries, args.seed)
+    print(f"   {len(chunks)} chunks, {len(queries)} queries\n")
+
+    print("Embedding...")
+    doc_vectors, query_vectors = embed(chunks, queries, args.vectors_cache)
+    print()
+
+    client = QdrantClient(**QdrantManager.connection_kwargs())
+    factory = CollectionFactory(client)
+    ground_truth = None
+    rows = []
+
+    # (label, storage profile, Matryoshka first-stage dimension)
+    variants = [(profile, profile, 0) for profile in profiles]
+    for dim in args.matryoshka:
+        variants.append((f"mrl-{dim}", args.matryoshka_profile, dim))
+
+    for label, profile, mrl_dim in variants:
+        settings.MATRYOSHKA_DIMENSION = mrl_dim
+        collection_name = BENCH_COLLECTION.format(label.replace("-", "_"))
+        if client.collection_exists(collection_name):
+            client.delete_collection(collection_name)
+
+        # Golden Schema with this profile; index from the first point
+        factory.create_golden_collection(collection_name, StorageProfile(profile))
+        client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=1),
+        )
+
+        try:
+            for i in range(0, len(chunks), settings.QDRANT_UPSERT_BATCH_SIZE):
+                client.upsert(
+                    collection_name=collection_name,
+                    points=[
+                        models.PointStruct(id=chunk.chunk_id, vector=QdrantManager.dense_vectors(vector, mrl_dim), payload={})
+                        for chunk, vector in zip(
+                            chunks[i:i + settings.QDRANT_UPSERT_BATCH_SIZE],
+                            doc_vectors[i:i + settings.QDRANT_UPSERT_BATCH_SIZE],
+                        )
+                    ],
+                    wait=True,
+                )
+            wait_indexed(client, collection_name, len(chunks))
+
+            if ground_truth is None:
+                # Exact search on the float32 collection
+                ground_truth = [
+                    {p.id for p in client.query_points(
+                        collection_name=collection_name,
+                        query=vector,
+                        using="dense",
+                        search_params=models.SearchParams(
+                            exact=True,
+                            quantization=models.QuantizationSearchParams(ignore=True),
+                        ),
+                        limit=top_k,
+                    ).points}
+                    for vector in query_vectors
+                ]
+
+            # Same dense query the API sends (nested prefetch for Matryoshka)
+            search_params = CollectionFactory.get_search_params(StorageProfile(profile))
+            timings, recalls = [], []
+            for vector, expected in zip(query_vectors, ground_truth):
+                start = time.perf_counter()
+                points = client.query_points(
+                    collection_name=collection_name,
+                    **QdrantManager._query_points_kwargs("dense", vector, None, top_k, search_params, mrl_dim),
+                    limit=top_k,
+                ).points
+                timings.append((time.perf_counter() - start) * 1000)
+                recalls.append(len({p.id for p in points} & expected) / max(1, len(expected)))
+        finally:
+            client.delete_collection(collection_name)
+
+        rows.append((
+            label,
+            vector_ram_mb(profile, len(chunks), mrl_dim or settings.EMBEDDING_DIMENSION, settings.HNSW_M),
+            percentile(timings, 50),
+            percentile(timings, 95),
+            sum(recalls) / len(recalls),
+        ))
+
+    print(f"{'Profile':<10}{'RAM (MB)':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'Recall@' + str(top_k):>12}")
+    for label, ram, p50, p95, recall in rows:
+        print(f"{label:<10}{ram:>10.1f}{p50:>10.1f}{p95:>10.1f}{recall:>12.3f}")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Corpus Loader for Benchmarks
+============================
+Runs ingestion steps 1-4 (load, extract, split, enrich) in-process over the
+bundled law PDFs, so benchmarks can work on real article chunks without a
+running API, Qdrant or any model.
+
+Usage (from another script):
+    from corpus import load_corpus_chunks
+    chunks = load_corpus_chunks("egypt")
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Make `app` importable when scripts are run as `python scripts/<name>.py`
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+# Settings require an API key even though benchmarks never call Gemini
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-unused")
+
+from ingest_all import COUNTRY_FOLDERS, detect_law_type  # noqa: E402
+
+
+def find_laws_dir(country: str) -> Path:
+    """Locate the bundled PDF folder for a country"""
+    folder = COUNTRY_FOLDERS[country]
+    for base in (REPO_ROOT / "law_material", REPO_ROOT / "app" / "law_material"):
+        if (base / folder).exists():
+            return base / folder
+    raise FileNotFoundError(f"No law_material/{folder} directory found")
+
+
+def load_corpus_chunks(country: str = "egypt", max_files: Optional[int] = None) -> List:
+    """
+    Extract DocumentChunks from the bundled PDFs of a country.
+
+    Args:
+        country: Country code (see COUNTRY_FOLDERS)
+        max_files: Optional cap on number of PDFs to process
+
+    Returns:
+        List of DocumentChunk (without vectors)
+    """
+    from app.pipelines.base import Pipeline
+    from app.pipelines.ingestion.models import ArticleMetadata
+    from app.pipelines.ingestion.steps import (
+        PDFLoaderStep,
+        TextExtractorStep,
+        ArticleSplitterStep,
+        MetadataEnricherStep,
+    )
+
+    pipeline = Pipeline("Benchmark Corpus")
+    pipeline.add_step(PDFLoaderStep())
+    pipeline.add_step(TextExtractorStep())
+    pipeline.add_step(ArticleSplitterStep())
+    pipeline.add_step(MetadataEnricherStep())
+
+    pdf_files = sorted(find_laws_dir(country).glob("*.pdf"))[:max_files]
+    chunks = []
+
+    for pdf_path in pdf_files:
+        context = {
+            "metadata": ArticleMetadata(
+                country=country,
+                law_type=detect_law_type(pdf_path.stem),
+                law_name=pdf_path.stem,
+                source_file=pdf_path.name,
+            ),
+        }
+        result = pipeline.run(pdf_path.read_bytes(), context)
+        if result.success:
+            chunks.extend(result.data)
+        else:
+            print(f"⚠️ Skipped {pdf_path.name}: {result.errors}")
+
+    return chunks
@@ -29,6 +29,9 @@ COUNTRY_FOLDERS = {
 }
 
 # === Law Type Detection (from filename) ===
+# Kept here so this HTTP client needs nothing from `app`. The question-side
+# map (app/utils/patterns.py) matches "قانون العمل" instead of "عمل", which
+# is part of too many words in a question but is safe in a law file name.
 LAW_TYPE_KEYWORDS = {
     "جنائي": "criminal",
     "عقوبات": "criminal",
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Content Dictionary Training
+===========================
+Train a zstd dictionary on the bundled law chunks and measure what
+compressed payload content saves on storage and transfer.
+
+The dictionary is trained on a random 80% of the chunks. The sizes are
+measured on the held-out 20%, so the numbers reflect laws the dictionary
+has not seen:
+
+- raw UTF-8 content, zstd without a dictionary, zstd with the dictionary
+- base64 frames (how content_z is stored in the JSON payload)
+- full to_payload() JSON: uncompressed, compressed without and with the
+  preview (base64 adds a third to each frame)
+- mean decompression time per chunk
+
+Point CONTENT_ZSTD_DICT_PATH at the written file and set
+CONTENT_COMPRESSION=zstd to use it for new ingestions.
+
+Usage:
+    python scripts/train_content_dictionary.py
+    python scripts/train_content_dictionary.py --output data/egypt_content.zdict
+    python scripts/train_content_dictionary.py --dict-size 65536 --level 19
+"""
+
+import argparse
+import base64
+import json
+import random
+import time
+
+from corpus import load_corpus_chunks
+
+
+def payload_bytes(payload: dict) -> int:
+    """Size of a payload as sent over REST"""
+    return len(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a zstd dictionary for chunk content")
+    parser.add_argument("--country", type=str, default="egypt", help="Corpus country")
+    parser.add_argument("--max-files", type=int, default=None, help="Cap number of PDFs")
+    parser.add_argument("--output", type=str, default="data/content.zdict", help="Dictionary file to write")
+    parser.add_argument("--dict-size", type=int, default=112640, help="Dictionary size in bytes")
+    parser.add_argument("--level", type=int, default=None, help="Compression level (default CONTENT_ZSTD_LEVEL)")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of chunks held out for measurement")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    import zstandard as zstd
+    from app.core.config import settings
+
+    level = args.level or settings.CONTENT_ZSTD_LEVEL
+
+    print("=" * 60)
+    print("Content Dictionary Training")
+    print("=" * 60)
+    print(f"Dictionary: {args.dict_size} bytes -> {args.output}")
+    print(f"Level:      {level}")
+    print(f"Preview:    {settings.CONTENT_PREVIEW_CHARS} chars")
+    print("=" * 60 + "\n")
+
+    print("Loading corpus chunks...")
+    chunks = load_corpus_chunks(args.country, max_files=args.max_files)
+    random.Random(args.seed).shuffle(chunks)
+    split = int(len(chunks) * (1 - args.holdout))
+    train, test = chunks[:split], chunks[split:]
+    print(f"   {len(train)} training chunks, {len(test)} held out\n")
+
+    print("Training dictionary...")
+    dictionary = zstd.train_dictionary(args.dict_size, [c.content.encode("utf-8") for c in train], level=level)
+    with open(args.output, "wb") as f:
+        f.write(dictionary.as_bytes())
+    print(f"   id={dictionary.dict_id()} ({len(dictionary.as_bytes())} bytes)\n")
+
+    plain = zstd.ZstdCompressor(level=level)
+    trained = zstd.ZstdCompressor(level=level, dict_data=dictionary)
+    decompressor = zstd.ZstdDecompressor(dict_data=dictionary)
+
+    raw = no_dict = with_dict = encoded = 0
+    json_before = json_no_preview = json_after = 0
+    decompress_s = 0.0
+
+    settings.CONTENT_COMPRESSION = "none"
+    for chunk in test:
+        data = chunk.content.encode("utf-8")
+        frame = trained.compress(data)
+
+        raw += len(data)
+        no_dict += len(plain.compress(data))
+        with_dict += len(frame)
+        encoded += len(base64.b64encode(frame))
+
+        payload = chunk.to_payload()
+        json_before += payload_bytes(payload)
+        del payload["content"]
+        payload["content_z"] = base64.b64encode(frame).decode("ascii")
+        json_no_preview += payload_bytes(payload)
+        payload["preview"] = chunk.content[:settings.CONTENT_PREVIEW_CHARS]
+        json_after += payload_bytes(payload)
+
+        start = time.perf_counter()
+        assert decompressor.decompress(frame) == data
+        decompress_s += time.perf_counter() - start
+
+    def row(label: str, size: int, base: int) -> None:
+        print(f"   {label:<24}{size / 1024:>10.1f} KB{base / max(1, size):>8.2f}x")
+
+    print("Content (held-out chunks)")
+    row("UTF-8", raw, raw)
+    row("zstd", no_dict, raw)
+    row("zstd + dictionary", with_dict, raw)
+    row("base64 (stored)", encoded, raw)
+
+    print("\nPayload JSON")
+    row("uncompressed", json_before, json_before)
+    row("content_z", json_no_preview, json_before)
+    row("content_z + preview", json_after, json_before)
+
+    print(f"\nDecompression: {decompress_s / max(1, len(test)) * 1e6:.1f} µs / chunk")
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -109,6 +109,52 @@ async function apiRequest(endpoint, options = {}) {
     }
 }
 
+/**
+ * POST a JSON body and consume a Server-Sent Events response.
+ * Calls onEvent(eventName, data) for every event as it arrives.
+ */
+async function streamRequest(endpoint, body, onEvent) {
+    const response = await fetch(endpoint, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    });
+
+    if (!response.ok) {
+        const data = await response.json().catch(() => ({}));
+        throw new Error(data.detail || `HTTP ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const raw = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            const dataLines = [];
+            for (const line of raw.split('\n')) {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+            }
+
+            if (dataLines.length > 0) {
+                onEvent(event, JSON.parse(dataLines.join('\n')));
+            }
+        }
+    }
+}
+
 // ========================================
 // Toast Notifications
 // ========================================
@@ -415,25 +461,41 @@ async function handleChat(e) {
     // Show typing indicator
     const typingId = showTyping();
 
-    try {
-        const response = await apiRequest(`${API_BASE}/query`, {
-            method: 'POST',
-            body: JSON.stringify({
-                question,
-                country,
-                session_id: currentSessionId,
-                top_k: 5
-            })
-        });
+    let messageDiv = null;
+    let answer = '';
+    let sources = [];
 
-        removeTyping(typingId);
+    try {
+        // Sources arrive as soon as reranking is done, then the answer streams in
+        await streamRequest(`${API_BASE}/query/stream`, {
+            question,
+            country,
+            session_id: currentSessionId,
+            top_k: 5
+        }, (event, data) => {
+            if (event === 'sources') {
+                sources = data.sources;
+            } else if (event === 'token') {
+                answer += data.text;
+            } else if (event === 'metadata') {
+                console.log('Query metadata:', data);
+                return;
+            } else if (event === 'error') {
+                throw new Error(data.detail);
+            } else {
+                return;
+            }
 
-        // Add assistant message with sources
-        addChatMessage(response.answer, 'assistant', response.sources);
+            if (!messageDiv) {
+                removeTyping(typingId);
+                messageDiv = addChatMessage('', 'assistant');
+            }
+            renderChatMessage(messageDiv, answer, sources);
+        });
 
-        // Show metadata
-        if (response.metadata) {
-            console.log('Query metadata:', response.metadata);
+        if (!messageDiv) {
+            removeTyping(typingId);
+            addChatMessage(answer, 'assistant', sources);
         }
 
     } catch (error) {
@@ -452,6 +514,13 @@ function addChatMessage(content, role, sources = null) {
         div.setAttribute('dir', 'rtl');
     }
 
+    messages.appendChild(div);
+    renderChatMessage(div, content, sources);
+    return div;
+}
+
+function renderChatMessage(div, content, sources = null) {
+    const messages = document.getElementById('chat-messages');
     let html = content;
 
     if (sources && sources.length > 0) {
@@ -470,7 +539,6 @@ function addChatMessage(content, role, sources = null) {
     }
 
     div.innerHTML = html;
-    messages.appendChild(div);
     messages.scrollTop = messages.scrollHeight;
 }
 
@@ -646,6 +714,7 @@ let chunksOffset = 0;
 const chunksLimit = 20;
 let chunksTotal = 0;
 let currentChunks = [];
+let currentChunksCountry = null;
 
 async function loadChunks(offset = 0) {
     const country = document.getElementById('chunks-country').value;
@@ -660,6 +729,7 @@ async function loadChunks(offset = 0) {
         chunksOffset = offset;
         chunksTotal = response.total;
         currentChunks = response.chunks;
+        currentChunksCountry = country;
 
         if (!response.chunks || response.chunks.length === 0) {
             container.innerHTML = `
@@ -688,7 +758,7 @@ async function loadChunks(offset = 0) {
                             ${chunk.article_number ? `مادة ${chunk.article_number}` : ''}
                             ${chunk.page_number ? `| Page ${chunk.page_number}` : ''}
                         </div>
-                        <div class="chunk-preview" dir="rtl">${escapeHtml(chunk.content)}</div>
+                        <div class="chunk-preview" dir="rtl">${escapeHtml(chunk.preview)}</div>
                         <div class="chunk-footer">
                             <span class="chunk-id">ID: ${chunk.id.substring(0, 8)}...</span>
                             <i class="fas fa-expand-alt"></i>
@@ -725,7 +795,7 @@ async function loadChunks(offset = 0) {
     }
 }
 
-function viewChunk(index) {
+async function viewChunk(index) {
     const chunk = currentChunks[index];
     if (!chunk) return;
 
@@ -755,12 +825,22 @@ function viewChunk(index) {
             <hr>
             <div class="detail-content">
                 <strong>Full Content:</strong>
-                <div class="content-box">${escapeHtml(chunk.full_content)}</div>
+                <div class="content-box" id="chunk-content"><div class="spinner"></div></div>
             </div>
         </div>
     `;
 
     modal.style.display = 'flex';
+
+    // Listings carry previews only - fetch the full content
+    const content = document.getElementById('chunk-content');
+    try {
+        const response = await apiRequest(`${API_BASE}/laws/${currentChunksCountry}/chunks/${chunk.id}`);
+        content.innerHTML = escapeHtml(response.chunk.content);
+    } catch (error) {
+        content.innerHTML = escapeHtml(chunk.preview);
+        showToast('Failed to load full content', 'error');
+    }
 }
 
 function closeChunkModal() {
@@ -0,0 +1,8 @@
+"""
+Test configuration
+Settings require a Gemini key; tests never call the API.
+"""
+
+import os
+
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
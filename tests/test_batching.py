@@ -0,0 +1,94 @@
+"""
+Tests for dynamic micro-batching
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from app.utils.batching import MicroBatcher
+
+
+def _recording_batcher(max_batch_cost: int, window_ms: float, cost_fn=None):
+    batches: List[List[int]] = []
+
+    def process(items: List[int]) -> List[int]:
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher("test", process, max_batch_cost=max_batch_cost, window_ms=window_ms, cost_fn=cost_fn)
+    return batcher, batches
+
+
+def test_concurrent_submits_share_one_batch():
+    batcher, batches = _recording_batcher(max_batch_cost=16, window_ms=50)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(main()) == [0, 10, 20, 30, 40]
+    assert batches == [[0, 1, 2, 3, 4]]
+    assert batcher.get_stats()["max_batch_size"] == 5
+
+
+def test_window_closes_batch():
+    batcher, batches = _recording_batcher(max_batch_cost=16, window_ms=10)
+
+    async def main():
+        first = asyncio.ensure_future(batcher.submit(1))
+        await asyncio.sleep(0.1)  # Well past the window
+        second = await batcher.submit(2)
+        return await first, second
+
+    assert asyncio.run(main()) == (10, 20)
+    assert batches == [[1], [2]]
+
+
+def test_cost_cap_splits_batches():
+    batcher, batches = _recording_batcher(max_batch_cost=3, window_ms=50)
+
+    async def main():
+        return await batcher.submit_many(list(range(7)))
+
+    assert asyncio.run(main()) == [0, 10, 20, 30, 40, 50, 60]
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_item_over_cap_is_carried_to_next_batch():
+    # Cost = item value: 2 + 2 fit in 5, the 3 does not and leads the next batch
+    batcher, batches = _recording_batcher(max_batch_cost=5, window_ms=50, cost_fn=lambda item: item)
+
+    async def main():
+        return await batcher.submit_many([2, 2, 3, 1])
+
+    assert asyncio.run(main()) == [20, 20, 30, 10]
+    assert batches == [[2, 2], [3, 1]]
+
+
+def test_batch_failure_reaches_every_caller():
+    def process(items):
+        raise RuntimeError("model crashed")
+
+    batcher = MicroBatcher("test", process, max_batch_cost=8, window_ms=20)
+
+    async def main():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_worker_restarts_on_new_event_loop():
+    batcher, _ = _recording_batcher(max_batch_cost=4, window_ms=1)
+
+    assert asyncio.run(batcher.submit(1)) == 10
+    assert asyncio.run(batcher.submit(2)) == 20
+
+
+@pytest.mark.parametrize("window_ms", [0, 5])
+def test_single_item_is_not_held_past_window(window_ms):
+    batcher, batches = _recording_batcher(max_batch_cost=16, window_ms=window_ms)
+
+    assert asyncio.run(asyncio.wait_for(batcher.submit(3), timeout=1.0)) == 30
+    assert batches == [[3]]
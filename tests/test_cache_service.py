@@ -0,0 +1,229 @@
+"""
+Tests for cache keys and lookups
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.cache_service import (
+    AnswerCache,
+    QueryVectorCache,
+    RetrievalCache,
+    SemanticCache,
+    decode_dense,
+    decode_sparse,
+    encode_dense,
+    encode_sparse,
+)
+
+
+def _context(**overrides) -> dict:
+    context = {
+        "normalized_query": "ما عقوبة السرقة",
+        "collection_name": "laws_egypt",
+        "collection_version": 3,
+        "law_types": ["criminal"],
+        "top_k": 5,
+        "retrieval_mode": "hybrid_rrf",
+        "prefetch": 25,
+    }
+    context.update(overrides)
+    return context
+
+
+def test_semantic_scope_depends_on_search_effort():
+    base = SemanticCache.make_scope(_context())
+
+    assert SemanticCache.make_scope(_context()) == base
+    assert SemanticCache.make_scope(_context(search_profile="exact")) != base
+    assert SemanticCache.make_scope(_context(hnsw_ef=512)) != base
+    assert SemanticCache.make_scope(_context(exact=True)) != base
+    assert SemanticCache.make_scope(_context(rescore=False)) != base
+
+
+def test_retrieval_key_depends_on_search_effort():
+    cache = RetrievalCache()
+    base = cache.key_for(_context())
+
+    assert cache.key_for(_context(hnsw_ef=512)) != base
+    assert cache.key_for(_context(exact=True)) != base
+
+
+# === Query vector cache ===
+
+def test_query_vector_key_normalizes_whitespace():
+    assert QueryVectorCache.make_key("model", " ما  عقوبة\nالسرقة ") == QueryVectorCache.make_key("model", "ما عقوبة السرقة")
+
+
+def test_query_vector_key_depends_on_model():
+    assert QueryVectorCache.make_key("dense-model", "سؤال") != QueryVectorCache.make_key("sparse-model", "سؤال")
+
+
+def test_vector_encoding_round_trip():
+    dense = [0.25, -1.5, 3.0]
+    sparse = {"indices": [3, 17, 4096], "values": [0.5, 1.25, 2.0]}
+
+    assert decode_dense(encode_dense(dense)) == pytest.approx(dense)
+    assert decode_sparse(encode_sparse(sparse)) == sparse
+
+
+# === Retrieval cache ===
+
+def test_retrieval_key_needs_collection_version():
+    assert RetrievalCache().key_for(_context(collection_version=None)) is None
+
+
+@pytest.mark.parametrize(
+    "override",
+    [
+        {"collection_version": 4},
+        {"collection_name": "laws_jordan"},
+        {"law_types": ["civil"]},
+        {"top_k": 10},
+        {"retrieval_mode": "dense"},
+        {"prefetch": 50},
+        {"normalized_query": "ما عقوبة الرشوة"},
+    ],
+)
+def test_retrieval_key_changes_with_inputs(override):
+    cache = RetrievalCache()
+    assert cache.key_for(_context(**override)) != cache.key_for(_context())
+
+
+def test_retrieval_key_ignores_law_type_order():
+    cache = RetrievalCache()
+    assert (
+        cache.key_for(_context(law_types=["civil", "criminal"]))
+        == cache.key_for(_context(law_types=["criminal", "civil"]))
+    )
+
+
+# === Answer cache ===
+
+def test_answer_key_depends_on_evidence_order():
+    assert AnswerCache.make_key("سؤال", ["a", "b"], "prompt") != AnswerCache.make_key("سؤال", ["b", "a"], "prompt")
+
+
+def test_answer_key_depends_on_system_prompt():
+    assert AnswerCache.make_key("سؤال", ["a"], "prompt v1") != AnswerCache.make_key("سؤال", ["a"], "prompt v2")
+
+
+def test_answer_key_normalizes_question_whitespace():
+    assert AnswerCache.make_key(" سؤال  قانوني ", ["a"], "p") == AnswerCache.make_key("سؤال قانوني", ["a"], "p")
+
+
+# === Semantic cache ===
+
+def test_semantic_scope_needs_collection_version():
+    assert SemanticCache.make_scope(_context(collection_version=None)) is None
+
+
+@pytest.mark.parametrize(
+    "override",
+    [{"collection_version": 4}, {"law_types": ["civil"]}, {"top_k": 10}, {"retrieval_mode": "sparse"}],
+)
+def test_semantic_scope_changes_with_inputs(override):
+    assert SemanticCache.make_scope(_context(**override)) != SemanticCache.make_scope(_context())
+
+
+def test_semantic_lookup_hits_near_duplicate_in_same_scope_only():
+    cache = SemanticCache()
+    cache.use_redis = False
+    cache.threshold = 0.95
+    output = {"answer": "يعاقب بالحبس"}
+
+    async def main():
+        await cache.store_async("scope-a", [1.0, 0.0, 0.0], output)
+        near = await cache.lookup_async("scope-a", [0.99, 0.05, 0.0])
+        far = await cache.lookup_async("scope-a", [0.0, 1.0, 0.0])
+        other_scope = await cache.lookup_async("scope-b", [1.0, 0.0, 0.0])
+        return near, far, other_scope
+
+    near, far, other_scope = asyncio.run(main())
+    assert near is not None and near[1] == output and near[0] >= 0.95
+    assert far is None
+    assert other_scope is None
+
+
+# === Collection version invalidation ===
+
+class _FakeRedis:
+    """RedisManager stand-in: collection versions and the shared cache tier"""
+
+    def __init__(self):
+        self.versions = {}
+        self.store = {}
+
+    async def get_collection_version_async(self, collection_name):
+        return self.versions.get(collection_name, 0)
+
+    def bump_collection_version(self, collection_name):
+        self.versions[collection_name] = self.versions.get(collection_name, 0) + 1
+        return self.versions[collection_name]
+
+    async def bump_collection_version_async(self, collection_name):
+        return self.bump_collection_version(collection_name)
+
+    async def cache_get_async(self, key):
+        return self.store.get(key)
+
+    async def cache_set_async(self, key, value, ttl=None):
+        self.store[key] = value
+
+
+class _FakeRegistry:
+    def __init__(self):
+        self.invalidated = []
+
+    def invalidate(self, collection_name):
+        self.invalidated.append(collection_name)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    from app.services import cache_service
+
+    redis = _FakeRedis()
+    registry = _FakeRegistry()
+    monkeypatch.setattr(cache_service, "get_redis_manager", lambda: redis)
+    monkeypatch.setattr(cache_service, "get_collection_registry", lambda: registry)
+    return redis, registry
+
+
+@pytest.mark.parametrize("invalidate_async", [False, True])
+def test_invalidation_makes_cached_retrieval_miss(fake_redis, invalidate_async):
+    from app.services.cache_service import (
+        get_collection_version_async,
+        invalidate_collection,
+        invalidate_collection_async,
+    )
+
+    redis, registry = fake_redis
+    cache = RetrievalCache()
+    cache.cache._redis = redis
+
+    async def cached_chunks():
+        context = _context(collection_version=await get_collection_version_async("laws_egypt"))
+        return await cache.get_async(cache.key_for(context)), context
+
+    async def main():
+        _, context = await cached_chunks()
+        await cache.set_async(cache.key_for(context), [{"chunk_id": "a"}], chunks_retrieved=25)
+        before, _ = await cached_chunks()
+
+        # Ingest (sync) or delete/reset (async) of the collection
+        if invalidate_async:
+            await invalidate_collection_async("laws_egypt")
+        else:
+            invalidate_collection("laws_egypt")
+
+        after, _ = await cached_chunks()
+        return before, after
+
+    before, after = asyncio.run(main())
+
+    assert before == {"chunks": [{"chunk_id": "a"}], "chunks_retrieved": 25}
+    assert after is None  # Misses in both the local and Redis tiers
+    assert redis.versions["laws_egypt"] == 1
+    assert registry.invalidated == ["laws_egypt"]
@@ -0,0 +1,92 @@
+"""
+Tests for the collection registry against real qdrant-client models
+"""
+
+import asyncio
+
+import pytest
+from qdrant_client import models
+
+from app.core.config import StorageProfile, SupportedCountry
+from app.db.collection_registry import CollectionRegistry
+from app.db.factory import CollectionFactory
+
+
+def _collection_info(points_count: int, profile: StorageProfile) -> models.CollectionInfo:
+    """A CollectionInfo as get_collection() returns it for a golden-schema collection"""
+    return models.CollectionInfo(
+        status=models.CollectionStatus.GREEN,
+        optimizer_status=models.OptimizersStatusOneOf.OK,
+        indexed_vectors_count=points_count,
+        points_count=points_count,
+        segments_count=2,
+        config=models.CollectionConfig(
+            params=models.CollectionParams(
+                vectors=CollectionFactory.get_golden_dense_config(profile),
+                sparse_vectors=CollectionFactory.get_golden_sparse_config(),
+            ),
+            hnsw_config=models.HnswConfig(m=16, ef_construct=100, full_scan_threshold=10000),
+            optimizer_config=models.OptimizersConfig(default_segment_number=2, flush_interval_sec=5),
+        ),
+        payload_schema={},
+    )
+
+
+class _FakeAsyncClient:
+    def __init__(self, infos):
+        self.infos = infos
+        self.calls = 0
+
+    async def collection_exists(self, collection_name):
+        return collection_name in self.infos
+
+    async def get_collection(self, collection_name):
+        self.calls += 1
+        return self.infos[collection_name]
+
+
+class _FakeQdrant:
+    client = None
+
+    def __init__(self, infos):
+        self.async_client = _FakeAsyncClient(infos)
+
+
+@pytest.fixture
+def registry():
+    infos = {"laws_egypt": _collection_info(1200, StorageProfile.INT8)}
+    return CollectionRegistry(_FakeQdrant(infos))
+
+
+def test_stats_from_real_collection_info(registry):
+    stats = asyncio.run(registry.get_stats(SupportedCountry.EGYPT))
+
+    assert stats["points_count"] == 1200
+    assert stats["indexed_vectors_count"] == 1200
+    assert stats["config"]["storage_profile"] == StorageProfile.INT8.value
+    assert stats["config"]["dense_quantization"] == "ScalarQuantization"
+
+
+def test_list_collections(registry):
+    collections = asyncio.run(registry.list_collections())
+
+    assert collections["egypt"] == {
+        "collection": "laws_egypt",
+        "points_count": 1200,
+        "status": "active",
+        "indexed_vectors_count": 1200,
+    }
+    assert collections["jordan"]["status"] == "not_initialized"
+
+
+def test_cached_until_invalidated(registry):
+    async def main():
+        await registry.has_points(SupportedCountry.EGYPT)
+        await registry.schema(SupportedCountry.EGYPT)
+        registry.invalidate("laws_egypt")
+        await registry.has_points(SupportedCountry.EGYPT)
+
+    asyncio.run(main())
+
+    assert registry.qdrant.async_client.calls == 2
+    assert registry.generation("laws_egypt") == 1
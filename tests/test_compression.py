@@ -0,0 +1,50 @@
+"""
+Tests for payload content compression
+"""
+
+import pytest
+
+pytest.importorskip("zstandard")
+
+from app.core.config import settings  # noqa: E402
+from app.utils.compression import (  # noqa: E402
+    compress_content_fields,
+    get_content_codec,
+    payload_content,
+    payload_preview,
+)
+
+ARTICLE = "مادة ٣١٨ - يعاقب بالحبس مع الشغل مدة لا تتجاوز سنتين على السرقات التي لم يتوفر فيها شيء من الظروف المشددة. " * 5
+
+
+def test_codec_round_trip():
+    codec = get_content_codec()
+    assert codec.decompress(codec.compress(ARTICLE)) == ARTICLE
+
+
+def test_codec_compresses_repetitive_text():
+    assert len(get_content_codec().compress(ARTICLE)) < len(ARTICLE.encode("utf-8"))
+
+
+def test_fields_uncompressed_by_default(monkeypatch):
+    monkeypatch.setattr(settings, "CONTENT_COMPRESSION", "none")
+    assert compress_content_fields(ARTICLE) == {"content": ARTICLE}
+
+
+def test_compressed_fields_round_trip(monkeypatch):
+    monkeypatch.setattr(settings, "CONTENT_COMPRESSION", "zstd")
+    monkeypatch.setattr(settings, "CONTENT_PREVIEW_CHARS", 20)
+
+    payload = compress_content_fields(ARTICLE)
+
+    assert "content" not in payload
+    assert payload_content(payload) == ARTICLE
+    assert payload_preview(payload) == ARTICLE[:20]
+
+
+def test_payload_content_reads_plain_payloads(monkeypatch):
+    monkeypatch.setattr(settings, "CONTENT_PREVIEW_CHARS", 10)
+    payload = {"content": ARTICLE}
+
+    assert payload_content(payload) == ARTICLE
+    assert payload_preview(payload) == ARTICLE[:10]
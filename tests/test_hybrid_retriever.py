@@ -0,0 +1,99 @@
+"""
+Tests for the hybrid retriever: batch search and the exact-search planner
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import StorageProfile, settings
+from app.db.collection_registry import CollectionRegistry
+from app.pipelines.query.steps import step3_hybrid_retriever
+from app.pipelines.query.steps.step3_hybrid_retriever import HybridRetrieverStep
+
+
+class _FakeQdrant:
+    RERANK_PAYLOAD_FIELDS = ["chunk_id", "content"]
+    client = None
+
+    def __init__(self):
+        self.searched = []
+        self.counted = 0
+
+    async def count_points_async(self, collection_name, filter_conditions):
+        self.counted += 1
+        law_types = filter_conditions.must[1].match.any
+        if "broken" in law_types:
+            raise RuntimeError("count timed out")
+        return 10
+
+    async def hybrid_search_batch_async(self, collection_name, searches, matryoshka_size=None):
+        self.searched.append(len(searches))
+        return [[{"id": "1", "score": 0.5, "payload": {"chunk_id": "c1", "content": "نص"}}] for _ in searches]
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = CollectionRegistry(_FakeQdrant())
+    monkeypatch.setattr(step3_hybrid_retriever, "get_collection_registry", lambda: registry)
+    return registry
+
+
+def _context(law_type: str, collection_name: str = "test_batch_planning"):
+    return {
+        "collection_name": collection_name,
+        "country": "egypt",
+        "law_types": [law_type],
+    }
+
+
+def test_failed_plan_fails_only_its_query(monkeypatch, registry):
+    step = HybridRetrieverStep()
+    step._qdrant = _FakeQdrant()
+
+    async def _schema(context):
+        return {}
+
+    monkeypatch.setattr(step, "_aschema", _schema)
+
+    contexts = [_context("labor"), _context("broken"), _context("civil")]
+    data = [{"dense_vector": [0.1], "sparse_vector": None} for _ in contexts]
+
+    results = asyncio.run(step.aprocess_batch(data, contexts))
+
+    assert isinstance(results[1], RuntimeError)
+    assert [len(results[0]), len(results[2])] == [1, 1]
+    assert step._qdrant.searched == [2]
+    assert contexts[0]["exact_search"] and contexts[2]["exact_search"]
+
+
+def test_invalidation_drops_cached_filter_counts(registry):
+    step = HybridRetrieverStep()
+    step._qdrant = _FakeQdrant()
+
+    def plan():
+        context = _context("labor", "test_count_invalidation")
+        collection_name, kwargs = step._prepare_search({"dense_vector": [0.1]}, context, {})
+        asyncio.run(step._aplan(collection_name, kwargs, context))
+
+    plan()
+    plan()
+    assert step._qdrant.counted == 1
+
+    registry.invalidate("test_count_invalidation")
+    plan()
+    assert step._qdrant.counted == 2
+
+
+def test_search_params_follow_the_collection_profile(monkeypatch):
+    monkeypatch.setattr(settings, "VECTOR_STORAGE_PROFILE", StorageProfile.INT8)
+    monkeypatch.setattr(settings, "QUANTIZATION_OVERSAMPLING", None)
+    step = HybridRetrieverStep()
+    step._qdrant = _FakeQdrant()
+    data = {"dense_vector": [0.1], "sparse_vector": None}
+
+    _, binary = step._prepare_search(data, _context("labor"), {"storage_profile": "binary"})
+    _, float32 = step._prepare_search(data, _context("labor"), {"storage_profile": "float32"})
+
+    assert binary["search_params"].quantization.oversampling == 3.0
+    assert float32["search_params"].quantization is None
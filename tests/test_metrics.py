@@ -0,0 +1,63 @@
+"""
+Tests for Prometheus metrics helpers
+"""
+
+import pytest
+
+from app.api.routes import health, ingest, laws, query, search
+from app.utils.metrics import MetricsMiddleware
+
+
+@pytest.fixture(scope="module")
+def middleware() -> MetricsMiddleware:
+    routers = (health.router, query.router, search.router, ingest.router, laws.router)
+    return MetricsMiddleware(app=None, routes=[route for router in routers for route in router.routes])
+
+
+def _scope(method: str, path: str) -> dict:
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "root_path": "",
+        "headers": [],
+        "query_string": b"",
+    }
+
+
+@pytest.mark.parametrize(
+    "method, path, label",
+    [
+        ("POST", "/api/v1/query", "/api/v1/query"),
+        ("POST", "/api/v1/query/stream", "/api/v1/query/stream"),
+        ("POST", "/api/v1/query/batch", "/api/v1/query/batch"),
+        ("POST", "/api/v1/search", "/api/v1/search"),
+        ("POST", "/api/v1/ingest", "/api/v1/ingest"),
+        ("GET", "/api/v1/laws/egypt", "/api/v1/laws/{country}"),
+        ("DELETE", "/api/v1/laws/egypt", "/api/v1/laws/{country}"),
+        ("GET", "/health", "/health"),
+    ],
+)
+def test_route_label_uses_route_template(middleware, method, path, label):
+    assert middleware._route_label(_scope(method, path)) == label
+
+
+def test_route_label_wrong_method_keeps_template(middleware):
+    assert middleware._route_label(_scope("GET", "/api/v1/query")) == "/api/v1/query"
+
+
+def test_route_label_unknown_path_is_other(middleware):
+    assert middleware._route_label(_scope("GET", "/api/v1/nope/123")) == "other"
+
+
+def test_app_middleware_labels_api_routes():
+    from app.main import app
+
+    for entry in app.user_middleware:
+        if entry.cls is MetricsMiddleware:
+            labeller = MetricsMiddleware(app=None, **entry.kwargs)
+            break
+    else:
+        pytest.fail("MetricsMiddleware not installed")
+
+    assert labeller._route_label(_scope("POST", "/api/v1/query")) == "/api/v1/query"
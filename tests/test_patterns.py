@@ -0,0 +1,44 @@
+"""
+Tests for article reference detection
+"""
+
+import pytest
+
+from app.utils.patterns import ArticlePatterns
+
+
+@pytest.mark.parametrize(
+    "question, number, law_type",
+    [
+        ("ما نص المادة ٣١٨ من قانون العقوبات؟", 318, "criminal"),
+        ("ما نص المادة 318 من قانون العقوبات", 318, "criminal"),
+        ("اشرح المادة (١٤٧) من القانون المدني", 147, "civil"),
+        ("ماذا تقول مادة ٥٢ من قانون العمل", 52, "labor"),
+        ("ما هي المادة ١٠", 10, None),
+    ],
+)
+def test_find_article_reference(question, number, law_type):
+    reference = ArticlePatterns.find_article_reference(question)
+
+    assert reference is not None
+    assert reference.article_number == number
+    assert reference.law_type == law_type
+
+
+def test_no_article_reference():
+    assert ArticlePatterns.find_article_reference("ما عقوبة السرقة؟") is None
+
+
+def test_several_articles_are_not_a_single_reference():
+    assert ArticlePatterns.find_article_reference("قارن بين المادة ٣١٨ والمادة ٣١٩") is None
+
+
+def test_same_article_twice_is_one_reference():
+    reference = ArticlePatterns.find_article_reference("المادة ٣١٨ - ما تفسير المادة 318؟")
+    assert reference is not None and reference.article_number == 318
+
+
+def test_work_alone_does_not_select_labor_law():
+    # "عمل" is part of many words; only "قانون العمل" names the labor law
+    reference = ArticlePatterns.find_article_reference("ما المادة ٢٠ التي تعاقب على عمل غير مشروع")
+    assert reference is not None and reference.law_type is None
@@ -0,0 +1,175 @@
+"""
+Tests for the pipeline DAG executor
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from app.pipelines.base import Pipeline, PipelineStep, StepStatus
+
+
+class _Step(PipelineStep):
+    """Appends its name to the input; optionally fails or sleeps"""
+
+    def __init__(self, name: str, fail: bool = False, delay: float = 0.0, log: List[str] = None):
+        super().__init__(name)
+        self.fail = fail
+        self.delay = delay
+        self.log = log if log is not None else []
+
+    def process(self, data: Any, context: Dict[str, Any]) -> Any:
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return f"{data}>{self.name}"
+
+    async def aprocess(self, data: Any, context: Dict[str, Any]) -> Any:
+        self.log.append(f"start {self.name}")
+        await asyncio.sleep(self.delay)
+        self.log.append(f"end {self.name}")
+        return self.process(data, context)
+
+
+def _statuses(result) -> Dict[str, StepStatus]:
+    return {step.step_name: step.status for step in result.steps}
+
+
+# === run (sequential) ===
+
+def test_run_linear():
+    pipeline = Pipeline("p").add_step(_Step("a")).add_step(_Step("b"))
+
+    result = pipeline.run("x")
+
+    assert result.success
+    assert result.data == "x>a>b"
+
+
+class _Consume(PipelineStep):
+    """Empties its input list, like the text extractor closing the PDF"""
+
+    def process(self, data: Any, context: Dict[str, Any]) -> Any:
+        size = len(data)
+        data.clear()
+        return size
+
+    def get_data_size(self, data: Any) -> int:
+        return len(data) if isinstance(data, list) else 0
+
+
+def test_input_size_measured_before_the_step_consumes_it():
+    pipeline = Pipeline("p").add_step(_Consume("consume"))
+
+    result = pipeline.run([1, 2, 3])
+    aresult = asyncio.run(pipeline.arun([1, 2, 3]))
+
+    assert result.steps[0].input_size == aresult.steps[0].input_size == 3
+
+
+def test_run_stop_on_error_returns_last_successful_output():
+    pipeline = Pipeline("p").add_step(_Step("a")).add_step(_Step("b", fail=True)).add_step(_Step("c"))
+
+    result = pipeline.run("x")
+
+    assert not result.success
+    assert result.data == "x>a"
+    assert [s.step_name for s in result.steps] == ["a", "b"]
+
+
+def test_run_continue_on_error_passes_input_through():
+    pipeline = Pipeline("p").add_step(_Step("a")).add_step(_Step("b", fail=True)).add_step(_Step("c"))
+
+    result = pipeline.run("x", stop_on_error=False)
+
+    assert not result.success
+    assert result.data == "x>a>c"
+    assert _statuses(result) == {"a": StepStatus.SUCCESS, "b": StepStatus.FAILED, "c": StepStatus.SUCCESS}
+
+
+def test_run_last_step_failure_keeps_previous_output():
+    pipeline = Pipeline("p").add_step(_Step("a")).add_step(_Step("b", fail=True))
+
+    assert pipeline.run("x", stop_on_error=False).data == "x>a"
+
+
+# === arun (DAG) ===
+
+def test_arun_runs_independent_steps_concurrently():
+    log: List[str] = []
+    pipeline = Pipeline("p")
+    pipeline.add_step(_Step("a", delay=0.05, log=log), depends_on=[])
+    pipeline.add_step(_Step("b", delay=0.05, log=log), depends_on=[])
+    pipeline.add_step(_Step("join", log=log), depends_on=["a", "b"], input_from="a")
+
+    result = asyncio.run(pipeline.arun("x"))
+
+    assert result.success
+    assert result.data == "x>a>join"
+    assert log.index("start b") < log.index("end a")  # Overlapped
+    assert log.index("start join") > max(log.index("end a"), log.index("end b"))
+
+
+def test_arun_multiple_dependencies_get_dict_input():
+    pipeline = Pipeline("p")
+    pipeline.add_step(_Step("a"), depends_on=[])
+    pipeline.add_step(_Step("b"), depends_on=[])
+
+    class Join(_Step):
+        def process(self, data, context):
+            return data
+
+    pipeline.add_step(Join("join"), depends_on=["a", "b"])
+
+    assert asyncio.run(pipeline.arun("x")).data == {"a": "x>a", "b": "x>b"}
+
+
+def test_arun_skips_dependents_of_failed_step():
+    pipeline = Pipeline("p")
+    pipeline.add_step(_Step("a", fail=True), depends_on=[])
+    pipeline.add_step(_Step("b", delay=0.01), depends_on=[])
+    pipeline.add_step(_Step("after_a"), depends_on=["a"])
+
+    result = asyncio.run(pipeline.arun("x", stop_on_error=False))
+
+    assert _statuses(result) == {
+        "a": StepStatus.FAILED,
+        "b": StepStatus.SUCCESS,
+        "after_a": StepStatus.SKIPPED,
+    }
+    assert result.data == "x>b"
+
+
+def test_arun_stop_on_error_cancels_running_steps():
+    log: List[str] = []
+    pipeline = Pipeline("p")
+    pipeline.add_step(_Step("fast_fail", fail=True, log=log), depends_on=[])
+    pipeline.add_step(_Step("slow", delay=1.0, log=log), depends_on=[])
+
+    result = asyncio.run(pipeline.arun("x"))
+
+    assert _statuses(result) == {"fast_fail": StepStatus.FAILED, "slow": StepStatus.SKIPPED}
+    assert "end slow" not in log
+
+
+def test_arun_cancel_cancels_steps():
+    log: List[str] = []
+    pipeline = Pipeline("p").add_step(_Step("slow", delay=1.0, log=log))
+
+    async def main():
+        task = asyncio.create_task(pipeline.arun("x"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    assert asyncio.run(main())
+    assert log == ["start slow"]
+
+
+def test_add_step_rejects_unknown_dependency():
+    with pytest.raises(ValueError):
+        Pipeline("p").add_step(_Step("a"), depends_on=["missing"])
@@ -0,0 +1,58 @@
+"""
+Tests for Qdrant query building
+"""
+
+from qdrant_client import models
+
+from app.db.factory import CollectionFactory
+from app.db.qdrant_client import QdrantManager
+
+VECTOR = [0.5] * 8
+SPARSE = {"indices": [1, 2], "values": [0.3, 0.7]}
+
+
+def _info(vectors: dict) -> models.CollectionInfo:
+    return models.CollectionInfo.model_construct(
+        config=models.CollectionConfig.model_construct(
+            params=models.CollectionParams.model_construct(vectors=vectors),
+        ),
+    )
+
+
+def test_matryoshka_size_from_schema():
+    dense = models.VectorParams(size=8, distance=models.Distance.COSINE)
+    mrl = models.VectorParams(size=4, distance=models.Distance.COSINE)
+
+    assert CollectionFactory.matryoshka_size(_info({"dense": dense})) is None
+    assert CollectionFactory.matryoshka_size(_info({"dense": dense, "dense_mrl": mrl})) == 4
+
+
+def test_dense_vectors_without_matryoshka_has_only_dense():
+    assert QdrantManager.dense_vectors(VECTOR) == {"dense": VECTOR}
+
+
+def test_dense_vectors_with_matryoshka_adds_prefix():
+    vectors = QdrantManager.dense_vectors(VECTOR, matryoshka_size=4)
+    assert vectors["dense_mrl"] == VECTOR[:4]
+
+
+def test_dense_query_without_matryoshka_queries_dense():
+    query = QdrantManager._build_query("dense", VECTOR, None, 10)
+    assert query["using"] == "dense"
+    assert "prefetch" not in query
+
+
+def test_dense_query_with_matryoshka_rescoring():
+    query = QdrantManager._build_query("dense", VECTOR, None, 10, matryoshka_size=4)
+    assert query["using"] == "dense"
+    assert query["prefetch"].using == "dense_mrl"
+    assert query["prefetch"].query == VECTOR[:4]
+
+
+def test_hybrid_query_uses_mrl_only_when_collection_has_it():
+    plain = QdrantManager._build_query("hybrid_rrf", VECTOR, SPARSE, 10)
+    assert [p.using for p in plain["prefetch"]] == ["dense", "sparse"]
+    assert plain["prefetch"][0].prefetch is None
+
+    mrl = QdrantManager._build_query("hybrid_rrf", VECTOR, SPARSE, 10, matryoshka_size=4)
+    assert mrl["prefetch"][0].prefetch.using == "dense_mrl"
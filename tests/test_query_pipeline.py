@@ -0,0 +1,101 @@
+"""
+Tests for the query pipeline: batch encoding and failure isolation, retrieval-only search
+"""
+
+import asyncio
+
+import pytest
+
+from app.pipelines.query.models import QueryInput
+from app.pipelines.query.pipeline import QueryPipeline
+
+
+async def _fail(*args, **kwargs):
+    raise RuntimeError("model crashed")
+
+
+async def _encoded(queries, contexts):
+    return [{"query": q, "dense_vector": [0.1], "sparse_vector": None} for q in queries]
+
+
+async def _no_candidates(data, contexts):
+    return [[] for _ in data]
+
+
+def _inputs(*countries: str):
+    return [QueryInput(question=f"سؤال {i}", country=country) for i, country in enumerate(countries)]
+
+
+def test_encoder_failure_fails_each_item():
+    pipeline = QueryPipeline()
+    pipeline.dual_encoder.aprocess_batch = _fail
+
+    outputs = asyncio.run(pipeline.run_batch(_inputs("egypt", "egypt")))
+
+    assert [o.success for o in outputs] == [False, False]
+    assert all("Encoding failed" in o.errors[0] for o in outputs)
+
+
+def test_reranker_failure_fails_each_item():
+    pipeline = QueryPipeline()
+    pipeline.dual_encoder.aprocess_batch = _encoded
+    pipeline.retriever.aprocess_batch = _no_candidates
+    pipeline.reranker.aprocess_batch = _fail
+
+    outputs = asyncio.run(pipeline.run_batch(_inputs("egypt", "egypt", "egypt")))
+
+    assert [o.success for o in outputs] == [False, False, False]
+    assert all("Rerank failed" in o.errors[0] for o in outputs)
+
+
+def test_mixed_countries_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(QueryPipeline().run_batch(_inputs("egypt", "jordan")))
+
+
+def test_search_retrieval_keeps_hybrid_top_k_without_reranking():
+    pipeline = QueryPipeline()
+    retrieval = pipeline.unranked_retrieval
+    steps = {step.name: step for step in retrieval.steps}
+    assert "Reranker" not in steps
+
+    async def dense(data, context):
+        return [0.1, 0.2]
+
+    async def sparse(data, context):
+        return None
+
+    async def search(data, context):
+        return [f"chunk-{i}" for i in range(10)]
+
+    async def display_fields(chunks, context):
+        return chunks
+
+    steps["Dense Encoder"].aprocess = dense
+    steps["Sparse Encoder"].aprocess = sparse
+    pipeline.retriever.aprocess = search
+    pipeline.retriever.afetch_display_fields = display_fields
+
+    context = {"normalized_query": "سؤال", "top_k": 3, "retrieval_mode": "dense"}
+    result = asyncio.run(retrieval.arun("سؤال", context))
+
+    assert result.success
+    assert result.data == ["chunk-0", "chunk-1", "chunk-2"]
+
+
+class _QueryEncoder:
+    def embed_queries(self, texts, batch_size=None):
+        return [[0.1] for _ in texts]
+
+    def encode_queries(self, texts):
+        return [{"indices": [1], "values": [1.0]} for _ in texts]
+
+
+def test_batch_encoding_uses_quiet_query_encoders():
+    encoder = QueryPipeline().dual_encoder
+    encoder._embedding_service = encoder._sparse_service = _QueryEncoder()
+
+    outputs = asyncio.run(encoder.aprocess_batch(["أ", "ب"], [{}, {"retrieval_mode": "dense"}]))
+
+    assert [o["dense_vector"] for o in outputs] == [[0.1], [0.1]]
+    assert [o["sparse_vector"] is None for o in outputs] == [False, True]
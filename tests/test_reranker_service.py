@@ -0,0 +1,82 @@
+"""
+Tests for reranker batching and prefix-cache scoring
+"""
+
+import pytest
+import torch
+from transformers import BatchEncoding, Qwen3Config, Qwen3ForSequenceClassification
+
+from app.services.reranker_service import RerankerService
+
+PAD_ID = 0
+
+
+class _CharTokenizer:
+    """Tokenizer stub: one token per character, left padding like the real one"""
+
+    pad_token_id = PAD_ID
+
+    def __call__(self, pairs, padding=False, truncation=True, max_length=512):
+        ids = [[1] + [2 + ord(c) % 90 for c in query + "|" + doc][:max_length - 1] for query, doc in pairs]
+        return {"input_ids": ids, "attention_mask": [[1] * len(seq) for seq in ids]}
+
+    def pad(self, features, padding=True, return_tensors="pt"):
+        width = max(len(f["input_ids"]) for f in features)
+        ids = [[PAD_ID] * (width - len(f["input_ids"])) + f["input_ids"] for f in features]
+        mask = [[0] * (width - len(f["input_ids"])) + [1] * len(f["input_ids"]) for f in features]
+        return BatchEncoding({"input_ids": torch.tensor(ids), "attention_mask": torch.tensor(mask)})
+
+
+@pytest.fixture(scope="module")
+def reranker() -> RerankerService:
+    torch.manual_seed(0)
+    config = Qwen3Config(
+        vocab_size=96,
+        hidden_size=32,
+        intermediate_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        head_dim=8,
+        num_labels=1,
+        pad_token_id=PAD_ID,
+    )
+    service = object.__new__(RerankerService)  # Bypass the singleton and model download
+    service._model = Qwen3ForSequenceClassification(config).eval()
+    service._tokenizer = _CharTokenizer()
+    service.device = torch.device("cpu")
+    service.max_length = 512
+    return service
+
+
+PAIRS = [
+    ("ما عقوبة السرقة", "يعاقب بالحبس كل من اختلس منقولا"),
+    ("ما عقوبة السرقة", "المادة ٣١٨"),
+    ("ما عقوبة السرقة", "يعاقب بالسجن المشدد إذا وقعت السرقة ليلا من شخصين فأكثر"),
+    ("ما عقوبة السرقة", "عقد البيع"),
+    ("شروط عقد العمل", "يجب أن يكون عقد العمل مكتوبا"),
+    ("شروط عقد العمل", "مدة الاختبار ثلاثة أشهر"),
+]
+
+
+@pytest.mark.parametrize("budget", [64, 8192])
+def test_prefix_cache_matches_bucketed_scores(reranker, budget):
+    bucketed = reranker.score_pairs(PAIRS, token_budget=budget, prefix_cache=False)
+    cached = reranker.score_pairs(PAIRS, token_budget=budget, prefix_cache=True)
+
+    assert cached == pytest.approx(bucketed, abs=1e-4)
+
+
+def test_plan_sub_batches_respects_budget_and_covers_all():
+    lengths = [5, 40, 7, 38, 6, 100]
+    batches = RerankerService.plan_sub_batches(lengths, token_budget=80)
+
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) == 1 or len(batch) * max(lengths[i] for i in batch) <= 80
+
+
+def test_padding_ratio():
+    assert RerankerService.padding_ratio([4, 4], [[0, 1]]) == 0.0
+    assert RerankerService.padding_ratio([2, 6], [[0, 1]]) == pytest.approx(1 / 3)
+    assert RerankerService.padding_ratio([2, 6], [[0], [1]]) == 0.0
@@ -0,0 +1,47 @@
+"""
+Tests for request timing helpers
+"""
+
+import asyncio
+
+from app.utils.timing import record_wait, server_timing_header, take_waits, track_waits
+
+
+def test_server_timing_header_stages_and_total():
+    header = server_timing_header({"encode": 35.14, "search": 12.0}, total_ms=912.04)
+    assert header == "encode;dur=35.1, search;dur=12.0, total;dur=912.0"
+
+
+def test_server_timing_header_adds_waits():
+    header = server_timing_header({"encode": 35.1, "rerank": 80.0}, wait_ms={"encode": 12.44})
+    assert header == "encode;dur=35.1, encode-wait;dur=12.4, rerank;dur=80.0"
+
+
+def test_server_timing_header_sanitizes_names():
+    assert server_timing_header({"Dense Embedder": 1.0}) == "dense-embedder;dur=1.0"
+    assert server_timing_header({"Fetch_Display (fields)": 2.0}) == "fetch-display-fields;dur=2.0"
+
+
+def test_server_timing_header_empty():
+    assert server_timing_header({}) == ""
+
+
+def test_waits_are_tracked_per_context():
+    async def stage(ms: float) -> float:
+        track_waits()
+        record_wait(ms)
+        await asyncio.sleep(0)
+        return take_waits()
+
+    async def main():
+        return await asyncio.gather(stage(5.0), stage(7.0))
+
+    assert asyncio.run(main()) == [5.0, 7.0]
+
+
+def test_record_wait_without_tracking_is_ignored():
+    async def main():
+        record_wait(3.0)
+        return take_waits()
+
+    assert asyncio.run(main()) == 0.0